@@ -0,0 +1,172 @@
+"""Archivo empaquetado de recursos.
+
+Junta en un solo archivo los recursos listados en Assets/Data/assets.json
+para que el arranque abra un archivo y no decodifique PNG:
+
+    python -m AssetPack            # desde la carpeta Code/
+
+Formato: PACK_MAGIC, largo del indice (u32), indice JSON y los datos, cada
+bloque alineado a PACK_ALIGN bytes. Las imagenes se guardan decodificadas
+como pixeles RGBA; fuentes y sonidos como el archivo original. El indice
+guarda el tamaño y la fecha de cada archivo fuente: si un recurso cambio
+despues de generar el pack se usa el archivo suelto (con un aviso) hasta
+volver a generarlo.
+"""
+import argparse
+import io
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from Settings.Settings import *
+
+logger = logging.getLogger(__name__)
+
+PACK_MAGIC = b"PAK1"
+PACK_ALIGN = 16
+_HEADER = struct.Struct("<4sI")
+IMAGE_KINDS = ("sprite_sheets", "images")
+
+def load_asset_manifest(path=ASSETS_MANIFEST_FILE) -> dict:
+    """Lee el manifiesto de recursos (rutas relativas a la raiz del proyecto)"""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def pack_name(path) -> Optional[str]:
+    """Nombre de un archivo dentro del pack: su ruta relativa a BASE_DIR"""
+    try:
+        return Path(path).resolve().relative_to(BASE_DIR).as_posix()
+    except ValueError:
+        return None
+
+def build_pack(manifest: dict, out_path=ASSET_PACK_FILE, base_dir: Path = BASE_DIR) -> Dict[str, int]:
+    """Escribe el pack con todos los archivos del manifiesto que existan"""
+    index = {}
+    blobs = []
+    offset = 0
+    missing = 0
+    for kind, entries in manifest.items():
+        for entry in entries:
+            name = entry["path"]
+            if name in index:
+                continue
+            source = base_dir / name
+            if not source.exists():
+                logger.warning(f"Asset not found, not packed: {name}")
+                missing += 1
+                continue
+            stat = source.stat()
+            if kind in IMAGE_KINDS:
+                surface = pygame.image.load(str(source))
+                data = pygame.image.tobytes(surface, "RGBA")
+                record = {"type": "rgba", "width": surface.get_width(), "height": surface.get_height()}
+            else:
+                data = source.read_bytes()
+                record = {"type": "file"}
+            record.update(offset=offset, size=len(data), source_size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            index[name] = record
+            padding = -len(data) % PACK_ALIGN
+            blobs.append(data + b"\0" * padding)
+            offset += len(data) + padding
+
+    header = json.dumps({"entries": index}, separators=(",", ":")).encode("utf-8")
+    header += b" " * (-(len(header) + _HEADER.size) % PACK_ALIGN)
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    with open(out_path, "wb") as f:
+        f.write(_HEADER.pack(PACK_MAGIC, len(header)))
+        f.write(header)
+        for blob in blobs:
+            f.write(blob)
+    return {"entries": len(index), "missing": missing, "bytes": _HEADER.size + len(header) + offset}
+
+class AssetPack:
+    """Pack abierto con mmap. Las superficies se crean sobre el buffer sin copiarlo"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_COPY)
+            magic, index_size = _HEADER.unpack_from(self._map, 0)
+            if magic != PACK_MAGIC:
+                raise ValueError(f"{path} is not an asset pack")
+            header_end = _HEADER.size + index_size
+            self.index: Dict[str, dict] = json.loads(bytes(self._map[_HEADER.size:header_end]))["entries"]
+        except Exception:
+            self._file.close()
+            raise
+        self._data = memoryview(self._map)[header_end:]
+
+    @classmethod
+    def open(cls, path=ASSET_PACK_FILE, base_dir: Path = BASE_DIR) -> Optional["AssetPack"]:
+        """Abre el pack, o devuelve None si no existe o no es valido.
+
+        Las entradas cuyo archivo fuente cambio se quitan del indice (ver
+        `drop_stale`), asi que quien pregunte por ellas carga el archivo suelto.
+        """
+        if not os.path.exists(path):
+            return None
+        try:
+            pack = cls(path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Could not open asset pack {path}: {e}")
+            return None
+        pack.drop_stale(base_dir)
+        return pack
+
+    def drop_stale(self, base_dir: Path = BASE_DIR) -> list:
+        """Quita las entradas cuyo archivo fuente tiene otro tamaño o fecha.
+
+        Si el archivo suelto no existe la entrada se conserva: el pack es la
+        unica copia. Devuelve los nombres quitados.
+        """
+        stale = []
+        for name, entry in self.index.items():
+            try:
+                stat = (base_dir / name).stat()
+            except OSError:
+                continue
+            if stat.st_size != entry.get("source_size") or stat.st_mtime_ns != entry.get("mtime_ns"):
+                stale.append(name)
+        for name in stale:
+            del self.index[name]
+        if stale:
+            logger.warning(f"Asset pack {self.path} is out of date, loading {len(stale)} files from disk "
+                           f"({', '.join(stale)}); rebuild it with `python -m AssetPack`")
+        return stale
+
+    def __contains__(self, name) -> bool:
+        return name in self.index
+
+    def _slice(self, entry):
+        return self._data[entry["offset"]:entry["offset"] + entry["size"]]
+
+    def surface(self, name) -> pygame.Surface:
+        """Superficie RGBA que apunta a los pixeles del pack (convertirla antes de dibujar)"""
+        entry = self.index[name]
+        return pygame.image.frombuffer(self._slice(entry), (entry["width"], entry["height"]), "RGBA")
+
+    def file(self, name) -> io.BytesIO:
+        """Contenido de un archivo guardado tal cual (fuentes, sonidos)"""
+        return io.BytesIO(self._slice(self.index[name]))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Empaqueta los recursos del manifiesto en un .pak")
+    parser.add_argument("--manifest", default=str(ASSETS_MANIFEST_FILE), help="manifiesto (por defecto: %(default)s)")
+    parser.add_argument("--out", default=ASSET_PACK_FILE, help="archivo de salida (por defecto: %(default)s)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    stats = build_pack(load_asset_manifest(args.manifest), args.out)
+    print(f"{stats['entries']} recursos ({stats['missing']} faltantes), "
+          f"{stats['bytes'] // 1024} KB en {args.out}, {time.perf_counter() - start:.2f} s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,46 @@
-from typing import Dict, Optional
+from sys import intern
+from types import MappingProxyType
+from typing import Callable, Dict, Iterator, Mapping, Optional, Tuple
+
+# Tuplas de claves de stats; los items con las mismas claves comparten la misma
+_stat_layouts: Dict[tuple, tuple] = {}
 
 class Item:
+    """Item del juego. Los stats se guardan como dos tuplas (claves compartidas
+    y valores) en vez de un dict por item."""
+    __slots__ = ("id", "name", "type", "_stat_keys", "_stat_values")
+
     def __init__(self, item_id: int, name: str, item_type: str, stats: Dict[str, int]):
         self.id = item_id
         self.name = name
-        self.type = item_type  # "weapon" or "armor" or "consumable"
-        self.stats = stats
+        self.type = intern(item_type)  # "weapon" or "armor" or "consumable"
+        keys = tuple(intern(key) for key in stats)
+        self._stat_keys = _stat_layouts.setdefault(keys, keys)
+        self._stat_values = tuple(stats.values())
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Copia de los stats como dict"""
+        return dict(zip(self._stat_keys, self._stat_values))
+
+    def stat_items(self) -> Iterator[Tuple[str, int]]:
+        """Pares (stat, valor) sin crear un dict"""
+        return zip(self._stat_keys, self._stat_values)
+
+ITEM_TYPES = ("weapon", "armor", "consumable")
 
 class Inventory:
     def __init__(self):
         self._items: Dict[int, int] = {}  # item_id -> quantity
+        # Vistas que se mantienen en add/remove, en orden de llegada
+        self._objects: Dict[int, Item] = {}  # item_id -> Item
+        # Listas por tipo: la ventana visible de la UI se corta por indice
+        self._by_type: Dict[str, list[Item]] = {item_type: [] for item_type in ITEM_TYPES}
 
     def add(self, item: Item, quantity: int = 1):
+        if item.id not in self._items:
+            self._objects[item.id] = item
+            self._by_type.setdefault(item.type, []).append(item)
         self._items[item.id] = self._items.get(item.id, 0) + quantity
     
     def get_items(self):
@@ -20,13 +49,20 @@ class Inventory:
     
     def get_item_objects(self):
         """Devuelve una lista de objetos Item que están en el inventario"""
-        from Characters.ItemManager import item_manager
-        items = []
-        for item_id, quantity in self._items.items():
-            item_obj = item_manager.get_item(item_id)
-            if item_obj:
-                items.append(item_obj)
-        return items
+        return list(self._objects.values())
+
+    def items_of_type(self, item_type: str) -> list[Item]:
+        """Items de un tipo, en orden de llegada"""
+        return list(self._by_type.get(item_type, ()))
+
+    def items_of_type_slice(self, item_type: str, start: int, stop: int) -> list[Item]:
+        """Items de un tipo entre las posiciones start y stop, sin recorrer el resto"""
+        by_type = self._by_type.get(item_type)
+        return by_type[start:stop] if by_type else []
+
+    def count_of_type(self, item_type: str) -> int:
+        by_type = self._by_type.get(item_type)
+        return len(by_type) if by_type else 0
     
     def remove(self, item: Item, quantity: int = 1):
         if item.id not in self._items:
@@ -34,33 +70,55 @@ class Inventory:
         self._items[item.id] -= quantity
         if self._items[item.id] <= 0:
             del self._items[item.id]
+            stored = self._objects.pop(item.id)
+            # Quitar es raro (usar o tirar un item): la busqueda lineal no pesa
+            self._by_type[stored.type].remove(stored)
         return True
 
+    def clear(self):
+        self._items.clear()
+        self._objects.clear()
+        for by_type in self._by_type.values():
+            by_type.clear()
+
     def quantity(self, item: Item) -> int:
         return self._items.get(item.id, 0)
 
 class Equipment:
-    def __init__(self):
+    def __init__(self, on_change: Optional[Callable[[], None]] = None):
         self.weapon: Optional[Item] = None
         self.armors: list[Item] = []  # max 2 armor pieces
+        self.on_change = on_change  # se llama cada vez que cambia lo equipado
+
+    def _changed(self):
+        if self.on_change:
+            self.on_change()
 
     def equip(self, item: Item) -> bool:
         if item.type == "weapon":
             self.weapon = item
+            self._changed()
             return True
         if item.type == "armor":
             if len(self.armors) < 2:
                 self.armors.append(item)
+                self._changed()
                 return True
         return False
 
     def unequip_weapon(self):
-        self.weapon = None
+        if self.weapon is not None:
+            self.weapon = None
+            self._changed()
 
     def unequip_armor(self, item: Item):
         if item in self.armors:
             self.armors.remove(item)
+            self._changed()
             
+# Tipo de item que acepta cada slot de equipo (0 = arma, 1 y 2 = armaduras)
+SLOT_TYPES = {0: "weapon", 1: "armor", 2: "armor"}
+
 class InventoryModel:
     def __init__(self, characters_list):
         self.characters_list = characters_list
@@ -100,15 +158,24 @@ class InventoryModel:
         if slot_index is None:
             slot_index = self.selected_equipment
 
-        # Obtener objetos Item del inventario
-        inventory_items = character.inventory.get_item_objects()
-        
-        if slot_index == 0:  # Weapon
-            return [item for item in inventory_items if item.type == "weapon"]
-        elif slot_index == 1 or slot_index == 2:  # Armor1 o Armor2
-            return [item for item in inventory_items if item.type == "armor"]
-        else:
+        item_type = SLOT_TYPES.get(slot_index)
+        if item_type is None:
+            return []
+        return character.inventory.items_of_type(item_type)
+
+    def get_available_items_window(self, character, slot_index, start, count):
+        """Solo los items visibles de la lista de un slot"""
+        item_type = SLOT_TYPES.get(slot_index)
+        if character is None or item_type is None:
             return []
+        return character.inventory.items_of_type_slice(item_type, start, start + count)
+
+    def count_available_for_slot(self, character, slot_index) -> int:
+        """Cantidad de items distintos para un slot, sin armar la lista"""
+        item_type = SLOT_TYPES.get(slot_index)
+        if character is None or item_type is None:
+            return 0
+        return character.inventory.count_of_type(item_type)
 
     def _find_item_by_id(self, item_id):
         character = self.get_current_character()
@@ -154,12 +221,33 @@ class InventoryModel:
 class Character:
     def __init__(self,attack,defense,max_hp,will):
         self.inventory = Inventory()
-        self.equipment = Equipment()
+        self.equipment = Equipment(on_change=self.invalidate_stats)
         self.sprite_key = None
-        self.base_stats = {"attack": attack, "defense": defense, "max_hp": max_hp, "hp": max_hp, "will": will}
+        self._total_stats: Optional[Mapping[str, int]] = None  # cache de stats derivados (solo lectura)
+        self._max_hp = 0
+        self._base_stats = {"attack": attack, "defense": defense, "max_hp": max_hp, "hp": max_hp, "will": will}
         self.current_hp = max_hp # vida actual independiente de los stats
         self.hp_color = self._calculate_hp_color()  # color actual de la barra de vida
 
+    @property
+    def base_stats(self) -> Dict[str, int]:
+        return self._base_stats
+
+    @base_stats.setter
+    def base_stats(self, stats: Dict[str, int]):
+        self._base_stats = stats
+        self.invalidate_stats()
+
+    def update_base_stats(self, stats: Dict[str, int]):
+        """Modifica stats base; usar esto en vez de base_stats.update() para invalidar la cache"""
+        self._base_stats.update(stats)
+        self.invalidate_stats()
+
+    def invalidate_stats(self):
+        """Descarta los stats derivados; se recalculan en la proxima lectura"""
+        self._total_stats = None
+        self.hp_color = self._calculate_hp_color()
+
     def _calculate_hp_color(self):
         hp = self.current_hp  # Usar current_hp en lugar de base_stats["hp"]
         max_hp = self.get_max_hp()
@@ -172,15 +260,23 @@ class Character:
         else:
             return (255, 50, 50)  # Rojo
         
-    def total_stats(self) -> Dict[str, int]:
+    def total_stats(self) -> Mapping[str, int]:
+        """Stats base mas bonus de equipo, de solo lectura (es la cache compartida)"""
+        if self._total_stats is None:
+            stats = self._compute_stats()
+            self._max_hp = stats.get("max_hp", 100)
+            self._total_stats = MappingProxyType(stats)
+        return self._total_stats
+
+    def _compute_stats(self) -> Dict[str, int]:
         stats = self.base_stats.copy()
         # weapon bonus
         if self.equipment.weapon:
-            for k, v in self.equipment.weapon.stats.items():
+            for k, v in self.equipment.weapon.stat_items():
                 stats[k] = stats.get(k, 0) + v
         # armor bonuses
         for armor in self.equipment.armors:
-            for k, v in armor.stats.items():
+            for k, v in armor.stat_items():
                 stats[k] = stats.get(k, 0) + v
         return stats
     
@@ -193,7 +289,9 @@ class Character:
         self.hp_color = self._calculate_hp_color()
         
     def get_max_hp(self) -> int:
-        return self.total_stats().get("max_hp", 100)
+        if self._total_stats is None:
+            self.total_stats()
+        return self._max_hp
 
     def heal(self, amount: int):
         self.current_hp = min(self.current_hp + amount, self.get_max_hp())
@@ -213,7 +311,7 @@ if __name__ == "__main__":
     boots = Item(4, "Armadura de papel", "armor", {"defense": 1})
 
     # create character
-    hero = Character()
+    hero = Character(5, 5, 100, 5)
     hero.inventory.add(sword)
     hero.inventory.add(helmet)
     hero.inventory.add(shield)
@@ -226,4 +324,4 @@ if __name__ == "__main__":
     # trying to equip a third armor fails
     print("Equip Boots success?", hero.equipment.equip(boots))  # False
 
-    print("Stats:", hero.total_stats())
\ No newline at end of file
+    print("Stats:", dict(hero.total_stats()))
\ No newline at end of file
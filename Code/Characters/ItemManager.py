@@ -1,48 +1,94 @@
-from Characters.Inventory import Item
+import json
+import logging
+from bisect import bisect_left
 from typing import Dict, Optional
 
+from Characters.Inventory import Item
+from Settings.Settings import ITEMS_DATA_FILE
+
+logger = logging.getLogger(__name__)
+
 class ItemManager:
-    """Gestor global de items del juego"""
+    """Gestor global de items del juego.
+
+    Los items se leen de `items.json` la primera vez que alguien los pide.
+    Se indexan por id, por tipo y por nombre (lista ordenada para buscar por
+    prefijo con bisect). La lista de nombres se ordena una sola vez, en la
+    primera busqueda despues de registrar items.
+    """
     
-    def __init__(self):
+    def __init__(self, data_file=ITEMS_DATA_FILE):
+        self.data_file = data_file
         self._items: Dict[int, Item] = {}
-        self._initialize_items()
+        self._by_type: Dict[str, list[Item]] = {}
+        self._names: list[tuple] = []  # (nombre en minusculas, id), ordenada
+        self._names_dirty = False
+        self._loaded = False
     
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self._loaded = True
+            self._initialize_items()
+
     def _initialize_items(self):
-        """Inicializa todos los items del juego"""
-        # Armas
-        self.register_item(Item(1, "Espada maestra", "weapon", {"attack": 0}))
-        self.register_item(Item(5, "Baston magico", "weapon", {"attack": 0}))
-        self.register_item(Item(7, "Daga", "weapon", {"attack": 1}))
-        self.register_item(Item(9, "Espada legendaria", "weapon", {"attack": 5}))
-        
-        # Armaduras
-        self.register_item(Item(2, "Armadura berserker", "armor", {"defense": 2}))
-        self.register_item(Item(3, "Armadura Holografica", "armor", {"defense": 3}))
-        self.register_item(Item(4, "Armadura N.E.O", "armor", {"defense": 1}))
-        self.register_item(Item(6, "Tunica", "armor", {"defense": 1}))
-        self.register_item(Item(8, "Capa", "armor", {"defense": 1}))
-        self.register_item(Item(10, "Armadura divina", "armor", {"defense": 4}))
-        
-        # Consumibles (para futuro uso)
-        self.register_item(Item(11, "Galleta de chocolate", "consumable", {"hp": 50}))
-        self.register_item(Item(12, "Modulo de voluntad", "consumable", {"mp": 30}))
+        """Carga todos los items del juego desde el archivo de datos"""
+        try:
+            with open(self.data_file, encoding="utf-8") as f:
+                records = json.load(f)["items"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Could not load items from {self.data_file}: {e}")
+            return
+
+        for record in records:
+            self.register_item(Item(record["id"], record["name"], record["type"], record.get("stats", {})))
+        logger.info(f"Loaded {len(self._items)} items")
 
     def register_item(self, item: Item):
         """Registra un item en el manager"""
+        self._ensure_loaded()
+        previous = self._items.get(item.id)
+        if previous is not None:
+            self._unindex(previous)
         self._items[item.id] = item
+        self._by_type.setdefault(item.type, []).append(item)
+        self._names_dirty = True
+
+    def _unindex(self, item: Item):
+        self._by_type[item.type].remove(item)
+        self._names_dirty = True
+
+    def _sorted_names(self) -> list[tuple]:
+        if self._names_dirty:
+            self._names = sorted((item.name.lower(), item.id) for item in self._items.values())
+            self._names_dirty = False
+        return self._names
     
     def get_item(self, item_id: int) -> Optional[Item]:
         """Obtiene un item por su ID"""
+        self._ensure_loaded()
         return self._items.get(item_id)
     
     def get_items_by_type(self, item_type: str) -> list[Item]:
         """Obtiene todos los items de un tipo específico"""
-        return [item for item in self._items.values() if item.type == item_type]
+        self._ensure_loaded()
+        return list(self._by_type.get(item_type, ()))
+
+    def find_by_name_prefix(self, prefix: str) -> list[Item]:
+        """Items cuyo nombre empieza por `prefix` (sin distinguir mayusculas), por orden alfabetico"""
+        self._ensure_loaded()
+        prefix = prefix.lower()
+        names = self._sorted_names()
+        result = []
+        index = bisect_left(names, (prefix,))
+        while index < len(names) and names[index][0].startswith(prefix):
+            result.append(self._items[names[index][1]])
+            index += 1
+        return result
     
     def get_all_items(self) -> Dict[int, Item]:
         """Obtiene todos los items registrados"""
+        self._ensure_loaded()
         return self._items.copy()
 
-# Instancia global del ItemManager
-item_manager = ItemManager()
\ No newline at end of file
+# Instancia global del ItemManager (los datos se cargan en el primer acceso)
+item_manager = ItemManager()
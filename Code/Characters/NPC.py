@@ -0,0 +1,138 @@
+import math
+import random
+from Settings.Settings import *
+from ResourceManager import ResourceManager
+
+class NPC(pygame.sprite.Sprite):
+    """Personaje no jugable creado desde la capa NPCS del mapa.
+
+    Propiedades de Tiled que entiende: `sprite` (clave de la hoja de sprites),
+    `Text` (dialogo), `behavior` ("idle", "wander" o "approach"), `speed`,
+    `radius` y, para "approach", `goal` (objetivo del PathfindingService).
+    """
+    DIRECTIONS = {
+        "down": pygame.Vector2(0, 1),
+        "right": pygame.Vector2(1, 0),
+        "left": pygame.Vector2(-1, 0),
+        "up": pygame.Vector2(0, -1),
+    }
+    interpolate = True
+    _placeholder = None  # frames de relleno, se crean con el primer NPC sin hoja
+
+    def __init__(self, name, pos, properties=None, *groups):
+        super().__init__(*groups)
+        properties = properties or {}
+        self.name = name
+        self.dialog = properties.get("Text", "")
+        self.behavior = properties.get("behavior", "idle")
+        self.speed = float(properties.get("speed", 30))
+        self.radius = float(properties.get("radius", 48))
+        self.goal = properties.get("goal", "player")
+        self.stop_distance = float(properties.get("stop_distance", 24))
+        self.sprite_speed = 3
+
+        self.sprite_key = properties.get("sprite")
+        self.load_frames(self.sprite_key)
+        self.state = "down"
+        self.frame_index = 0
+        self.image = self.frames[self.state][0]
+
+        # pos es el punto de apoyo (pies), igual que en Tiled
+        self.home = pygame.Vector2(pos)
+        self.pos = pygame.Vector2(pos)
+        self.hitbox_rect = pygame.Rect(0, 0, 15, 10)
+        self.hitbox_rect.midbottom = (round(self.pos.x), round(self.pos.y))
+        self.rect = self.image.get_rect(midbottom=self.hitbox_rect.midbottom)
+
+        self.direction = pygame.Vector2()
+        self.think_timer = random.uniform(0.5, 2.0)
+
+    def load_frames(self, sprite_key):
+        sheet = ResourceManager.get_instance().get_spritesheet(sprite_key) if sprite_key else None
+        if sheet and sheet.rows >= 4:
+            self.frames = ResourceManager.get_instance().get_animation_table(sprite_key)
+        else:
+            self.frames = self._placeholder_frames()
+
+    @classmethod
+    def _placeholder_frames(cls):
+        """Frames de relleno compartidos por todos los NPC sin hoja"""
+        if cls._placeholder is None:
+            placeholder = pygame.Surface((25, 44))
+            placeholder.fill((200, 120, 60))
+            cls._placeholder = {state: (placeholder,) for state in cls.DIRECTIONS}
+        return cls._placeholder
+
+    def think(self, dt, blocked, pathfinding=None):
+        """Ejecuta el comportamiento. `blocked(rect, npc)` indica si un hitbox choca"""
+        if self.behavior == "wander":
+            self._wander(dt, blocked)
+        elif self.behavior == "approach":
+            self._approach(dt, blocked, pathfinding)
+        self.animate(dt)
+
+    def _wander(self, dt, blocked):
+        self.think_timer -= dt
+        if self.think_timer <= 0:
+            self.think_timer = random.uniform(1.0, 3.0)
+            if self.direction.length_squared() > 0 or random.random() < 0.4:
+                self.direction.update(0, 0)
+            else:
+                self.state = random.choice(list(self.DIRECTIONS))
+                self.direction = self.DIRECTIONS[self.state].copy()
+
+        if self.direction.length_squared() == 0:
+            return
+
+        new_pos = self.pos + self.direction * self.speed * dt
+        if new_pos.distance_to(self.home) > self.radius or not self._move_to(new_pos, blocked):
+            # Chocar o alejarse demasiado corta el paseo actual
+            self.direction.update(0, 0)
+            self.think_timer = random.uniform(0.5, 1.5)
+
+    def _approach(self, dt, blocked, pathfinding):
+        """Sigue el campo de distancia compartido hacia su objetivo"""
+        center = self.hitbox_rect.center
+        distance = pathfinding.distance(self.goal, center) if pathfinding else math.inf
+        # Sin campo (todavia), sin camino o ya cerca del objetivo: quedarse quieto
+        if math.isinf(distance) or distance <= self.stop_distance:
+            self.direction.update(0, 0)
+            return
+
+        self.direction = pathfinding.direction(self.goal, center)
+        if self.direction.length_squared() == 0:
+            return
+        if abs(self.direction.x) > abs(self.direction.y):
+            self.state = "right" if self.direction.x > 0 else "left"
+        else:
+            self.state = "down" if self.direction.y > 0 else "up"
+        if not self._move_to(self.pos + self.direction * self.speed * dt, blocked):
+            self.direction.update(0, 0)
+
+    def _move_to(self, new_pos, blocked):
+        """Mueve el NPC si el hitbox en new_pos esta libre"""
+        new_hitbox = self.hitbox_rect.copy()
+        new_hitbox.midbottom = (round(new_pos.x), round(new_pos.y))
+        if blocked(new_hitbox, self):
+            return False
+        self.pos = new_pos
+        self.hitbox_rect = new_hitbox
+        self.rect.midbottom = self.hitbox_rect.midbottom
+        return True
+
+    def animate(self, dt):
+        frames = self.frames[self.state]
+        if self.direction.length_squared() > 0:
+            self.frame_index = (self.frame_index + self.sprite_speed * dt) % len(frames)
+        else:
+            self.frame_index = 0
+        self.image = frames[int(self.frame_index)]
+
+    def face(self, target_pos):
+        """Gira hacia una posicion (por ejemplo, al hablar con el jugador)"""
+        delta = pygame.Vector2(target_pos) - self.pos
+        if abs(delta.x) > abs(delta.y):
+            self.state = "right" if delta.x > 0 else "left"
+        else:
+            self.state = "down" if delta.y > 0 else "up"
+        self.image = self.frames[self.state][int(self.frame_index)]
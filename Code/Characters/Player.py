@@ -4,11 +4,12 @@ from Settings.Settings import *
 from ResourceManager import ResourceManager
 
 class Player(pygame.sprite.Sprite):
-    def __init__(self, game_scene, pos, sprite_sheet_key, dialog_manager, interactuables, collision_sprites, groups):
+    interpolate = True  # se dibuja interpolado entre pasos de simulacion
+
+    def __init__(self, game_scene, pos, sprite_sheet_key, dialog_manager, interactuables, collision_sprites, groups, npc_manager=None):
         super().__init__(groups)
-        # Carga la hoja de sprites
-        resource_manager = ResourceManager.get_instance()
-        self.sprite_sheet = resource_manager.get_spritesheet(sprite_sheet_key)
+        # Frames de la hoja (la escena retiene la hoja con un handle)
+        self.sprite_sheet_key = sprite_sheet_key
         self.load_frames()
         
         self._init_player_properties(pos)
@@ -20,6 +21,7 @@ class Player(pygame.sprite.Sprite):
         # grupos de sprites
         self.collision_sprites = collision_sprites
         self.interactables = interactuables
+        self.npc_manager = npc_manager
         self.frame_index = 0
         
         # NUEVO: Variables para tracking mejorado
@@ -39,13 +41,17 @@ class Player(pygame.sprite.Sprite):
         self.sprite_speed = 3
         
     def load_frames(self):
-        # TO DO: hacer esto mas dinamico
-        self.frames = {
-            "down": self.sprite_sheet.get_row(0),
-            "right": self.sprite_sheet.get_row(1),
-            "left": self.sprite_sheet.get_row(2),
-            "up": self.sprite_sheet.get_row(3)
-        }
+        # Tabla compartida por todas las instancias que usan la misma hoja
+        self.frames = ResourceManager.get_instance().get_animation_table(self.sprite_sheet_key)
+
+    def set_variant(self, palette=None, tint=None):
+        """Usa una variante de color de la hoja (sin argumentos vuelve a la original).
+
+        La variante se genera una vez en el ResourceManager; cambiar de una a
+        otra solo cambia la tabla de frames.
+        """
+        self.frames = ResourceManager.get_instance().get_variant_table(self.sprite_sheet_key, palette, tint)
+        self.image = self.frames[self.state][int(self.frame_index)]
         
     def get_interaction_rect(self):
         # 1) Offset a media baldosa
@@ -113,6 +119,8 @@ class Player(pygame.sprite.Sprite):
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_e:
                     self.interaction_rect = self.get_interaction_rect()
+                    if self.interact_with_npc():
+                        continue
                     for zone in self.interactables:
                         if zone.rect.colliderect(self.interaction_rect):
                             if hasattr(zone, "next_map") and zone.next_map:
@@ -126,6 +134,17 @@ class Player(pygame.sprite.Sprite):
                     print("Skip dialogue")
                     self.skip_dialogue()
                     
+    def interact_with_npc(self):
+        """Habla con el NPC que tenga delante. Devuelve True si habia uno"""
+        if not self.npc_manager:
+            return False
+        npc = self.npc_manager.nearest(self.interaction_rect.inflate(8, 8), self.hitbox_rect.center)
+        if npc is None or not npc.dialog:
+            return False
+        npc.face(self.hitbox_rect.center)
+        self.dialog_manager.get_text(npc.dialog)
+        return True
+
     def move_player(self, keys):
         old_direction = self.direction.copy()
         
@@ -172,20 +191,30 @@ class Player(pygame.sprite.Sprite):
         movement_distance = (self.pos - self.last_pos).length()
         self.is_actually_moving = movement_distance > 0.1
 
+    def obstacle_rects(self):
+        # Colliders del mapa que tocan el hitbox con su forma real; el empuje usa su caja.
+        # Con NPCManager se consultan solo las celdas del hitbox en su particion
+        colliders = self.npc_manager.static_query(self.hitbox_rect) if self.npc_manager else self.collision_sprites
+        rects = [collider.rect for collider in colliders if collider.collides(self.hitbox_rect)]
+        if self.npc_manager:
+            # Solo los NPCs de las celdas que toca el hitbox
+            rects.extend(npc.hitbox_rect for npc in self.npc_manager.query(self.hitbox_rect))
+        return rects
+
     def collision(self, direction):
-        for sprite in self.collision_sprites:
-            if sprite.rect.colliderect(self.hitbox_rect):
+        for rect in self.obstacle_rects():
+            if rect.colliderect(self.hitbox_rect):
                 if direction == "horizontal":
                     if self.direction.x > 0:  # Moviendo a la derecha
-                        self.hitbox_rect.right = sprite.rect.left
+                        self.hitbox_rect.right = rect.left
                     elif self.direction.x < 0:  # Moviendo a la izquierda
-                        self.hitbox_rect.left = sprite.rect.right
+                        self.hitbox_rect.left = rect.right
                     self.pos.x = self.hitbox_rect.centerx
                 elif direction == "vertical":
                     if self.direction.y > 0:  # Moviendo hacia abajo
-                        self.hitbox_rect.bottom = sprite.rect.top
+                        self.hitbox_rect.bottom = rect.top
                     elif self.direction.y < 0:  # Moviendo hacia arriba
-                        self.hitbox_rect.top = sprite.rect.bottom
+                        self.hitbox_rect.top = rect.bottom
                     self.pos.y = self.hitbox_rect.bottom - 18
     
     def animate(self, dt):
@@ -3,11 +3,13 @@
 import pygame
 import math
 from Settings.Settings import *
+from GameSystems import UpdateTier
 
 class CircularDebugSprite(pygame.sprite.Sprite):
     """
     Sprite circular simple para debuggear problemas de renderizado y seguimiento
     """
+    interpolate = True
     
     def __init__(self, color=(255, 0, 0), radius=8, *groups):
         super().__init__(*groups)
@@ -44,6 +46,7 @@ class CircularDebugSprite(pygame.sprite.Sprite):
         """Teletransporta el círculo a una posicion específica"""
         self.set_position(position[0], position[1])
         self.trail_points.clear()  # Limpiar trail al teletransportar
+        self.prev_topleft = None
     
     def draw_trail(self, surface, camera_offset):
         """Dibuja el rastro del movimiento (util para debug)"""
@@ -66,6 +69,7 @@ class MovingCircle(CircularDebugSprite):
     """
     Círculo que se mueve en patrones predefinidos
     """
+    update_tier = UpdateTier.OFFSCREEN_SLEEP
     
     def __init__(self, movement_type="circular", speed=50, *groups):
         # FIX: Pasar argumentos correctamente al constructor padre
@@ -177,12 +181,14 @@ class DebugCircleManager:
         self.game_scene = game_scene
         self.circles = []
         self.show_trails = True
+        self.info_font = None
         
     def add_moving_circle(self, movement_type="circular", speed=50):
         """Añade un círculo con movimiento automático"""
         circle = MovingCircle(movement_type, speed)
         # Añadir al grupo de sprites del mundo
         self.game_scene.world_manager.all_sprites.add(circle)
+        self.game_scene.update_scheduler.register(circle)
         self.circles.append(circle)
         return circle
     
@@ -191,6 +197,7 @@ class DebugCircleManager:
         follower = FollowerDebugCircle(target_sprite, delay_frames)
         # Añadir al grupo de sprites del mundo
         self.game_scene.world_manager.all_sprites.add(follower)
+        self.game_scene.update_scheduler.register(follower)
         self.circles.append(follower)
         return follower
     
@@ -215,7 +222,9 @@ class DebugCircleManager:
                 circle.draw_trail(surface, camera_offset)
         
         # Informacion de debug en pantalla
-        font = pygame.font.Font(None, 16)
+        if self.info_font is None:
+            self.info_font = pygame.font.Font(None, 16)
+        font = self.info_font
         info_text = f"Debug Circles: {len(self.circles)} | Trails: {'ON' if self.show_trails else 'OFF'}"
         text_surf = font.render(info_text, True, (255, 255, 255))
         surface.blit(text_surf, (10, surface.get_height() - 25))
@@ -2,6 +2,7 @@ import pygame
 from enum import Enum
 from Characters.Inventory import Item, Character
 from Characters.ItemManager import item_manager
+from Settings.Settings import SPRITE_TINTS
 
 import logging
 logger = logging.getLogger(__name__)
@@ -26,12 +27,19 @@ class DebugMenu:
         self.show_interaction_zones = False
         self.noclip_mode = False
         self.god_mode = False
+        self.player_tint = None  # clave de SPRITE_TINTS o None
         
         # Configuracion de menu
         self.menu_width = 280
         self.menu_height = 200
         self.menu_x = 20
         self.menu_y = 20
+        self.instructions_font = pygame.font.Font(None, 12)
+        
+        # Panel ya renderizado; se rehace al cambiar algo o cuando el
+        # FrameGovernor deja redibujar la UI
+        self._panel = None
+        self._panel_dirty = True
         
         # Opciones por categoría
         self.menu_options = {
@@ -67,11 +75,13 @@ class DebugMenu:
                 ("Remove All Circles", self.remove_all_circles),
                 ("Show Party Info", self.show_party_info),
                 ("Show Item Counts", self.show_item_counts),
+                ("Show Update Stats", self.show_update_stats),
                 ("← Back", lambda: self.change_category(DebugCategory.MAIN))
             ],
             DebugCategory.PLAYER: [
                 (f"Noclip: {'ON' if self.noclip_mode else 'OFF'}", self.toggle_noclip),
                 (f"God Mode: {'ON' if self.god_mode else 'OFF'}", self.toggle_god_mode),
+                (f"Tint: {self.player_tint or 'OFF'}", self.cycle_player_tint),
                 ("Teleport to Start", self.teleport_to_start),
                 ("Max Stats", self.max_player_stats),
                 ("Reset Player", self.reset_player),
@@ -105,6 +115,7 @@ class DebugMenu:
     def toggle_visibility(self):
         from GameSystems import GameState
         self.visible = not self.visible
+        self._panel_dirty = True
         if self.visible:
             # Al abrir: reset de categoría y cambio de estado
             self.current_category = DebugCategory.MAIN
@@ -140,12 +151,17 @@ class DebugMenu:
                 f"God Mode: {'ON' if self.god_mode else 'OFF'}", 
                 self.toggle_god_mode
             )
+            self.menu_options[DebugCategory.PLAYER][2] = (
+                f"Tint: {self.player_tint or 'OFF'}",
+                self.cycle_player_tint
+            )
 
     def handle_input(self, event):
         if not self.visible:
             return False
 
         if event.type == pygame.KEYDOWN:
+            self._panel_dirty = True
             current_options = self.menu_options[self.current_category]
             
             if event.key == pygame.K_UP:
@@ -214,7 +230,7 @@ class DebugMenu:
         if not current_char:
             return
             
-        current_char.inventory._items.clear()
+        current_char.inventory.clear()
         print("[DEBUG] Inventario limpiado")
 
     def give_legendary_items(self):
@@ -282,6 +298,22 @@ class DebugMenu:
                 print(f"{item.name}: {qty}")
         print("=================")
 
+    def show_update_stats(self):
+        if not hasattr(self.game_scene, 'update_scheduler'):
+            return
+        print("\n=== UPDATE STATS ===")
+        for tier, stats in self.game_scene.update_scheduler.get_stats().items():
+            print(f"{tier}: {stats['updated']}/{stats['entities']} entidades, {stats['ms']:.3f} ms")
+        if hasattr(self.game_scene, 'world_manager'):
+            npc_stats = self.game_scene.world_manager.npc_manager.stats
+            print(f"npcs: {npc_stats['awake']}/{npc_stats['npcs']} despiertos, {npc_stats['ms']:.3f} ms")
+            pathfinding = self.game_scene.world_manager.pathfinding
+            if pathfinding:
+                stats = pathfinding.stats
+                print(f"pathfinding: {stats['fields']} campos, {stats['pending']} pendientes, "
+                      f"{stats['expanded']} celdas este frame, {stats['paths']} consultas A*")
+        print("====================")
+
     def toggle_sprites_outline(self):
         # Esta funcion se implementaría en el sistema de render
         print("[DEBUG] Outline de sprites (no implementado aun)")
@@ -300,6 +332,16 @@ class DebugMenu:
             self.heal_all_party()
         print(f"[DEBUG] God Mode: {'ON' if self.god_mode else 'OFF'}")
 
+    def cycle_player_tint(self):
+        """Pasa por las variantes de SPRITE_TINTS y vuelve a la original"""
+        names = [None] + list(SPRITE_TINTS)
+        self.player_tint = names[(names.index(self.player_tint) + 1) % len(names)]
+        if hasattr(self.game_scene, 'player'):
+            tint = SPRITE_TINTS[self.player_tint] if self.player_tint else None
+            self.game_scene.player.set_variant(tint=tint)
+        self.update_dynamic_options()
+        print(f"[DEBUG] Tint: {self.player_tint or 'OFF'}")
+
     def teleport_to_start(self):
         if hasattr(self.game_scene, 'player') and hasattr(self.game_scene, 'map'):
             start_pos = self.game_scene.map.return_start_point()
@@ -310,7 +352,7 @@ class DebugMenu:
 
     def max_player_stats(self):
         for char in self.game_scene.characters:
-            char.base_stats.update({
+            char.update_base_stats({
                 "attack": 99,
                 "defense": 99,
                 "max_hp": 999,
@@ -338,16 +380,25 @@ class DebugMenu:
         if not self.visible:
             return
 
+        governor = getattr(self.game_scene, 'governor', None)
+        if self._panel is None or self._panel_dirty or governor is None or governor.should_run("ui_redraw"):
+            self._panel = self._render_panel(governor)
+            self._panel_dirty = False
+        surface.blit(self._panel, (self.menu_x, self.menu_y))
+
+    def _render_panel(self, governor):
+        panel = pygame.Surface((self.menu_width, self.menu_height))
+
         # Fondo del menu
-        menu_rect = pygame.Rect(self.menu_x, self.menu_y, self.menu_width, self.menu_height)
-        pygame.draw.rect(surface, (20, 20, 20), menu_rect)
-        pygame.draw.rect(surface, (100, 100, 100), menu_rect, 2)
+        menu_rect = panel.get_rect()
+        pygame.draw.rect(panel, (20, 20, 20), menu_rect)
+        pygame.draw.rect(panel, (100, 100, 100), menu_rect, 2)
 
         # Título
         category_name = self.current_category.value.replace('_', ' ').title()
         title_text = f"DEBUG MENU - {category_name}"
         title_surf = self.font.render(title_text, True, (255, 255, 0))
-        surface.blit(title_surf, (self.menu_x + 5, self.menu_y + 5))
+        panel.blit(title_surf, (5, 5))
 
         # Opciones del menu
         current_options = self.menu_options[self.current_category]
@@ -358,22 +409,30 @@ class DebugMenu:
             if i == self.selected_index:
                 # Highlight para opcion seleccionada
                 highlight_rect = pygame.Rect(
-                    self.menu_x + 2, 
-                    self.menu_y + y_offset - 2, 
+                    2, 
+                    y_offset - 2, 
                     self.menu_width - 4, 
                     self.font.get_height() + 2
                 )
-                pygame.draw.rect(surface, (50, 50, 150), highlight_rect)
+                pygame.draw.rect(panel, (50, 50, 150), highlight_rect)
                 color = (255, 255, 0)
 
             option_surf = self.font.render(text, True, color)
-            surface.blit(option_surf, (self.menu_x + 5, self.menu_y + y_offset))
+            panel.blit(option_surf, (5, y_offset))
             y_offset += self.font.get_height() + 3
 
+        # Nivel de degradacion del FrameGovernor
+        if governor:
+            stats = governor.get_stats()
+            governor_text = f"Governor: L{stats['level']} {stats['average_ms']:.1f}/{stats['budget_ms']:.1f} ms"
+            governor_surf = self.instructions_font.render(governor_text, True, (150, 150, 150))
+            panel.blit(governor_surf, (self.menu_width - governor_surf.get_width() - 5, 5 + self.font.get_height()))
+
         # Instrucciones
         instructions = "↑↓: Navigate | ENTER: Select | F1/ESC: Close"
-        inst_surf = pygame.font.Font(None, 12).render(instructions, True, (150, 150, 150))
-        surface.blit(inst_surf, (self.menu_x + 5, self.menu_y + self.menu_height - 15))
+        inst_surf = self.instructions_font.render(instructions, True, (150, 150, 150))
+        panel.blit(inst_surf, (5, self.menu_height - 15))
+        return panel
 
     def draw_debug_visuals(self, surface, camera_offset):
         """Dibuja elementos de debug visual"""
@@ -382,9 +441,8 @@ class DebugMenu:
 
         # Dibujar hitboxes de colision
         if self.show_hitboxes and hasattr(self.game_scene, 'collision'):
-            for sprite in self.game_scene.collision:
-                screen_rect = sprite.rect.move(camera_offset)
-                pygame.draw.rect(surface, (255, 0, 0), screen_rect, 1)
+            for collider in self.game_scene.collision:
+                collider.draw(surface, camera_offset)
 
         # Dibujar zonas de interaccion
         if self.show_interaction_zones and hasattr(self.game_scene, 'interactable_group'):
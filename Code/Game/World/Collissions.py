@@ -0,0 +1,159 @@
+from Settings.Settings import *
+
+class CollisionGrid:
+    """Rejilla de celdas bloqueadas construida a partir de los rects de colision"""
+
+    def __init__(self, width, height, tile_size=TILE_SIZE, cells=None):
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.cells = bytearray(cells) if cells is not None else bytearray(width * height)
+
+    @classmethod
+    def from_rects(cls, width, height, tile_size, rects):
+        """Marca como bloqueada toda celda que se solape con algun rect"""
+        grid = cls(width, height, tile_size)
+        for rect in rects:
+            x, y, w, h = rect
+            if w <= 0 or h <= 0:
+                continue
+            x0 = max(0, int(x // tile_size))
+            y0 = max(0, int(y // tile_size))
+            x1 = min(width - 1, int((x + w - 1e-6) // tile_size))
+            y1 = min(height - 1, int((y + h - 1e-6) // tile_size))
+            for cy in range(y0, y1 + 1):
+                row = cy * width
+                for cx in range(x0, x1 + 1):
+                    grid.cells[row + cx] = 1
+        return grid
+
+    def in_bounds(self, cx, cy):
+        return 0 <= cx < self.width and 0 <= cy < self.height
+
+    def is_blocked(self, cx, cy):
+        """Las celdas fuera del mapa cuentan como bloqueadas"""
+        if not self.in_bounds(cx, cy):
+            return True
+        return self.cells[cy * self.width + cx] != 0
+
+    def cell_at(self, pos):
+        """Celda que contiene una posicion en pixeles"""
+        return (int(pos[0] // self.tile_size), int(pos[1] // self.tile_size))
+
+    def cell_center(self, cell):
+        """Centro en pixeles de una celda"""
+        half = self.tile_size / 2
+        return (cell[0] * self.tile_size + half, cell[1] * self.tile_size + half)
+
+    def to_dict(self):
+        """Formato serializable (una cadena de 0/1 por fila)"""
+        rows = []
+        for cy in range(self.height):
+            row = self.cells[cy * self.width:(cy + 1) * self.width]
+            rows.append("".join("1" if c else "0" for c in row))
+        return {"width": self.width, "height": self.height, "tile_size": self.tile_size, "rows": rows}
+
+    @classmethod
+    def from_dict(cls, data):
+        cells = bytearray()
+        for row in data["rows"]:
+            cells.extend(1 if c == "1" else 0 for c in row)
+        return cls(data["width"], data["height"], data["tile_size"], cells)
+
+class Collider:
+    """Obstaculo estatico del mapa. Solo guarda geometria, sin superficie.
+
+    `shape` es "rect", "polygon" o "ellipse". `rect` es siempre la caja
+    envolvente (la usan el indice espacial, la rejilla y la resolucion de
+    choques del jugador); `collides` afina la prueba con la forma real.
+    """
+    __slots__ = ("bounds", "rect", "shape", "points", "closed")
+
+    def __init__(self, bounds, shape="rect", points=None, closed=True):
+        self.bounds = tuple(bounds)  # (x, y, w, h) sin redondear, como en Tiled
+        self.rect = pygame.Rect(self.bounds)
+        self.shape = shape
+        self.points = tuple(tuple(p) for p in points) if points else ()
+        self.closed = closed         # False para polilineas
+
+    @classmethod
+    def from_tiled(cls, obj):
+        """Collider de un objeto de la capa Collisions"""
+        points = getattr(obj, "points", None)
+        if points:
+            xs = [p[0] for p in points]
+            ys = [p[1] for p in points]
+            bounds = (min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))
+            return cls(bounds, "polygon", points, getattr(obj, "closed", True))
+        bounds = (obj.x, obj.y, obj.width, obj.height)
+        # pytmx no lee la etiqueta <ellipse>: tambien vale la propiedad shape=ellipse
+        if getattr(obj, "ellipse", False) or obj.properties.get("shape") == "ellipse":
+            return cls(bounds, "ellipse")
+        return cls(bounds)
+
+    def to_data(self):
+        """Formato del map.json compilado: los rects siguen siendo [x, y, w, h]"""
+        if self.shape == "rect":
+            return list(self.bounds)
+        return {"rect": list(self.bounds), "shape": self.shape,
+                "points": [list(p) for p in self.points], "closed": self.closed}
+
+    @classmethod
+    def from_data(cls, data):
+        if isinstance(data, dict):
+            return cls(data["rect"], data["shape"], data.get("points"), data.get("closed", True))
+        return cls(data)
+
+    def collides(self, rect) -> bool:
+        """Indica si rect toca la forma"""
+        if not self.rect.colliderect(rect):
+            return False
+        if self.shape == "polygon":
+            return _polygon_hits_rect(self.points, self.closed, rect)
+        if self.shape == "ellipse":
+            return _ellipse_hits_rect(self.bounds, rect)
+        return True
+
+    def draw(self, surface, offset, color=(255, 0, 0)):
+        """Contorno de la forma para el modo debug"""
+        ox, oy = offset
+        if self.shape == "polygon" and len(self.points) > 1:
+            points = [(x + ox, y + oy) for x, y in self.points]
+            pygame.draw.lines(surface, color, self.closed, points, 1)
+        elif self.shape == "ellipse":
+            pygame.draw.ellipse(surface, color, self.rect.move(offset), 1)
+        else:
+            pygame.draw.rect(surface, color, self.rect.move(offset), 1)
+
+def _point_in_polygon(x, y, points):
+    inside = False
+    j = len(points) - 1
+    for i in range(len(points)):
+        xi, yi = points[i]
+        xj, yj = points[j]
+        if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+def _polygon_hits_rect(points, closed, rect):
+    if any(rect.collidepoint(p) for p in points):
+        return True
+    edges = list(zip(points, points[1:]))
+    if closed and len(points) > 2:
+        edges.append((points[-1], points[0]))
+    if any(rect.clipline(a, b) for a, b in edges):
+        return True
+    # Sin vertices dentro ni bordes cruzando: el rect esta entero dentro o fuera
+    return closed and _point_in_polygon(rect.centerx, rect.centery, points)
+
+def _ellipse_hits_rect(bounds, rect):
+    x, y, w, h = bounds
+    if w <= 0 or h <= 0:
+        return False
+    rx, ry = w / 2, h / 2
+    cx, cy = x + rx, y + ry
+    # Punto del rect mas cercano al centro de la elipse
+    px = min(max(cx, rect.left), rect.right)
+    py = min(max(cy, rect.top), rect.bottom)
+    return ((px - cx) / rx) ** 2 + ((py - cy) / ry) ** 2 <= 1.0
@@ -1,5 +1,6 @@
 from Settings.Settings import *
 import math
+from TextureAtlas import blit_image
 
 class AllSprites(pygame.sprite.Group):
     def __init__(self):
@@ -9,9 +10,34 @@ class AllSprites(pygame.sprite.Group):
         self.camera_smooth = False  # Cambiar a True para suavizado
         self.smooth_factor = 0.1    # Factor de suavizado (0.1 = muy suave, 1.0 = sin suavizado)
         self.target_offset = pygame.Vector2()
+        self.allow_smoothing = True  # el FrameGovernor lo apaga bajo carga
+        # Sprites que se mueven (atributo `interpolate`) y pasos simulados desde el ultimo draw
+        self.moving = set()
+        self.sim_steps = 0
 
-    def draw(self, surface, target_position):
-        """Renderiza todos los sprites con offset de cámara sin temblequeo"""
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        if getattr(sprite, "interpolate", False):
+            # Al entrar al grupo no hay estado anterior del que interpolar
+            sprite.prev_topleft = None
+            self.moving.add(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.moving.discard(sprite)
+
+    def save_previous(self):
+        """Guarda la posicion de los sprites moviles antes de un paso de simulacion"""
+        for sprite in self.moving:
+            sprite.prev_topleft = sprite.rect.topleft
+        self.sim_steps += 1
+
+    def draw(self, surface, target_position, alpha=1.0):
+        """Renderiza todos los sprites con offset de cámara sin temblequeo.
+
+        `alpha` es la fraccion del paso de simulacion actual: los sprites
+        moviles se dibujan entre su posicion anterior y la actual.
+        """
         screen_width = surface.get_width()
         screen_height = surface.get_height()
         
@@ -21,16 +47,19 @@ class AllSprites(pygame.sprite.Group):
         self.target_offset.x = target_x
         self.target_offset.y = target_y
         
-        if self.camera_smooth:
-            # Interpolacion suave de cámara (opcional)
-            self.offset.x += (self.target_offset.x - self.offset.x) * self.smooth_factor
-            self.offset.y += (self.target_offset.y - self.offset.y) * self.smooth_factor
+        if self.camera_smooth and self.allow_smoothing:
+            # Interpolacion suave de cámara (opcional), aplicada una vez por paso
+            # simulado para que no dependa de los FPS de render
+            factor = 1.0 - (1.0 - self.smooth_factor) ** self.sim_steps
+            self.offset.x += (self.target_offset.x - self.offset.x) * factor
+            self.offset.y += (self.target_offset.y - self.offset.y) * factor
             # Redondear despues de la interpolacion
             final_offset = (round(self.offset.x), round(self.offset.y))
         else:
             # Sin suavizado - usar directamente los valores redondeados
             self.offset = self.target_offset.copy()
             final_offset = (int(self.offset.x), int(self.offset.y))
+        self.sim_steps = 0
 
         # Separar capas manteniendo el orden de renderizado
         ground_sprites = [s for s in self if hasattr(s, "ground")]
@@ -39,12 +68,17 @@ class AllSprites(pygame.sprite.Group):
         # Renderizar cada capa con posiciones enteras
         for layer in (ground_sprites, object_sprites):
             for sprite in sorted(layer, key=lambda s: s.rect.centery + getattr(s, "sorting_offset_y", 0)):
+                x, y = sprite.rect.topleft
+                prev = getattr(sprite, "prev_topleft", None) if alpha < 1.0 else None
+                if prev is not None:
+                    x = prev[0] + (x - prev[0]) * alpha
+                    y = prev[1] + (y - prev[1]) * alpha
                 # CLAVE: Asegurar que las posiciones finales sean enteros
                 render_pos = (
-                    round(sprite.rect.topleft[0] + final_offset[0]),
-                    round(sprite.rect.topleft[1] + final_offset[1])
+                    round(x + final_offset[0]),
+                    round(y + final_offset[1])
                 )
-                surface.blit(sprite.image, render_pos)
+                blit_image(surface, sprite.image, render_pos)
 
     def set_camera_smooth(self, enabled: bool, smooth_factor: float = 0.1):
         """Configura el suavizado de cámara"""
@@ -54,6 +88,11 @@ class AllSprites(pygame.sprite.Group):
             # Si se desactiva el suavizado, sincronizar offsets
             self.offset = self.target_offset.copy()
 
+    def get_view_rect(self, size):
+        """Rectangulo del mundo visible con el offset actual de la cámara"""
+        offset = self.get_camera_offset()
+        return pygame.Rect(-offset[0], -offset[1], size[0], size[1])
+
     def get_camera_offset(self):
         """Obtiene el offset actual de la cámara (util para debug)"""
         return (int(self.offset.x), int(self.offset.y))
\ No newline at end of file
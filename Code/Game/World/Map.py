@@ -1,111 +1,256 @@
+import os
+import time
 from Settings.Settings import *
 from Game.World.Sprites import Sprite
-from pytmx.util_pygame import load_pygame, pytmx
-from Game.World.Sprites import collissionSprite, Sprite, ObjectSprite, InteractableZone
+from pytmx.util_pygame import load_pygame, pytmx, handle_transformation
+from Game.World.Sprites import Sprite, ObjectSprite, InteractableZone
+from Game.World.Collissions import CollisionGrid, Collider
+from Game.World.MapCache import find_compiled_map
+from Game.World.SurfaceOptimizer import SurfaceOptimizer
+from ResourceManager import ResourceManager
+from Characters.NPC import NPC
+
+TILE_LAYERS = ("Ground", "Decorations", "Background", "Others")
+
+def deferred_image_loader(filename, colorkey, **kwargs):
+    """Image loader para pytmx que no convierte los tiles al parsear.
+
+    La conversion a formato de pantalla se hace despues, por partes, desde
+    Map.load_steps y solo para los gids que el mapa usa de verdad.
+    """
+    if colorkey:
+        colorkey = pygame.Color("#{0}".format(colorkey))
+    pixelalpha = kwargs.get("pixelalpha", True)
+    image = pygame.image.load(filename)
+
+    def load_image(rect=None, flags=None):
+        tile = image.subsurface(rect) if rect else image.copy()
+        if flags:
+            tile = handle_transformation(tile, flags)
+        # Guardamos como convertir el tile cuando llegue su turno
+        return _PendingTile(tile, colorkey, pixelalpha)
+
+    return load_image
+
+class _PendingTile:
+    """Tile parseado pero todavia sin convertir"""
+    __slots__ = ("surface", "colorkey", "pixelalpha")
+
+    def __init__(self, surface, colorkey, pixelalpha):
+        self.surface = surface
+        self.colorkey = colorkey
+        self.pixelalpha = pixelalpha
+
+    def realize(self, optimizer):
+        return optimizer.optimize(self.surface, self.colorkey, self.pixelalpha)
+
 class Map():
-    def __init__(self,map_path, tile_size=TILE_SIZE,interactuable_sprites=None, allsprites_group=None, collision_group=None):
+    def __init__(self,map_path, tile_size=TILE_SIZE,interactuable_sprites=None, allsprites_group=None, collision_group=None, npc_group=None, deferred=False):
 
         self.allsprites_group = allsprites_group
-        self.collision_group = collision_group
+        self.collision_group = collision_group if collision_group is not None else []
         self.map_path = map_path
         self.tile_size = tile_size
-        self.interactable_group = interactuable_sprites 
+        self.interactable_group = interactuable_sprites
+        self.npc_group = npc_group if npc_group is not None else pygame.sprite.Group()
+        self.loaded = False
+        self.compiled = False
+        self.collision_grid = None
+        self._converted = {}  # gid -> surface ya convertida
+        # formato de cada superficie y su reparto (8 bits si el modo indexado esta activo)
+        self.surface_optimizer = SurfaceOptimizer(ResourceManager.get_instance().palette)
+        self._collision_rects = []
         print(f"[DEBUG] Cargando mapa desde: {self.map_path} con tamaño de tile: {self.tile_size}")
-        self.load_map()
-    
+        if not deferred:
+            self.load_map()
+
     def load_map(self):
-        self.tmx_data = load_pygame(self.map_path)
-        
+        """Carga el mapa completo de una sola vez"""
+        for _ in self.load_steps():
+            pass
+
+    def load_steps(self, tiles_per_step=MAP_LOAD_TILES_PER_STEP, objects_per_step=MAP_LOAD_OBJECTS_PER_STEP):
+        """Generador que construye el mapa por partes.
+
+        Cada yield es un punto donde la carga puede pausarse hasta el proximo
+        frame: tras parsear el TMX, cada `tiles_per_step` tiles y cada
+        `objects_per_step` objetos. La conversion de superficies cuenta como
+        trabajo del tile u objeto que la necesita.
+
+        Si existe una version compilada vigente (ver MapCompiler) se carga
+        esa en lugar de parsear el TMX.
+        """
+        compiled_dir, manifest = find_compiled_map(self.map_path)
+        if manifest is not None:
+            yield from self._load_compiled_steps(compiled_dir, manifest, objects_per_step)
+            return
+
+        self.tmx_data = pytmx.TiledMap(self.map_path, image_loader=deferred_image_loader)
+        yield
+
+        tiles = 0
+        objects = 0
         for layer in self.tmx_data.visible_layers:
             if isinstance(layer, pytmx.TiledTileLayer):
-                for x, y, surf in layer.tiles():
+                if layer.name not in TILE_LAYERS:
+                    continue
+                for x, y, gid in layer.iter_data():
+                    if not gid:
+                        continue
                     pos = (x * self.tile_size, y * self.tile_size)
+                    Sprite(pos, self._get_surface(gid), self.allsprites_group)
+                    tiles += 1
+                    if tiles >= tiles_per_step:
+                        tiles = 0
+                        yield
 
-                    if layer.name == "Ground":
-                        Sprite(pos, surf, self.allsprites_group)
-                    
-                    elif layer.name == "Decorations":
-                        Sprite(pos, surf, self.allsprites_group) 
-                    elif layer.name == "Background":
-                        Sprite(pos, surf, self.allsprites_group)
-                    elif layer.name == "Others":
-                        Sprite(pos, surf, self.allsprites_group)
-            
             elif isinstance(layer, pytmx.TiledObjectGroup):
-                if layer.name == "NPCS":
-                    for obj in layer:
-                        print("NPC:", obj.name, obj.x, obj.y)
-                        if obj.name == "Start_point":
-                            self.set_start_point(obj.x, obj.y)
-                elif layer.name == "Collisions":
-                    for obj in layer:
-                        pos = (obj.x, obj.y)
-                        surf = pygame.Surface((obj.width, obj.height))
-                        collissionSprite(pos, surf, self.collision_group)
-                        
-                elif layer.name == "Objetos":
-                    for obj in layer:
-                        ObjectSprite((obj.x, obj.y),obj.image, self.allsprites_group)
-                        
-                elif layer.name == "Interactuable":
-                    for obj in layer:
-                        print("Interactuable:", obj.name, obj.x, obj.y)
-                        if obj.name == "Dialog":
-                            new_sprite = InteractableZone(obj.x, obj.y, obj.width, obj.height, 
-                                                        text=obj.properties.get("Text", ""),
-                                                        speed=obj.properties.get("speed", 2),
-                                                        sound=obj.properties.get("sound", "default"),
-                                                        portrait=obj.properties.get("img", None)
-                                                        )
-                            self.interactable_group.add(new_sprite)
-                        elif obj.name == "Next_level":
-                            print(f"[DEBUG] Interactable zone for next map: {obj.properties.get('next', '')}")
-                            zone = InteractableZone(obj.x, obj.y, obj.width, obj.height,
-                                    next_map=obj.properties.get("next", ""))
-                            
-                            self.interactable_group.add(zone)
+                for obj in layer:
+                    self._load_object(layer.name, obj)
+                    objects += 1
+                    if objects >= objects_per_step:
+                        objects = 0
+                        yield
+
+        self.collision_grid = CollisionGrid.from_rects(
+            self.tmx_data.width, self.tmx_data.height, self.tile_size, self._collision_rects)
+        self._finish_load()
+
+    def _load_compiled_steps(self, compiled_dir, manifest, objects_per_step):
+        """Carga un mapa desde la cache generada por MapCompiler"""
+        self.compiled = True
+        images = {}
+
+        def load_image(name, alpha):
+            if name not in images:
+                image = pygame.image.load(os.path.join(compiled_dir, name))
+                images[name] = self.surface_optimizer.optimize(image, pixelalpha=alpha)
+            return images[name]
+
+        # Capas horneadas: un bloque opaco por paso
+        for chunk in manifest["chunks"]:
+            Sprite(tuple(chunk["pos"]), load_image(chunk["image"], False), self.allsprites_group)
+            yield
+
+        work = 0
+        for obj in manifest["objects"]:
+            ObjectSprite(tuple(obj["pos"]), load_image(obj["image"], True), self.allsprites_group)
+            work += 1
+            if work >= objects_per_step:
+                work = 0
+                yield
+
+        for data in manifest["collisions"]:
+            self.collision_group.append(Collider.from_data(data))
+
+        for data in manifest["interactables"]:
+            x, y, w, h = data["rect"]
+            if data["kind"] == "dialog":
+                zone = InteractableZone(x, y, w, h, text=data["text"], speed=data["speed"],
+                                        sound=data["sound"], portrait=data["portrait"])
+            else:
+                zone = InteractableZone(x, y, w, h, next_map=data["next"])
+            self.interactable_group.add(zone)
+
+        for data in manifest["npcs"]:
+            self._spawn_npc(data["name"], *data["pos"], *data["size"], data["properties"])
+
+        if manifest["start_point"] is not None:
+            self.set_start_point(*manifest["start_point"])
+        self.collision_grid = CollisionGrid.from_dict(manifest["collision_grid"])
+        self._finish_load()
+
+    def _finish_load(self):
+        self.loaded = True
+        print(f"[DEBUG] Superficies del mapa: {self.surface_optimizer.summary()}")
+
+    def _get_surface(self, gid):
+        """Convierte (una sola vez) la imagen de un gid al formato de pantalla"""
+        surf = self._converted.get(gid)
+        if surf is None:
+            image = self.tmx_data.images[gid]
+            surf = image.realize(self.surface_optimizer) if isinstance(image, _PendingTile) else image
+            self._converted[gid] = surf
+        return surf
+
+    def _load_object(self, layer_name, obj):
+        if layer_name == "NPCS":
+            print("NPC:", obj.name, obj.x, obj.y)
+            if obj.name == "Start_point":
+                self.set_start_point(obj.x, obj.y)
+            else:
+                self._spawn_npc(obj.name, obj.x, obj.y, obj.width, obj.height, obj.properties)
+        elif layer_name == "Collisions":
+            collider = Collider.from_tiled(obj)
+            self._collision_rects.append(collider.bounds)
+            self.collision_group.append(collider)
+
+        elif layer_name == "Objetos":
+            ObjectSprite((obj.x, obj.y), self._get_surface(obj.gid), self.allsprites_group)
+
+        elif layer_name == "Interactuable":
+            print("Interactuable:", obj.name, obj.x, obj.y)
+            if obj.name == "Dialog":
+                new_sprite = InteractableZone(obj.x, obj.y, obj.width, obj.height,
+                                            text=obj.properties.get("Text", ""),
+                                            speed=obj.properties.get("speed", 2),
+                                            sound=obj.properties.get("sound", "default"),
+                                            portrait=obj.properties.get("img", None)
+                                            )
+                self.interactable_group.add(new_sprite)
+            elif obj.name == "Next_level":
+                print(f"[DEBUG] Interactable zone for next map: {obj.properties.get('next', '')}")
+                zone = InteractableZone(obj.x, obj.y, obj.width, obj.height,
+                        next_map=obj.properties.get("next", ""))
+
+                self.interactable_group.add(zone)
+
+    def _spawn_npc(self, name, x, y, width, height, properties):
+        # Los NPCs se apoyan en el centro inferior del objeto de Tiled
+        pos = (x + width / 2, y + height)
+        NPC(name, pos, dict(properties), self.allsprites_group, self.npc_group)
 
     def set_start_point(self, x, y):
         self.start_point = (x, y)
 
     def return_start_point(self):
         return self.start_point if hasattr(self, 'start_point') else (0, 0)
-    
-class FadeTransition:
-    def __init__(self, size, speed=550):
-        self.surf = pygame.Surface(size)
-        self.surf.fill((0,0,0))
-        self.alpha = 0
-        self.active = False
-        self.speed = speed
-        self.phase = 0     # 0=fade-out, 1=fade-in, 2=done
-        self.callback = None
-
-    def start(self, callback=None):
-        self.active  = True    
-        self.alpha = 0
-        self.phase = 0
-        self.callback = callback
-
-    def update(self, dt):
-        if not self.active:
-            return
-        if self.phase == 0:
-            self.alpha += self.speed * dt
-            if self.alpha >= 255:
-                self.alpha = 255
-                if self.callback: self.callback()
-                self.phase = 1
-        elif self.phase == 1:
-            self.alpha -= self.speed * dt
-            if self.alpha <= 0:
-                self.alpha = 0
-                self.phase = 2
-                self.active = False
-        self.surf.set_alpha(int(self.alpha))
-
-    def draw(self, surface):
-        if not self.active:
-            return
-        if self.phase in (0,1) and self.alpha > 0:
-            surface.blit(self.surf, (0,0))
+
+class MapLoader:
+    """Conduce la carga cooperativa de un Map dentro de un presupuesto por frame"""
+
+    def __init__(self, game_map: Map, budget_ms=MAP_LOAD_BUDGET_MS):
+        self.map = game_map
+        self.budget_ms = budget_ms
+        self.done = False
+        self.error = None
+        self.steps_run = 0
+        self.worst_frame_ms = 0.0
+        self._steps = game_map.load_steps()
+
+    def step(self, budget_ms=None):
+        """Avanza la carga hasta agotar el presupuesto. Devuelve True al terminar"""
+        if self.done:
+            return True
+        budget = (self.budget_ms if budget_ms is None else budget_ms) / 1000.0
+        start = time.perf_counter()
+        while True:
+            try:
+                next(self._steps)
+                self.steps_run += 1
+            except StopIteration:
+                self.done = True
+            except Exception as e:
+                self.error = e
+                self.done = True
+            if self.done or time.perf_counter() - start >= budget:
+                break
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        self.worst_frame_ms = max(self.worst_frame_ms, elapsed_ms)
+        return self.done
+
+    def finish(self):
+        """Completa la carga de forma sincrona (sin presupuesto)"""
+        while not self.step(budget_ms=float("inf")):
+            pass
+        return self.map
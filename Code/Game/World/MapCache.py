@@ -0,0 +1,102 @@
+"""Formato de cache de mapas compilados (ver Game.World.MapCompiler).
+
+Cada mapa compilado es una carpeta dentro de COMPILED_MAPS_DIR con un
+`map.json` y las imagenes horneadas que referencia.
+"""
+import json
+import os
+import xml.etree.ElementTree as ET
+from Settings.Settings import *
+
+CACHE_FORMAT_VERSION = 3  # 2: colisiones con forma; 3: capas horneadas en el orden del runtime
+MANIFEST_NAME = "map.json"
+
+def find_maps(maps_dir):
+    """Todos los .tmx dentro de maps_dir, en orden estable"""
+    found = []
+    for folder, _, files in os.walk(maps_dir):
+        for name in files:
+            if name.endswith(".tmx"):
+                found.append(os.path.normpath(os.path.join(folder, name)))
+    return sorted(found)
+
+def compiled_dir_for(map_path, maps_dir=MAPS_DIR, out_dir=COMPILED_MAPS_DIR):
+    """Carpeta de salida de un .tmx, o None si no esta dentro de maps_dir"""
+    rel = os.path.relpath(os.path.normpath(map_path), os.path.normpath(maps_dir))
+    if rel.startswith(os.pardir):
+        return None
+    return os.path.join(out_dir, os.path.splitext(rel)[0])
+
+def collect_dependencies(tmx_path):
+    """Lista de archivos de los que depende un .tmx (tilesets e imagenes)"""
+    tmx_path = os.path.normpath(tmx_path)
+    deps = [tmx_path]
+
+    def add_images(node, base):
+        for image in node.iter("image"):
+            source = image.get("source")
+            if source:
+                deps.append(os.path.normpath(os.path.join(base, source)))
+
+    base = os.path.dirname(tmx_path)
+    root = ET.parse(tmx_path).getroot()
+    for tileset in root.findall("tileset"):
+        source = tileset.get("source")
+        if source:
+            tsx_path = os.path.normpath(os.path.join(base, source))
+            deps.append(tsx_path)
+            if os.path.exists(tsx_path):
+                add_images(ET.parse(tsx_path).getroot(), os.path.dirname(tsx_path))
+        else:
+            add_images(tileset, base)
+    for image in root.findall("imagelayer/image"):
+        source = image.get("source")
+        if source:
+            deps.append(os.path.normpath(os.path.join(base, source)))
+    return deps
+
+def dependency_stamps(tmx_path):
+    """Diccionario ruta -> mtime de todas las dependencias"""
+    stamps = {}
+    for dep in collect_dependencies(tmx_path):
+        stamps[dep] = os.path.getmtime(dep) if os.path.exists(dep) else None
+    return stamps
+
+def load_manifest(compiled_dir):
+    """Lee el map.json de una carpeta compilada, o None si no existe"""
+    if not compiled_dir:
+        return None
+    path = os.path.join(compiled_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != CACHE_FORMAT_VERSION:
+        return None
+    return manifest
+
+def is_up_to_date(manifest, tmx_path):
+    """Un mapa compilado es valido si sus dependencias no cambiaron.
+
+    En builds de distribucion el .tmx no existe y la cache se usa tal cual.
+    """
+    if manifest is None:
+        return False
+    if not os.path.exists(tmx_path):
+        return True
+    stored = manifest.get("dependencies", {})
+    try:
+        current = dependency_stamps(tmx_path)
+    except (OSError, ET.ParseError):
+        return False
+    return stored == current
+
+def find_compiled_map(map_path):
+    """Devuelve (carpeta, manifest) si hay una version compilada vigente"""
+    if not USE_COMPILED_MAPS:
+        return None, None
+    compiled_dir = compiled_dir_for(map_path)
+    manifest = load_manifest(compiled_dir)
+    if manifest is not None and is_up_to_date(manifest, map_path):
+        return compiled_dir, manifest
+    return None, None
@@ -0,0 +1,270 @@
+"""Compilador offline de mapas.
+
+Recorre Maps/, valida cada .tmx y escribe la version compilada que Map
+carga en tiempo de ejecucion sin parsear TMX:
+
+    python -m Game.World.MapCompiler            # desde la carpeta Code/
+    python -m Game.World.MapCompiler --force -j 4
+
+Un mapa con errores hace fallar el build (codigo de salida 1) si se puede
+llegar a el desde START_MAP por las salidas Next_level. Los demas (pruebas,
+borradores) se compilan igual pero sus errores son solo avisos; con --all
+tambien hacen fallar el build.
+"""
+import argparse
+import ast
+import json
+import os
+import shutil
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+
+from Settings.Settings import *
+from pytmx.util_pygame import pytmx
+from Game.World.Map import TILE_LAYERS, deferred_image_loader
+from Game.World.Collissions import CollisionGrid, Collider
+from Game.World.MapCache import (CACHE_FORMAT_VERSION, MANIFEST_NAME, compiled_dir_for, find_maps,
+                                 dependency_stamps, load_manifest, is_up_to_date)
+from Game.World.WorldIndex import WorldIndex, normalize_map_path
+
+OBJECT_LAYERS = ("NPCS", "Collisions", "Objetos", "Interactuable")
+INTERACTABLE_KINDS = ("Dialog", "Next_level")
+
+class MapCompileError(Exception):
+    """Errores de validacion de un mapa"""
+
+    def __init__(self, map_path, errors):
+        self.map_path = map_path
+        self.errors = errors
+        super().__init__(f"{map_path}: " + "; ".join(errors))
+
+def parse_dialog_text(raw):
+    """Convierte la propiedad Text de Tiled en una lista de strings"""
+    value = ast.literal_eval(raw)
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list) or not all(isinstance(t, str) for t in value):
+        raise ValueError("Text debe ser una lista de strings")
+    return value
+
+def _rect(obj):
+    return [obj.x, obj.y, obj.width, obj.height]
+
+def validate_map(tmx_data, map_path):
+    """Devuelve la lista de errores de un mapa ya parseado"""
+    errors = []
+    has_start = False
+    for layer in tmx_data.layers:
+        if isinstance(layer, pytmx.TiledTileLayer):
+            if layer.name not in TILE_LAYERS:
+                errors.append(f"capa de tiles desconocida '{layer.name}' (esperadas: {', '.join(TILE_LAYERS)})")
+        elif isinstance(layer, pytmx.TiledObjectGroup):
+            if layer.name not in OBJECT_LAYERS:
+                errors.append(f"capa de objetos desconocida '{layer.name}' (esperadas: {', '.join(OBJECT_LAYERS)})")
+                continue
+            for obj in layer:
+                where = f"{layer.name}/{obj.name or obj.id}"
+                if layer.name == "NPCS" and obj.name == "Start_point":
+                    has_start = True
+                elif layer.name == "Objetos" and not obj.gid:
+                    errors.append(f"{where}: objeto sin imagen")
+                elif layer.name == "Interactuable":
+                    if obj.name not in INTERACTABLE_KINDS:
+                        errors.append(f"{where}: tipo de interactuable desconocido")
+                    elif obj.name == "Dialog":
+                        try:
+                            parse_dialog_text(obj.properties.get("Text", ""))
+                        except (ValueError, SyntaxError) as e:
+                            errors.append(f"{where}: Text invalido ({e})")
+                    elif obj.name == "Next_level":
+                        target = obj.properties.get("next", "")
+                        if not target or not os.path.exists(target):
+                            errors.append(f"{where}: mapa destino '{target}' no existe")
+    if not has_start:
+        errors.append("falta el objeto Start_point en la capa NPCS")
+    return errors
+
+def _tile_surface(tmx_data, gid):
+    pending = tmx_data.images[gid]
+    surf = pending.surface
+    if pending.colorkey:
+        surf = surf.copy()
+        surf.set_colorkey(pending.colorkey)
+    return surf
+
+def bake_layers(tmx_data, tile_size, out_dir, chunk_size=MAP_CHUNK_SIZE):
+    """Hornea todas las capas de tiles en bloques opacos de chunk_size pixeles.
+
+    AllSprites dibuja los tiles ordenados por rect.centery (orden estable,
+    asi que a igual centery gana el orden de las capas). Aqui se pintan
+    sobre WORLD_BG_COLOR con ese mismo orden y no solo por capa: con tiles
+    mas altos que una fila el resultado sigue siendo el de los tiles sueltos.
+    """
+    width = tmx_data.width * tile_size
+    height = tmx_data.height * tile_size
+    canvas = pygame.Surface((width, height))
+    canvas.fill(WORLD_BG_COLOR)
+    used = set()
+
+    tiles = []
+    for layer in tmx_data.visible_layers:
+        if not isinstance(layer, pytmx.TiledTileLayer) or layer.name not in TILE_LAYERS:
+            continue
+        for x, y, gid in layer.iter_data():
+            if gid:
+                tile = _tile_surface(tmx_data, gid)
+                tiles.append((tile, (x * tile_size, y * tile_size)))
+    tiles.sort(key=lambda entry: entry[1][1] + entry[0].get_height() // 2)
+
+    for tile, pos in tiles:
+        canvas.blit(tile, pos)
+        tw, th = tile.get_size()
+        for cy in range(pos[1] // chunk_size, (pos[1] + th - 1) // chunk_size + 1):
+            for cx in range(pos[0] // chunk_size, (pos[0] + tw - 1) // chunk_size + 1):
+                used.add((cx, cy))
+
+    chunks = []
+    for cx, cy in sorted(used, key=lambda c: (c[1], c[0])):
+        rect = pygame.Rect(cx * chunk_size, cy * chunk_size, chunk_size, chunk_size).clip(canvas.get_rect())
+        if rect.width <= 0 or rect.height <= 0:
+            continue
+        name = f"chunk_{cx}_{cy}.png"
+        pygame.image.save(canvas.subsurface(rect), os.path.join(out_dir, name))
+        chunks.append({"image": name, "pos": [rect.x, rect.y]})
+    return chunks
+
+def build_manifest(tmx_data, map_path, out_dir, tile_size=TILE_SIZE):
+    """Genera las imagenes y el diccionario del map.json"""
+    manifest = {
+        "format": CACHE_FORMAT_VERSION,
+        "source": map_path,
+        "dependencies": dependency_stamps(map_path),
+        "tile_size": tile_size,
+        "size": [tmx_data.width, tmx_data.height],
+        "background": list(WORLD_BG_COLOR),
+        "chunks": bake_layers(tmx_data, tile_size, out_dir),
+        "objects": [],
+        "collisions": [],
+        "interactables": [],
+        "npcs": [],
+        "start_point": None,
+    }
+
+    saved_images = set()
+    for layer in tmx_data.visible_layers:
+        if not isinstance(layer, pytmx.TiledObjectGroup):
+            continue
+        for obj in layer:
+            if layer.name == "NPCS":
+                if obj.name == "Start_point":
+                    manifest["start_point"] = [obj.x, obj.y]
+                else:
+                    manifest["npcs"].append({"name": obj.name, "pos": [obj.x, obj.y],
+                                             "size": [obj.width, obj.height],
+                                             "properties": dict(obj.properties)})
+            elif layer.name == "Collisions":
+                manifest["collisions"].append(Collider.from_tiled(obj).to_data())
+            elif layer.name == "Objetos":
+                name = f"object_{obj.gid}.png"
+                if obj.gid not in saved_images:
+                    pygame.image.save(_tile_surface(tmx_data, obj.gid), os.path.join(out_dir, name))
+                    saved_images.add(obj.gid)
+                manifest["objects"].append({"image": name, "pos": [obj.x, obj.y]})
+            elif layer.name == "Interactuable":
+                if obj.name == "Dialog":
+                    manifest["interactables"].append({
+                        "kind": "dialog",
+                        "rect": _rect(obj),
+                        "text": parse_dialog_text(obj.properties.get("Text", "")),
+                        "speed": obj.properties.get("speed", 2),
+                        "sound": obj.properties.get("sound", "default"),
+                        "portrait": obj.properties.get("img", None),
+                    })
+                elif obj.name == "Next_level":
+                    manifest["interactables"].append({
+                        "kind": "next_level",
+                        "rect": _rect(obj),
+                        "next": obj.properties.get("next", ""),
+                    })
+
+    rects = [Collider.from_data(data).bounds for data in manifest["collisions"]]
+    grid = CollisionGrid.from_rects(tmx_data.width, tmx_data.height, tile_size, rects)
+    manifest["collision_grid"] = grid.to_dict()
+    return manifest
+
+def compile_map(map_path, force=False):
+    """Compila un mapa. Devuelve (map_path, estado, errores, segundos)"""
+    start = time.perf_counter()
+    out_dir = compiled_dir_for(map_path)
+    if out_dir is None:
+        return map_path, "failed", [f"fuera de {MAPS_DIR}"], 0.0
+
+    if not force and is_up_to_date(load_manifest(out_dir), map_path):
+        return map_path, "skipped", [], time.perf_counter() - start
+
+    try:
+        # pytmx falla con una excepcion sin mensaje: se detecta antes
+        if ET.parse(map_path).getroot().get("infinite") == "1":
+            raise MapCompileError(map_path, ["los mapas infinitos no estan soportados "
+                                             "(desactivar 'Infinito' en las propiedades del mapa en Tiled)"])
+        tmx_data = pytmx.TiledMap(map_path, image_loader=deferred_image_loader)
+        errors = validate_map(tmx_data, map_path)
+        if errors:
+            raise MapCompileError(map_path, errors)
+
+        # Escribir en una carpeta temporal y reemplazar al final
+        tmp_dir = out_dir + ".tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        manifest = build_manifest(tmx_data, map_path, tmp_dir)
+        with open(os.path.join(tmp_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+        shutil.rmtree(out_dir, ignore_errors=True)
+        os.replace(tmp_dir, out_dir)
+    except MapCompileError as e:
+        return map_path, "failed", e.errors, time.perf_counter() - start
+    except Exception as e:
+        message = str(e) or "el TMX no se pudo cargar"
+        return map_path, "failed", [f"{type(e).__name__}: {message}"], time.perf_counter() - start
+
+    return map_path, "built", [], time.perf_counter() - start
+
+def compile_all(maps_dir=MAPS_DIR, force=False, jobs=None):
+    """Compila todos los mapas en paralelo. Devuelve la lista de resultados"""
+    maps = find_maps(maps_dir)
+    if not maps:
+        return []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(compile_map, maps, [force] * len(maps)))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compila los mapas .tmx al formato de runtime")
+    parser.add_argument("--maps", default=MAPS_DIR, help="carpeta con los .tmx (por defecto: %(default)s)")
+    parser.add_argument("--force", action="store_true", help="recompilar aunque la salida este al dia")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="procesos en paralelo")
+    parser.add_argument("--start", default=START_MAP, help="mapa inicial del juego (por defecto: %(default)s)")
+    parser.add_argument("--all", action="store_true", help="los errores de mapas no alcanzables tambien fallan")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = compile_all(args.maps, args.force, args.jobs)
+    reachable = set(WorldIndex.build(args.maps).reachable(args.start))
+    failed = 0
+    warned = 0
+    for map_path, status, errors, seconds in results:
+        if status == "failed" and not args.all and normalize_map_path(map_path) not in reachable:
+            status = "warning"
+            errors = errors + [f"no se llega desde {args.start}: no bloquea el build"]
+        print(f"[{status.upper():7}] {map_path} ({seconds * 1000:.0f} ms)")
+        for error in errors:
+            print(f"          - {error}")
+        failed += status == "failed"
+        warned += status == "warning"
+
+    print(f"{len(results)} mapas, {failed} con errores, {warned} con avisos, {time.perf_counter() - start:.2f} s")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""Busqueda de caminos sobre la CollisionGrid del mapa.
+
+A* para consultas sueltas y campos de distancia (Dijkstra inverso desde un
+objetivo) para objetivos compartidos: todos los agentes que van hacia el
+mismo objetivo leen el mismo campo, asi que el coste no crece con ellos.
+"""
+import heapq
+import logging
+from typing import Dict, List, Optional
+
+from Settings.Settings import *
+
+logger = logging.getLogger(__name__)
+
+INF = float("inf")
+STRAIGHT = 10
+DIAGONAL = 14
+# (dx, dy, coste)
+_STEPS = ((1, 0, STRAIGHT), (-1, 0, STRAIGHT), (0, 1, STRAIGHT), (0, -1, STRAIGHT),
+          (1, 1, DIAGONAL), (-1, 1, DIAGONAL), (1, -1, DIAGONAL), (-1, -1, DIAGONAL))
+
+def walkable_neighbors(grid, cx, cy):
+    """Vecinos transitables de una celda (8 direcciones sin cortar esquinas)"""
+    for dx, dy, cost in _STEPS:
+        nx, ny = cx + dx, cy + dy
+        if grid.is_blocked(nx, ny):
+            continue
+        if dx and dy and (grid.is_blocked(cx + dx, cy) or grid.is_blocked(cx, cy + dy)):
+            continue
+        yield nx, ny, cost
+
+def octile(a, b):
+    dx = abs(a[0] - b[0])
+    dy = abs(a[1] - b[1])
+    return STRAIGHT * max(dx, dy) + (DIAGONAL - STRAIGHT) * min(dx, dy)
+
+def find_path(grid, start, goal, max_nodes=PATHFIND_MAX_NODES) -> Optional[List[tuple]]:
+    """A* entre dos celdas. Devuelve la lista de celdas (sin la inicial) o None"""
+    if start == goal:
+        return []
+    if grid.is_blocked(*goal):
+        return None
+
+    came_from = {start: None}
+    cost = {start: 0}
+    heap = [(octile(start, goal), 0, start)]
+    expanded = 0
+    while heap:
+        _, g, cell = heapq.heappop(heap)
+        if cell == goal:
+            path = []
+            while cell != start:
+                path.append(cell)
+                cell = came_from[cell]
+            path.reverse()
+            return path
+        if g > cost[cell]:
+            continue
+        expanded += 1
+        if expanded > max_nodes:
+            break
+        for nx, ny, step in walkable_neighbors(grid, *cell):
+            new_cost = g + step
+            neighbor = (nx, ny)
+            if new_cost < cost.get(neighbor, INF):
+                cost[neighbor] = new_cost
+                came_from[neighbor] = cell
+                heapq.heappush(heap, (new_cost + octile(neighbor, goal), new_cost, neighbor))
+    return None
+
+class DistanceField:
+    """Distancia de cada celda al objetivo mas cercano, calculada por partes.
+
+    `step(budget)` expande como mucho `budget` celdas; el campo es usable
+    cuando `done` es True. La direccion de flujo de cada celda se calcula
+    la primera vez que alguien la pide y se guarda.
+    """
+
+    def __init__(self, grid, goals):
+        self.grid = grid
+        self.goals = tuple(goals)
+        self.dist = [INF] * (grid.width * grid.height)
+        self._flow: Dict[int, Optional[tuple]] = {}
+        self._heap = []
+        for cx, cy in self.goals:
+            if grid.in_bounds(cx, cy):
+                self.dist[cy * grid.width + cx] = 0
+                self._heap.append((0, cx, cy))
+        heapq.heapify(self._heap)
+        self.done = not self._heap
+        self.expanded = 0
+
+    def step(self, budget: int) -> int:
+        """Avanza el calculo. Devuelve cuantas celdas expandio"""
+        width = self.grid.width
+        dist = self.dist
+        heap = self._heap
+        work = 0
+        while heap and work < budget:
+            d, cx, cy = heapq.heappop(heap)
+            if d > dist[cy * width + cx]:
+                continue
+            work += 1
+            for nx, ny, step in walkable_neighbors(self.grid, cx, cy):
+                index = ny * width + nx
+                if d + step < dist[index]:
+                    dist[index] = d + step
+                    heapq.heappush(heap, (d + step, nx, ny))
+        self.expanded += work
+        if not heap:
+            self.done = True
+        return work
+
+    def distance(self, cell) -> float:
+        if not self.grid.in_bounds(*cell):
+            return INF
+        return self.dist[cell[1] * self.grid.width + cell[0]]
+
+    def next_cell(self, cell) -> Optional[tuple]:
+        """Celda vecina que mas acerca al objetivo, o None si no hay camino"""
+        if not self.grid.in_bounds(*cell):
+            return None
+        index = cell[1] * self.grid.width + cell[0]
+        if index in self._flow:
+            return self._flow[index]
+        best, best_dist = None, self.dist[index]
+        for nx, ny, _ in walkable_neighbors(self.grid, *cell):
+            d = self.dist[ny * self.grid.width + nx]
+            if d < best_dist:
+                best, best_dist = (nx, ny), d
+        self._flow[index] = best
+        return best
+
+class PathfindingService:
+    """Busqueda de caminos del mapa actual.
+
+    Los objetivos con nombre ("player", "exits", "start") tienen un campo de
+    distancia compartido. Cuando un objetivo cambia de celda se calcula un
+    campo nuevo por partes mientras se sigue usando el anterior.
+    """
+
+    def __init__(self, collision_grid):
+        self.grid = collision_grid
+        self.fields: Dict[str, DistanceField] = {}    # campos completos
+        self.pending: Dict[str, DistanceField] = {}   # campos en calculo
+        self.stats = {"fields": 0, "pending": 0, "expanded": 0, "paths": 0}
+
+    def cell_at(self, pos) -> tuple:
+        return self.grid.cell_at(pos)
+
+    def find_path(self, start_pos, goal_pos, max_nodes=PATHFIND_MAX_NODES) -> Optional[List[tuple]]:
+        """A* entre dos posiciones en pixeles. Devuelve los centros de celda a recorrer"""
+        if self.grid is None:
+            return None
+        self.stats["paths"] += 1
+        cells = find_path(self.grid, self.cell_at(start_pos), self.cell_at(goal_pos), max_nodes)
+        if cells is None:
+            return None
+        return [self.grid.cell_center(cell) for cell in cells]
+
+    def set_goal(self, name: str, positions):
+        """Define (o mueve) un objetivo con una o varias posiciones en pixeles"""
+        if self.grid is None:
+            return
+        if positions and not isinstance(positions[0], (tuple, list, pygame.Vector2)):
+            positions = [positions]
+        goals = tuple(sorted({self.cell_at(pos) for pos in positions}))
+        current = self.pending.get(name) or self.fields.get(name)
+        if current is not None and current.goals == goals:
+            return
+        self.pending[name] = DistanceField(self.grid, goals)
+
+    def remove_goal(self, name: str):
+        self.fields.pop(name, None)
+        self.pending.pop(name, None)
+
+    def field(self, name: str) -> Optional[DistanceField]:
+        """Ultimo campo completo de un objetivo"""
+        return self.fields.get(name)
+
+    def distance(self, name: str, pos) -> float:
+        """Distancia en pixeles hasta el objetivo siguiendo el campo (inf si no hay)"""
+        field = self.fields.get(name)
+        if field is None:
+            return INF
+        return field.distance(self.cell_at(pos)) * self.grid.tile_size / STRAIGHT
+
+    def direction(self, name: str, pos) -> pygame.Vector2:
+        """Vector unitario hacia el siguiente paso del campo, o (0, 0)"""
+        field = self.fields.get(name)
+        if field is None:
+            return pygame.Vector2()
+        target = field.next_cell(self.cell_at(pos))
+        if target is None:
+            return pygame.Vector2()
+        delta = pygame.Vector2(self.grid.cell_center(target)) - pygame.Vector2(pos)
+        if delta.length_squared() == 0:
+            return delta
+        return delta.normalize()
+
+    def update(self, node_budget: int = PATHFIND_NODES_PER_FRAME):
+        """Avanza los campos pendientes repartiendo un presupuesto de celdas"""
+        expanded = 0
+        for name in list(self.pending):
+            if expanded >= node_budget:
+                break
+            field = self.pending[name]
+            expanded += field.step(node_budget - expanded)
+            if field.done:
+                self.fields[name] = self.pending.pop(name)
+        self.stats["fields"] = len(self.fields)
+        self.stats["pending"] = len(self.pending)
+        self.stats["expanded"] = expanded
@@ -0,0 +1,70 @@
+from typing import Dict, List, Tuple
+from Settings.Settings import *
+
+class SpatialHash:
+    """Particion espacial en celdas uniformes para consultas por rect"""
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], set] = {}
+        self._items: Dict[object, Tuple[pygame.Rect, Tuple[Tuple[int, int], ...]]] = {}
+
+    def _cells_for(self, rect):
+        size = self.cell_size
+        x0, y0 = rect.left // size, rect.top // size
+        x1, y1 = (rect.right - 1) // size, (rect.bottom - 1) // size
+        return tuple((cx, cy) for cy in range(y0, y1 + 1) for cx in range(x0, x1 + 1))
+
+    def insert(self, item, rect):
+        if item in self._items:
+            self.remove(item)
+        rect = pygame.Rect(rect)
+        cells = self._cells_for(rect)
+        for cell in cells:
+            self._cells.setdefault(cell, set()).add(item)
+        self._items[item] = (rect, cells)
+
+    def remove(self, item):
+        entry = self._items.pop(item, None)
+        if not entry:
+            return
+        for cell in entry[1]:
+            bucket = self._cells.get(cell)
+            if bucket:
+                bucket.discard(item)
+                if not bucket:
+                    del self._cells[cell]
+
+    def move(self, item, rect):
+        """Actualiza el rect de un item, tocando las celdas solo si cambian"""
+        entry = self._items.get(item)
+        if entry is None:
+            self.insert(item, rect)
+            return
+        cells = self._cells_for(rect)
+        if cells == entry[1]:
+            entry[0].update(rect)
+        else:
+            self.insert(item, rect)
+
+    def query(self, rect) -> List[object]:
+        """Items cuyo rect se solapa con `rect`"""
+        found = []
+        seen = set()
+        for cell in self._cells_for(rect):
+            for item in self._cells.get(cell, ()):
+                if item not in seen:
+                    seen.add(item)
+                    if self._items[item][0].colliderect(rect):
+                        found.append(item)
+        return found
+
+    def clear(self):
+        self._cells.clear()
+        self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item):
+        return item in self._items
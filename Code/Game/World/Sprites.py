@@ -24,32 +24,16 @@ class InteractableZone(pygame.sprite.Sprite):
         self.portrait = portrait
         self.next_map = next_map
 
-class collissionSprite(pygame.sprite.Sprite):
-    def __init__(self,pos,surf, *groups):
-        super().__init__(*groups)
-        self.image = surf
-        self.rect = self.image.get_rect(topleft = pos)
-        
-class collissionSprite(pygame.sprite.Sprite):
-    def __init__(self,pos,surf, *groups):
-        super().__init__(*groups)
-        self.image = surf
-        self.rect = self.image.get_rect(topleft = pos)
-        
 class Follower(pygame.sprite.Sprite):
+    interpolate = True
+
     def __init__(self, character, game_scene, *groups):
         super().__init__(*groups)
         self.char = character
         self.game_scene = game_scene
-        # Cargar animacion
-        sheet = game_scene.resource_manager.get_spritesheet(self.char.sprite_key)
-        if sheet:
-            self.frames = {
-                "down": sheet.get_row(0),
-                "right": sheet.get_row(1), 
-                "left": sheet.get_row(2),
-                "up": sheet.get_row(3)
-            }
+        # Animacion: tabla compartida del ResourceManager (no crea superficies)
+        self.frames = game_scene.resource_manager.get_animation_table(self.char.sprite_key)
+        if self.frames:
             self.current_state = "down"
             self.frame_index = 0
             self.image = self.frames[self.current_state][0]
@@ -102,6 +86,7 @@ class Follower(pygame.sprite.Sprite):
         """Teletransporta el follower instantáneamente"""
         self.pos = pygame.Vector2(position)
         self.rect.center = (self.pos.x, self.pos.y)
+        self.prev_topleft = None  # no interpolar el salto
         
         # Reset animacion
         if self.frames:
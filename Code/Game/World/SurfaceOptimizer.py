@@ -0,0 +1,91 @@
+"""Eleccion del formato de blit mas rapido para cada superficie de mapa.
+
+Cada imagen se clasifica al cargarla:
+
+- opaca: ningun pixel transparente -> `convert()`
+- colorkey: pixeles totalmente opacos o totalmente transparentes ->
+  `convert()` con colorkey y RLEACCEL (las zonas transparentes se saltan)
+- alpha: tiene transparencia parcial -> `convert_alpha()`
+
+El resultado se ve igual en los tres casos; solo cambia el costo del blit.
+Con una paleta compartida (modo indexado, ver IndexedColor) las opacas y
+las de colorkey se guardan en 8 bits.
+"""
+from typing import Dict, Optional
+
+from Settings.Settings import *
+
+OPAQUE = "opaque"
+COLORKEY = "colorkey"
+ALPHA = "alpha"
+SURFACE_KINDS = (OPAQUE, COLORKEY, ALPHA)
+
+# Colores candidatos a colorkey: se usa el primero que la imagen no tenga
+_KEY_CANDIDATES = ((255, 0, 255), (0, 255, 255), (255, 255, 0), (1, 254, 1))
+_EXACT = (1, 1, 1, 255)  # from_threshold: mismo RGB, cualquier alpha
+
+def classify(surface: pygame.Surface) -> str:
+    """Clase de una superficie segun su canal alpha"""
+    if surface.get_colorkey() is not None:
+        return COLORKEY
+    if not surface.get_flags() & pygame.SRCALPHA:
+        return OPAQUE
+    total = surface.get_width() * surface.get_height()
+    opaque = pygame.mask.from_surface(surface, 254).count()  # alpha == 255
+    if opaque == total:
+        return OPAQUE
+    visible = pygame.mask.from_surface(surface, 0).count()   # alpha > 0
+    return COLORKEY if visible == opaque else ALPHA
+
+def _free_colorkey(surface: pygame.Surface) -> Optional[tuple]:
+    """Un color que no aparezca en los pixeles opacos de la imagen"""
+    opaque = pygame.mask.from_surface(surface, 254)
+    for color in _KEY_CANDIDATES:
+        used = pygame.mask.from_threshold(surface, color, _EXACT)
+        if not used.overlap_area(opaque, (0, 0)):
+            return color
+    return None
+
+class SurfaceOptimizer:
+    """Convierte superficies al formato de su clase y cuenta el reparto"""
+
+    def __init__(self, palette=None):
+        self.palette = palette
+        self.counts: Dict[str, int] = {kind: 0 for kind in SURFACE_KINDS}
+        self.bytes: Dict[str, int] = {kind: 0 for kind in SURFACE_KINDS}
+
+    def optimize(self, surface: pygame.Surface, colorkey=None, pixelalpha: bool = True) -> pygame.Surface:
+        """Devuelve la superficie en formato de pantalla.
+
+        `colorkey` y `pixelalpha` son los del tileset de Tiled: un colorkey
+        explicito se respeta y sin `pixelalpha` la transparencia se ignora.
+        """
+        if colorkey:
+            tile = surface.convert()
+            tile.set_colorkey(colorkey, pygame.RLEACCEL)
+            return self._count(COLORKEY, tile)
+
+        kind = classify(surface)
+        if self.palette is not None and (kind != ALPHA or not pixelalpha):
+            indexed = self.palette.index_surface(surface if pixelalpha else surface.convert())
+            if indexed is not None:
+                return self._count(OPAQUE if indexed.get_colorkey() is None else COLORKEY, indexed)
+        if kind == OPAQUE or not pixelalpha:
+            return self._count(OPAQUE, surface.convert())
+        if kind == COLORKEY:
+            key = surface.get_colorkey() or _free_colorkey(surface)
+            if key is not None:
+                tile = pygame.Surface(surface.get_size()).convert()
+                tile.fill(key)
+                tile.blit(surface, (0, 0))
+                tile.set_colorkey(key, pygame.RLEACCEL)
+                return self._count(COLORKEY, tile)
+        return self._count(ALPHA, surface.convert_alpha())
+
+    def _count(self, kind, surface):
+        self.counts[kind] += 1
+        self.bytes[kind] += surface.get_width() * surface.get_height() * surface.get_bytesize()
+        return surface
+
+    def summary(self) -> str:
+        return ", ".join(f"{kind} {self.counts[kind]} ({self.bytes[kind] // 1024} KB)" for kind in SURFACE_KINDS)
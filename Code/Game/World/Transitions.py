@@ -0,0 +1,171 @@
+"""Transiciones de pantalla sobre un frame congelado.
+
+La transicion captura el ultimo frame una sola vez y cada efecto lo
+dibuja hacia negro en TRANSITION_STEPS niveles precalculados, asi que un
+frame de transicion cuesta un blit (mas un fill o una mascara).
+"""
+from abc import ABC, abstractmethod
+
+from Settings.Settings import *
+
+BLACK = (0, 0, 0)
+
+class TransitionEffect(ABC):
+    """Efecto base. `level` va de 0 (frame completo) a `steps` (negro)"""
+    steps = TRANSITION_STEPS
+
+    def __init__(self, size):
+        self.size = size
+
+    def prepare(self):
+        """Precalcula lo que el efecto necesite antes de empezar"""
+        pass
+
+    @abstractmethod
+    def draw(self, surface, snapshot, level):
+        """Dibuja el frame congelado en el nivel `level` de la transicion"""
+
+class FadeEffect(TransitionEffect):
+    """Fundido a negro con alpha cuantizado"""
+
+    def __init__(self, size):
+        super().__init__(size)
+        self._alpha = None
+
+    def prepare(self):
+        self._alpha = None
+
+    def draw(self, surface, snapshot, level):
+        if level >= self.steps:
+            surface.fill(BLACK)
+            return
+        alpha = 255 - level * 255 // self.steps
+        # set_alpha solo cuando cambia el nivel
+        if alpha != self._alpha:
+            snapshot.set_alpha(alpha if alpha < 255 else None)
+            self._alpha = alpha
+        if alpha < 255:
+            surface.fill(BLACK)
+        surface.blit(snapshot, (0, 0))
+
+class WipeEffect(TransitionEffect):
+    """Barrido de izquierda a derecha"""
+
+    def draw(self, surface, snapshot, level):
+        width, height = self.size
+        edge = width * level // self.steps
+        if edge:
+            surface.fill(BLACK, (0, 0, edge, height))
+        if edge < width:
+            surface.blit(snapshot, (edge, 0), (edge, 0, width - edge, height))
+
+class IrisEffect(TransitionEffect):
+    """Circulo que se cierra hacia el centro, con mascaras precalculadas"""
+    HOLE = (255, 0, 255)
+
+    def __init__(self, size):
+        super().__init__(size)
+        self.masks = []
+
+    def prepare(self):
+        if self.masks:
+            return
+        width, height = self.size
+        center = (width // 2, height // 2)
+        max_radius = int((width ** 2 + height ** 2) ** 0.5 / 2) + 1
+        for level in range(self.steps + 1):
+            mask = pygame.Surface(self.size)
+            mask.fill(BLACK)
+            radius = max_radius * (self.steps - level) // self.steps
+            if radius > 0:
+                pygame.draw.circle(mask, self.HOLE, center, radius)
+            mask.set_colorkey(self.HOLE, pygame.RLEACCEL)
+            self.masks.append(mask)
+
+    def draw(self, surface, snapshot, level):
+        level = min(level, self.steps)
+        if level >= self.steps:
+            surface.fill(BLACK)
+            return
+        surface.blit(snapshot, (0, 0))
+        if level:
+            surface.blit(self.masks[level], (0, 0))
+
+TRANSITION_EFFECTS = {
+    "fade": FadeEffect,
+    "wipe": WipeEffect,
+    "iris": IrisEffect,
+}
+
+class FadeTransition:
+    """Transicion de mapa: frame viejo -> negro -> primer frame del mapa nuevo.
+
+    La escena dibuja el frame completo una vez cuando `needs_snapshot` es
+    True y lo entrega con `capture`; el resto de frames solo llama a `draw`.
+    """
+
+    def __init__(self, size, speed=550, effect=TRANSITION_EFFECT):
+        self.size = size
+        self.snapshot = pygame.Surface(size)
+        self.alpha = 0
+        self.active = False
+        self.speed = speed
+        self.phase = 0     # 0=fade-out, 1=fade-in, 2=done
+        self.callback = None
+        self.ready = None  # si devuelve False, la pantalla se mantiene en negro
+        self.needs_snapshot = False
+        self._effects = {}
+        self.effect = self._get_effect(effect)
+
+    def _get_effect(self, name):
+        if name not in self._effects:
+            effect_class = TRANSITION_EFFECTS.get(name, FadeEffect)
+            self._effects[name] = effect_class(self.size)
+        return self._effects[name]
+
+    def start(self, callback=None, ready=None, effect=None):
+        self.active  = True
+        self.alpha = 0
+        self.phase = 0
+        self.callback = callback
+        self.ready = ready
+        if effect:
+            self.effect = self._get_effect(effect)
+        self.effect.prepare()
+        self.needs_snapshot = True
+
+    def capture(self, surface):
+        """Guarda el frame que se va a fundir"""
+        self.snapshot.set_alpha(None)
+        self.snapshot.blit(surface, (0, 0))
+        self.effect.prepare()
+        self.needs_snapshot = False
+
+    @property
+    def level(self):
+        return int(self.alpha) * self.effect.steps // 255
+
+    def update(self, dt):
+        if not self.active:
+            return
+        if self.phase == 0:
+            self.alpha += self.speed * dt
+            if self.alpha >= 255:
+                self.alpha = 255
+                # Esperar en negro hasta que el mapa siguiente termine de cargar
+                if self.ready is None or self.ready():
+                    if self.callback: self.callback()
+                    self.phase = 1
+                    # El fade-in parte del primer frame del mapa nuevo
+                    self.needs_snapshot = True
+        elif self.phase == 1:
+            self.alpha -= self.speed * dt
+            if self.alpha <= 0:
+                self.alpha = 0
+                self.phase = 2
+                self.active = False
+
+    def draw(self, surface):
+        if not self.active:
+            return
+        self.effect.draw(surface, self.snapshot, self.level)
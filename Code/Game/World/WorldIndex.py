@@ -0,0 +1,127 @@
+"""Indice del mundo: grafo de mapas conectados por zonas Next_level"""
+import json
+import os
+import logging
+import xml.etree.ElementTree as ET
+from typing import Dict, List
+
+from Settings.Settings import *
+from Game.World.MapCache import find_maps, find_compiled_map, MANIFEST_NAME
+
+logger = logging.getLogger(__name__)
+
+def normalize_map_path(path: str) -> str:
+    return os.path.normpath(path)
+
+class MapExit:
+    """Zona de salida de un mapa hacia otro"""
+    __slots__ = ("rect", "target")
+
+    def __init__(self, rect, target):
+        self.rect = pygame.Rect(rect)
+        self.target = normalize_map_path(target)
+
+    def distance_to(self, pos) -> float:
+        """Distancia en pixeles desde un punto al borde de la zona (0 si esta dentro)"""
+        dx = max(self.rect.left - pos[0], 0, pos[0] - self.rect.right)
+        dy = max(self.rect.top - pos[1], 0, pos[1] - self.rect.bottom)
+        return (dx * dx + dy * dy) ** 0.5
+
+class MapNode:
+    def __init__(self, path: str, exits: List[MapExit]):
+        self.path = path
+        self.exits = exits
+
+    @property
+    def neighbors(self) -> List[str]:
+        seen = []
+        for exit_zone in self.exits:
+            if exit_zone.target not in seen:
+                seen.append(exit_zone.target)
+        return seen
+
+def read_exits(map_path: str) -> List[MapExit]:
+    """Lee las zonas Next_level de un mapa sin cargar sus imagenes.
+
+    Usa el mapa compilado si esta al dia; si no, solo el XML del TMX.
+    """
+    _, manifest = find_compiled_map(map_path)
+    if manifest is not None:
+        return [MapExit(data["rect"], data["next"])
+                for data in manifest["interactables"] if data["kind"] == "next_level"]
+
+    exits = []
+    root = ET.parse(map_path).getroot()
+    for group in root.findall("objectgroup"):
+        if group.get("name") != "Interactuable":
+            continue
+        for obj in group.findall("object"):
+            if obj.get("name") != "Next_level":
+                continue
+            target = ""
+            for prop in obj.iter("property"):
+                if prop.get("name") == "next":
+                    target = prop.get("value", "")
+            if not target:
+                continue
+            rect = (float(obj.get("x", 0)), float(obj.get("y", 0)),
+                    float(obj.get("width", 0)), float(obj.get("height", 0)))
+            exits.append(MapExit(rect, target))
+    return exits
+
+class WorldIndex:
+    """Grafo de mapas: nodos con sus zonas de salida y el mapa al que llevan"""
+
+    def __init__(self):
+        self.nodes: Dict[str, MapNode] = {}
+
+    @classmethod
+    def build(cls, maps_dir=MAPS_DIR, compiled_dir=COMPILED_MAPS_DIR):
+        """Indexa todos los mapas (fuentes .tmx y mapas ya compilados)"""
+        index = cls()
+        paths = set(find_maps(maps_dir))
+        for folder, _, files in os.walk(compiled_dir):
+            if MANIFEST_NAME in files:
+                try:
+                    with open(os.path.join(folder, MANIFEST_NAME), "r", encoding="utf-8") as f:
+                        paths.add(normalize_map_path(json.load(f)["source"]))
+                except (OSError, ValueError, KeyError) as e:
+                    logger.warning(f"Invalid compiled map in {folder}: {e}")
+
+        for path in sorted(paths):
+            try:
+                index.add_map(path, read_exits(path))
+            except (OSError, ET.ParseError) as e:
+                logger.warning(f"Could not index map {path}: {e}")
+        logger.info(f"World index built: {len(index.nodes)} maps")
+        return index
+
+    def add_map(self, path: str, exits: List[MapExit]):
+        path = normalize_map_path(path)
+        self.nodes[path] = MapNode(path, exits)
+
+    def exits(self, path: str) -> List[MapExit]:
+        node = self.nodes.get(normalize_map_path(path))
+        return node.exits if node else []
+
+    def neighbors(self, path: str) -> List[str]:
+        node = self.nodes.get(normalize_map_path(path))
+        return node.neighbors if node else []
+
+    def reachable(self, start: str) -> List[str]:
+        """Mapas a los que se puede llegar desde start siguiendo las salidas (incluye start)"""
+        start = normalize_map_path(start)
+        seen = [start]
+        for path in seen:
+            for target in self.neighbors(path):
+                if target not in seen:
+                    seen.append(target)
+        return seen
+
+    def targets_near(self, path: str, pos, distance: float) -> List[str]:
+        """Mapas cuya zona de salida esta a menos de `distance` pixeles de pos"""
+        near = []
+        for exit_zone in self.exits(path):
+            if exit_zone.target not in near and exit_zone.distance_to(pos) <= distance:
+                near.append(exit_zone.target)
+        return near
@@ -1,7 +1,9 @@
 import pygame
-from typing import List, Optional
-from enum import Enum
+from typing import Dict, List, Optional
+from enum import Enum, IntEnum
+from collections import deque
 import logging
+import time
 from pathlib import Path
 
 from ResourceManager import ResourceManager
@@ -10,9 +12,17 @@ from Characters.Inventory import Character, Item
 from Characters.Party import Party
 from UI.UI_Inventory import UI_Inventory
 from UI.Components.Dialog import DialogManager
-from Game.World.Map import Map, FadeTransition
+from Game.World.Map import Map, MapLoader
+from Game.World.Transitions import FadeTransition
 from Game.World.Groups import AllSprites
+from Game.World.WorldIndex import WorldIndex, normalize_map_path
+from Game.World.SpatialHash import SpatialHash
+from Game.World.Pathfinding import PathfindingService
 from DebugMenu import DebugMenu
+from Settings.Settings import (INT_WIDTH, INT_HEIGHT, MAP_LOAD_BUDGET_MS, MAP_PREFETCH_BUDGET_MS, MAP_PREFETCH_DISTANCE,
+                               UPDATE_WAKE_MARGIN, WORLD_BG_COLOR, NPC_CELL_SIZE, NPC_WAKE_MARGIN,
+                               GOVERNOR_WINDOW, GOVERNOR_RAISE_RATIO, GOVERNOR_LOWER_RATIO,
+                               GOVERNOR_COOLDOWN_FRAMES, GOVERNOR_THROTTLE_INTERVAL)
 
 logger = logging.getLogger(__name__)
 
@@ -66,6 +76,252 @@ class GameStateManager:
         }
         return self.current_state not in blocked_states
 
+class UpdateTier(Enum):
+    EVERY_FRAME = "every_frame"          # se actualiza todos los frames
+    INTERVAL = "interval"                # cada N frames, con el dt acumulado
+    OFFSCREEN_SLEEP = "offscreen_sleep"  # duerme mientras esta fuera de camara
+
+class _ScheduledEntity:
+    __slots__ = ("entity", "tier", "interval", "phase", "pending_dt")
+
+    def __init__(self, entity, tier: UpdateTier, interval: int, phase: int):
+        self.entity = entity
+        self.tier = tier
+        self.interval = max(1, interval)
+        self.phase = phase
+        self.pending_dt = 0.0
+
+class UpdateScheduler:
+    """Actualiza solo las entidades registradas, agrupadas por frecuencia.
+
+    Las entidades declaran su frecuencia con los atributos `update_tier` y
+    `update_interval`, o al registrarse. Los tiles estaticos nunca se
+    registran, asi que el coste escala con las entidades activas.
+    """
+    
+    def __init__(self):
+        self._tiers: Dict[UpdateTier, List[_ScheduledEntity]] = {tier: [] for tier in UpdateTier}
+        self._index: Dict[int, _ScheduledEntity] = {}
+        self.frame = 0
+        self.stats = {tier: {"entities": 0, "updated": 0, "ms": 0.0} for tier in UpdateTier}
+    
+    def register(self, entity, tier: Optional[UpdateTier] = None, interval: Optional[int] = None):
+        """Registra una entidad con un metodo update(dt)"""
+        if id(entity) in self._index:
+            self.unregister(entity)
+        tier = tier or getattr(entity, "update_tier", UpdateTier.EVERY_FRAME)
+        interval = interval or getattr(entity, "update_interval", 1)
+        # Repartir las entidades de intervalo entre frames distintos
+        phase = len(self._tiers[tier]) % max(1, interval)
+        entry = _ScheduledEntity(entity, tier, interval, phase)
+        self._tiers[tier].append(entry)
+        self._index[id(entity)] = entry
+    
+    def unregister(self, entity):
+        entry = self._index.pop(id(entity), None)
+        if entry:
+            self._tiers[entry.tier].remove(entry)
+    
+    def __contains__(self, entity) -> bool:
+        return id(entity) in self._index
+    
+    def __len__(self) -> int:
+        return len(self._index)
+    
+    def _prune(self, entries: List[_ScheduledEntity]):
+        """Quita las entidades que ya no pertenecen a ningun grupo"""
+        dead = [e for e in entries if hasattr(e.entity, "alive") and not e.entity.alive()]
+        for entry in dead:
+            entries.remove(entry)
+            self._index.pop(id(entry.entity), None)
+    
+    def update(self, dt: float, view_rect: Optional[pygame.Rect] = None):
+        """Actualiza cada tier y mide su coste"""
+        self.frame += 1
+        wake_rect = view_rect.inflate(UPDATE_WAKE_MARGIN * 2, UPDATE_WAKE_MARGIN * 2) if view_rect else None
+        
+        for tier, entries in self._tiers.items():
+            start = time.perf_counter()
+            self._prune(entries)
+            updated = 0
+            for entry in entries:
+                entry.pending_dt += dt
+                if tier == UpdateTier.INTERVAL:
+                    if (self.frame + entry.phase) % entry.interval:
+                        continue
+                elif tier == UpdateTier.OFFSCREEN_SLEEP and wake_rect is not None:
+                    rect = getattr(entry.entity, "rect", None)
+                    if rect is not None and not wake_rect.colliderect(rect):
+                        # Dormida: no acumula tiempo mientras no se ve
+                        entry.pending_dt = 0.0
+                        continue
+                entry.entity.update(entry.pending_dt)
+                entry.pending_dt = 0.0
+                updated += 1
+            
+            stats = self.stats[tier]
+            stats["entities"] = len(entries)
+            stats["updated"] = updated
+            # Media movil para que el valor mostrado sea estable
+            stats["ms"] += ((time.perf_counter() - start) * 1000.0 - stats["ms"]) * 0.1
+    
+    def get_stats(self) -> Dict[str, dict]:
+        """Entidades registradas, actualizadas y ms por tier"""
+        return {tier.value: dict(stats) for tier, stats in self.stats.items()}
+
+class NPCManager:
+    """NPCs del mapa actual guardados en una particion espacial.
+
+    Solo ejecutan su comportamiento los NPCs cerca de la camara; el resto
+    duerme sin coste. Las colisiones y la interaccion con NPCs se consultan
+    por celdas en lugar de recorrer todos los sprites.
+    """
+    
+    def __init__(self, cell_size: int = NPC_CELL_SIZE):
+        self.cell_size = cell_size
+        self.npcs = SpatialHash(cell_size)
+        self.static = SpatialHash(cell_size)  # colisiones del mapa
+        self._static_order = {}               # collider -> posicion en el mapa
+        self._obstacles = ()
+        self.pathfinding = None
+        self.stats = {"npcs": 0, "awake": 0, "ms": 0.0}
+    
+    def reset(self, npc_sprites, collision_sprites, pathfinding=None):
+        """Reindexa los NPCs y colisiones de un mapa recien cargado"""
+        self.pathfinding = pathfinding
+        self.npcs.clear()
+        self.static.clear()
+        for npc in npc_sprites:
+            self.npcs.insert(npc, npc.hitbox_rect)
+        self._static_order = {}
+        for order, collider in enumerate(collision_sprites):
+            self.static.insert(collider, collider.rect)
+            self._static_order[collider] = order
+        logger.debug(f"NPCManager: {len(self.npcs)} NPCs, {len(self.static)} collisions indexed")
+    
+    def remove(self, npc):
+        self.npcs.remove(npc)
+    
+    def query(self, rect: pygame.Rect) -> list:
+        """NPCs cuyo hitbox se solapa con rect"""
+        return self.npcs.query(rect)
+    
+    def static_query(self, rect: pygame.Rect) -> list:
+        """Colisiones del mapa cuya caja toca rect, en el orden del mapa"""
+        return sorted(self.static.query(rect), key=self._static_order.__getitem__)
+    
+    def nearest(self, rect: pygame.Rect, pos: tuple):
+        """El NPC mas cercano a pos entre los que tocan rect, o None"""
+        found = self.query(rect)
+        if not found:
+            return None
+        return min(found, key=lambda npc: npc.pos.distance_squared_to(pos))
+    
+    def is_blocked(self, rect: pygame.Rect, mover=None) -> bool:
+        """Indica si rect choca con el mapa, otro NPC o un obstaculo extra"""
+        if any(collider.collides(rect) for collider in self.static.query(rect)):
+            return True
+        for npc in self.npcs.query(rect):
+            if npc is not mover:
+                return True
+        return any(rect.colliderect(other) for other in self._obstacles)
+    
+    def update(self, dt: float, view_rect: pygame.Rect, obstacles=()):
+        """Ejecuta el comportamiento de los NPCs despiertos.
+        
+        `obstacles` son rects extra que los NPCs no pueden atravesar
+        (por ejemplo el hitbox del jugador).
+        """
+        start = time.perf_counter()
+        self._obstacles = obstacles
+        wake_rect = view_rect.inflate(NPC_WAKE_MARGIN * 2, NPC_WAKE_MARGIN * 2)
+        awake = self.npcs.query(wake_rect)
+        for npc in awake:
+            npc.think(dt, self.is_blocked, self.pathfinding)
+            self.npcs.move(npc, npc.hitbox_rect)
+        self._obstacles = ()
+        
+        self.stats["npcs"] = len(self.npcs)
+        self.stats["awake"] = len(awake)
+        self.stats["ms"] += ((time.perf_counter() - start) * 1000.0 - self.stats["ms"]) * 0.1
+
+class WorkPriority(IntEnum):
+    """Prioridad del trabajo opcional: lo de menor prioridad se degrada antes"""
+    LOW = 1      # overlays de debug, trails
+    MEDIUM = 2   # redibujado de etiquetas del HUD
+    HIGH = 3     # suavizado de camara
+
+class FrameGovernor:
+    """Degrada el trabajo opcional cuando los frames no caben en el presupuesto.
+
+    Mide el tiempo de trabajo de cada frame (sin contar la espera de
+    clock.tick) y mantiene un nivel de degradacion. Con nivel N, el trabajo
+    de prioridad menor que N se salta y el de prioridad N corre solo uno de
+    cada GOVERNOR_THROTTLE_INTERVAL frames. El nivel sube y baja con
+    histeresis para no oscilar.
+    """
+    MAX_LEVEL = max(WorkPriority) + 1
+    
+    def __init__(self, budget_ms: float, window: int = GOVERNOR_WINDOW):
+        self.budget_ms = budget_ms
+        self.samples = deque(maxlen=window)
+        self.average_ms = 0.0
+        self.level = 0
+        self.frame = 0
+        self._frame_start = None
+        self._last_change = 0
+        self._work: Dict[str, WorkPriority] = {}
+        self.skipped: Dict[str, int] = {}
+    
+    def register(self, name: str, priority: WorkPriority):
+        """Registra un trabajo opcional"""
+        self._work[name] = WorkPriority(priority)
+        self.skipped.setdefault(name, 0)
+    
+    def begin_frame(self):
+        self._frame_start = time.perf_counter()
+    
+    def end_frame(self):
+        """Cierra la medicion del frame y ajusta el nivel"""
+        if self._frame_start is None:
+            return
+        self.frame += 1
+        self.samples.append((time.perf_counter() - self._frame_start) * 1000.0)
+        self._frame_start = None
+        self.average_ms = sum(self.samples) / len(self.samples)
+        
+        if self.frame - self._last_change < GOVERNOR_COOLDOWN_FRAMES or len(self.samples) < self.samples.maxlen:
+            return
+        if self.average_ms > self.budget_ms * GOVERNOR_RAISE_RATIO and self.level < self.MAX_LEVEL:
+            self._set_level(self.level + 1)
+        elif self.average_ms < self.budget_ms * GOVERNOR_LOWER_RATIO and self.level > 0:
+            self._set_level(self.level - 1)
+    
+    def _set_level(self, level: int):
+        logger.info(f"Frame governor level {self.level} -> {level} (avg {self.average_ms:.2f} ms, "
+                    f"budget {self.budget_ms:.2f} ms)")
+        self.level = level
+        self._last_change = self.frame
+    
+    def is_enabled(self, name: str) -> bool:
+        """Indica si el trabajo no esta desactivado por el nivel actual"""
+        priority = self._work.get(name)
+        return priority is None or priority >= self.level
+    
+    def should_run(self, name: str) -> bool:
+        """Indica si el trabajo debe correr este frame (con throttling)"""
+        priority = self._work.get(name)
+        if priority is None or priority > self.level:
+            return True
+        if priority == self.level and self.frame % GOVERNOR_THROTTLE_INTERVAL == 0:
+            return True
+        self.skipped[name] += 1
+        return False
+    
+    def get_stats(self) -> dict:
+        return {"level": self.level, "average_ms": self.average_ms,
+                "budget_ms": self.budget_ms, "skipped": dict(self.skipped)}
+
 class RenderSystem:
     """Sistema de renderizado separado mejorado sin temblequeo"""
     
@@ -80,15 +336,15 @@ class RenderSystem:
         self.camera_offset.x = round(-(target_pos[0] - self.screen_width // 2))
         self.camera_offset.y = round(-(target_pos[1] - self.screen_height // 2))
     
-    def render_world(self, surface: pygame.Surface, all_sprites, player_pos: tuple):
+    def render_world(self, surface: pygame.Surface, all_sprites, player_pos: tuple, alpha: float = 1.0):
         """Renderiza el mundo del juego sin temblequeo"""
-        surface.fill((50, 50, 50))
+        surface.fill(WORLD_BG_COLOR)
         
         # Asegurar que player_pos tenga coordenadas enteras para la cámara
         rounded_player_pos = (round(player_pos[0]), round(player_pos[1]))
         
         # El AllSprites.draw ya maneja el redondeo internamente
-        all_sprites.draw(surface, rounded_player_pos)
+        all_sprites.draw(surface, rounded_player_pos, alpha)
     
     def render_debug_visuals(self, surface: pygame.Surface, debug_menu, 
                            collision_sprites, interactable_sprites, player_rect):
@@ -105,9 +361,8 @@ class RenderSystem:
         
         # Hitboxes de colision
         if debug_menu.show_hitboxes:
-            for sprite in collision_sprites:
-                screen_rect = sprite.rect.move(camera_offset)
-                pygame.draw.rect(surface, (255, 0, 0), screen_rect, 1)
+            for collider in collision_sprites:
+                collider.draw(surface, camera_offset)
         
         # Zonas de interaccion
         if debug_menu.show_interaction_zones:
@@ -138,7 +393,7 @@ class PartyManager:
         resource_manager = ResourceManager.get_instance()
         sprite_sheet = resource_manager.get_spritesheet("Ely")
         if sprite_sheet:
-            ely.sprite_preview = sprite_sheet.get_frame(0, 0)
+            ely.sprite_preview = resource_manager.get_animation_table("Ely")["down"][0]
             ely.sprite_preview_sz = (sprite_sheet.frame_width, sprite_sheet.frame_height)
         else:
             # Placeholder
@@ -194,7 +449,7 @@ class PartyManager:
         resource_manager = ResourceManager.get_instance()
         sprite_sheet = resource_manager.get_spritesheet(config['sprite_key'])
         if sprite_sheet:
-            new_char.sprite_preview = sprite_sheet.get_frame(0, 0)
+            new_char.sprite_preview = resource_manager.get_animation_table(config['sprite_key'])["down"][0]
             new_char.sprite_preview_sz = (sprite_sheet.frame_width, sprite_sheet.frame_height)
         else:
             new_char.sprite_preview = pygame.Surface((25, 44))
@@ -246,15 +501,23 @@ class WorldManager:
         self.current_map: Optional[Map] = None
         self.next_map_obj: Optional[Map] = None
         self.next_map_path: Optional[str] = None
+        self.map_loader: Optional[MapLoader] = None
+        
+        # Grafo de mapas y precarga de vecinos (ruta normalizada -> loader)
+        self.world_index = WorldIndex.build()
+        self.prefetched: Dict[str, MapLoader] = {}
+        self._npc_sheet_handles = []  # hojas de los NPC del mapa actual (no se desalojan)
         
         # Grupos de sprites
         self.all_sprites = AllSprites()
-        self.collision_sprites = pygame.sprite.Group()
+        self.collision_sprites = []  # Collider del mapa (sin sprites ni superficies)
         self.interactable_sprites = pygame.sprite.Group()
         self.npc_sprites = pygame.sprite.Group()
+        self.npc_manager = NPCManager()
+        self.pathfinding: Optional[PathfindingService] = None
         
         # Sistema de transiciones
-        self.fade = FadeTransition((320, 240), speed=550)  # TODO: usar config
+        self.fade = FadeTransition((INT_WIDTH, INT_HEIGHT), speed=550)
         
         # Cargar mapa inicial
         self.load_map(start_map_path)
@@ -273,8 +536,10 @@ class WorldManager:
                 self.tile_size,
                 self.interactable_sprites,
                 self.all_sprites,
-                self.collision_sprites
+                self.collision_sprites,
+                npc_group=self.npc_sprites
             )
+            self._reset_map_systems()
             
             logger.info(f"Map loaded successfully: {map_path}")
             
@@ -285,38 +550,62 @@ class WorldManager:
     def _clear_sprites(self):
         """Limpia todos los grupos de sprites"""
         self.all_sprites.empty()
-        self.collision_sprites.empty() 
+        self.collision_sprites.clear()
         self.interactable_sprites.empty()
         self.npc_sprites.empty()
     
-    def start_transition(self, new_map_path: str, callback=None):
+    def start_transition(self, new_map_path: str, callback=None, effect: Optional[str] = None):
         """Inicia una transicion a un nuevo mapa"""
+        if self.fade.active:
+            logger.debug(f"Transition already in progress, ignoring {new_map_path}")
+            return
         self.next_map_path = new_map_path
         
-        # Pre-cargar el siguiente mapa
-        try:
-            self.next_map_obj = Map(
-                new_map_path,
-                self.tile_size,
-                pygame.sprite.Group(),  # Grupos temporales
-                AllSprites(),
-                pygame.sprite.Group()
-            )
-            
-            # Iniciar fade
-            def fade_callback():
-                self._finish_transition()
-                if callback:
-                    callback()
+        # Reutilizar la precarga si ya empezo; si no, construir el mapa por
+        # partes mientras dura el fade
+        self.map_loader = self.prefetched.pop(normalize_map_path(new_map_path), None)
+        if self.map_loader is None or self.map_loader.error:
+            self.map_loader = self._create_loader(new_map_path)
+        else:
+            logger.debug(f"Using prefetched map {new_map_path} (done={self.map_loader.done})")
+        self.next_map_obj = self.map_loader.map
+        
+        # Iniciar fade. El callback recibe si el mapa cambio de verdad
+        def fade_callback():
+            changed = self._finish_transition()
+            if callback:
+                callback(changed)
 
-            self.fade.start(callback=fade_callback)
-            logger.info(f"Started transition to {new_map_path}")
-            
-        except Exception as e:
-            logger.error(f"Error pre-loading map for transition: {e}")
+        self.fade.start(callback=fade_callback, ready=self._next_map_ready, effect=effect)
+        logger.info(f"Started transition to {new_map_path}")
     
-    def _finish_transition(self):
-        """Completa la transicion de mapa"""
+    def _create_loader(self, map_path: str) -> MapLoader:
+        """Crea un Map diferido sobre grupos temporales y su loader"""
+        game_map = Map(
+            map_path,
+            self.tile_size,
+            pygame.sprite.Group(),  # Grupos temporales
+            AllSprites(),
+            [],
+            npc_group=pygame.sprite.Group(),
+            deferred=True
+        )
+        return MapLoader(game_map)
+    
+    def _next_map_ready(self) -> bool:
+        """Indica si el mapa siguiente ya termino de cargarse"""
+        return self.map_loader is None or self.map_loader.done
+    
+    def _finish_transition(self) -> bool:
+        """Completa la transicion de mapa. Devuelve False si el mapa no se pudo cargar"""
+        loader, self.map_loader = self.map_loader, None
+        if loader and loader.error:
+            logger.error(f"Error pre-loading map for transition: {loader.error}")
+            self.next_map_obj = None
+            self.next_map_path = None
+        elif loader:
+            logger.debug(f"Map built in {loader.steps_run} steps, worst frame {loader.worst_frame_ms:.2f} ms")
+        
         if self.next_map_obj:
             # Limpiar mapa actual
             self._clear_sprites()
@@ -328,12 +617,51 @@ class WorldManager:
             self.all_sprites = self.current_map.allsprites_group
             self.interactable_sprites = self.current_map.interactable_group
             self.collision_sprites = self.current_map.collision_group
+            self.npc_sprites = self.current_map.npc_group
+            self._reset_map_systems()
             
             # Limpiar variables de transicion
             self.next_map_obj = None
             self.next_map_path = None
             
+            # Descartar precargas que ya no son vecinas del mapa actual
+            neighbors = set(self.world_index.neighbors(self.current_map.map_path))
+            for path in list(self.prefetched):
+                if path not in neighbors:
+                    del self.prefetched[path]
+            
             logger.info("Map transition completed")
+            return True
+        return False
+    
+    def _reset_map_systems(self):
+        """Reconstruye los sistemas que dependen del mapa actual"""
+        self.pathfinding = PathfindingService(self.current_map.collision_grid)
+        self.pathfinding.set_goal("start", self.current_map.return_start_point())
+        exits = [exit_zone.rect.center for exit_zone in self.world_index.exits(self.current_map.map_path)]
+        if exits:
+            self.pathfinding.set_goal("exits", exits)
+        self.npc_manager.reset(self.npc_sprites, self.collision_sprites, self.pathfinding)
+        self._hold_npc_sheets()
+    
+    def _hold_npc_sheets(self):
+        """Retiene las hojas de los NPC del mapa actual y suelta las del anterior"""
+        resource_manager = ResourceManager.get_instance()
+        keys = {npc.sprite_key for npc in self.npc_sprites if npc.sprite_key}
+        # Primero se toman las nuevas: las compartidas nunca quedan sin referencia
+        handles = [resource_manager.acquire("sprite_sheets", key) for key in keys]
+        for handle in self._npc_sheet_handles:
+            handle.release()
+        self._npc_sheet_handles = [handle for handle in handles if handle]
+        # Un mapa precargado pudo armar sus NPC con una tabla que ya se desalojo
+        for npc in self.npc_sprites:
+            npc.load_frames(npc.sprite_key)
+    
+    def release_resources(self):
+        """Suelta las hojas retenidas por los NPC"""
+        for handle in self._npc_sheet_handles:
+            handle.release()
+        self._npc_sheet_handles = []
     
     def get_start_position(self) -> tuple:
         """Obtiene la posicion de inicio del mapa actual"""
@@ -342,9 +670,46 @@ class WorldManager:
         return (0, 0)
     
     def update(self, dt: float):
-        """Actualiza el sistema del mundo"""
+        """Paso de simulacion del mundo (corre una vez por paso fijo)"""
         if self.fade.active:
-            self.fade.update(dt)    
+            self.fade.update(dt)
+    
+    def frame_update(self, player_pos: Optional[tuple] = None):
+        """Trabajo con presupuesto de tiempo: una vez por frame renderizado.
+
+        Si corriera en cada paso fijo, un frame con varios pasos gastaria
+        varias veces el presupuesto de carga antes de dibujar.
+        """
+        # Avanzar la carga del mapa siguiente dentro del presupuesto del frame
+        if self.map_loader and not self.map_loader.done:
+            self.map_loader.step(MAP_LOAD_BUDGET_MS)
+        elif player_pos is not None and not self.fade.active:
+            self._update_prefetch(player_pos)
+        
+        # Campos de distancia: un solo calculo compartido por todos los agentes
+        if self.pathfinding and not self.fade.active:
+            if player_pos is not None:
+                self.pathfinding.set_goal("player", player_pos)
+            self.pathfinding.update()
+    
+    def _update_prefetch(self, player_pos: tuple):
+        """Precarga los mapas vecinos cuya salida tiene al jugador cerca"""
+        if not self.current_map:
+            return
+        current = normalize_map_path(self.current_map.map_path)
+        for target in self.world_index.targets_near(current, player_pos, MAP_PREFETCH_DISTANCE):
+            if target != current and target not in self.prefetched:
+                logger.debug(f"Prefetching neighbor map {target}")
+                self.prefetched[target] = self._create_loader(target)
+        
+        # Una precarga por frame, con un presupuesto menor que el de transicion
+        for path, loader in self.prefetched.items():
+            if not loader.done:
+                loader.step(MAP_PREFETCH_BUDGET_MS)
+                if loader.error:
+                    logger.error(f"Error prefetching map {path}: {loader.error}")
+                break
+
     def is_transitioning(self) -> bool:
         """Verifica si hay una transicion activa"""
         return self.fade.active
@@ -0,0 +1,223 @@
+"""Modo de color indexado: superficies de 8 bits con una paleta compartida.
+
+El arte usa pocos colores, asi que tiles y frames de personajes entran en
+una sola paleta de 256 entradas y ocupan 1 byte por pixel en vez de 4.
+Solo se indexan imagenes sin transparencia parcial (los pixeles son
+totalmente opacos o totalmente transparentes); el resto se queda en 32 bits
+porque necesita mezcla alpha. La conversion es exacta: se ve igual.
+
+Comparar memoria y velocidad de blit contra 32 bits:
+
+    python -m IndexedColor            # desde la carpeta Code/
+
+Comprobar que el atlas de 8 bits dibuja igual que los frames de 32 bits,
+agregando hojas y variantes despues de crear las paginas:
+
+    python -m IndexedColor --check
+"""
+import argparse
+import array
+import sys
+import time
+from typing import Dict, List, Optional
+
+from Settings.Settings import *
+
+TRANSPARENT_INDEX = 0          # indice reservado como colorkey
+_TRANSPARENT_RGB = (255, 0, 255)
+PALETTE_SIZE = 256
+
+class SharedPalette:
+    """Paleta unica para todas las superficies indexadas.
+
+    Los colores se agregan a medida que aparecen y nunca cambian de indice,
+    asi que las superficies ya creadas siguen siendo validas.
+    """
+
+    def __init__(self):
+        self.colors: List[tuple] = [_TRANSPARENT_RGB]
+        self._index: Dict[tuple, int] = {}
+        self.indexed = 0    # superficies convertidas
+        self.rejected = 0   # superficies que se quedaron en 32 bits
+
+    def __len__(self):
+        return len(self.colors)
+
+    def full_palette(self) -> List[tuple]:
+        return self.colors + [(0, 0, 0)] * (PALETTE_SIZE - len(self.colors))
+
+    def index_surface(self, surface: pygame.Surface) -> Optional[pygame.Surface]:
+        """Version de 8 bits de la superficie, o None si no se puede indexar.
+
+        Devuelve None si hay pixeles semitransparentes o si la paleta no
+        tiene lugar para sus colores (en ese caso no se agrega ninguno).
+        """
+        if not surface.get_flags() & pygame.SRCALPHA:
+            # Sin canal alpha el byte A de tobytes no es fiable: opaco salvo el colorkey
+            surface = surface.convert_alpha()
+        pixels = array.array("I")
+        pixels.frombytes(pygame.image.tobytes(surface, "RGBA"))
+        lookup = {}
+        new_colors = []
+        for value in set(pixels):
+            r, g, b, a = value.to_bytes(4, sys.byteorder)
+            if a == 0:
+                lookup[value] = TRANSPARENT_INDEX
+            elif a == 255:
+                rgb = (r, g, b)
+                index = self._index.get(rgb)
+                if index is None:
+                    index = len(self.colors) + len(new_colors)
+                    new_colors.append(rgb)
+                lookup[value] = index
+            else:
+                self.rejected += 1
+                return None
+        if len(self.colors) + len(new_colors) > PALETTE_SIZE:
+            self.rejected += 1
+            return None
+        for rgb in new_colors:
+            self._index[rgb] = len(self.colors)
+            self.colors.append(rgb)
+
+        indexed = pygame.image.frombytes(bytes(map(lookup.__getitem__, pixels)), surface.get_size(), "P")
+        indexed.set_palette(self.full_palette())
+        if TRANSPARENT_INDEX in lookup.values():
+            indexed.set_colorkey(TRANSPARENT_INDEX, pygame.RLEACCEL)
+        self.indexed += 1
+        return indexed
+
+    def new_surface(self, size) -> pygame.Surface:
+        """Superficie de 8 bits vacia (todo transparente) con esta paleta"""
+        surface = pygame.Surface(size, 0, 8)
+        surface.set_palette(self.full_palette())
+        surface.fill(TRANSPARENT_INDEX)
+        surface.set_colorkey(TRANSPARENT_INDEX)
+        return surface
+
+def _bench_blit(surface, target, repeats):
+    start = time.perf_counter()
+    for i in range(repeats):
+        target.blit(surface, ((i * 7) % 64, (i * 3) % 32))
+    return (time.perf_counter() - start) * 1e6 / repeats
+
+def _tiles(surface, tile_size=TILE_SIZE):
+    """Corta un tileset en tiles, que es como lo usa el mapa"""
+    width, height = surface.get_size()
+    return [surface.subsurface((x, y, tile_size, tile_size))
+            for y in range(0, height - tile_size + 1, tile_size)
+            for x in range(0, width - tile_size + 1, tile_size)]
+
+def benchmark(paths, repeats=2000, tilesets=()):
+    """Memoria y tiempo de blit de cada imagen en 32 bits y en 8 bits.
+
+    Las imagenes de `tilesets` se miden tile por tile: los tiles con alpha
+    parcial quedan en 32 bits y el resto se indexa.
+    """
+    from Game.World.SurfaceOptimizer import SurfaceOptimizer
+    target = pygame.display.get_surface()
+    palette = SharedPalette()
+    rows = []
+    for path in paths:
+        source = pygame.image.load(str(path))
+        parts = _tiles(source) if path in tilesets else [source]
+        row = {"name": Path(path).name, "size": source.get_size(), "parts": len(parts),
+               "bytes_32": 0, "bytes_8": 0, "us_32": 0.0, "us_8": 0.0, "kept": 0}
+        for part in parts:
+            # 32 bits: el mejor formato que elige el optimizador de superficies
+            full = SurfaceOptimizer().optimize(part)
+            indexed = palette.index_surface(part)
+            if indexed is None:
+                row["kept"] += 1
+                indexed = full
+            row["bytes_32"] += full.get_width() * full.get_height() * full.get_bytesize()
+            row["bytes_8"] += indexed.get_width() * indexed.get_height() * indexed.get_bytesize()
+            row["us_32"] += _bench_blit(full, target, repeats)
+            row["us_8"] += _bench_blit(indexed, target, repeats)
+        rows.append(row)
+    return rows, palette
+
+def check_atlas(sheets, tints=()):
+    """Compara los frames del atlas de 8 bits con los originales de 32 bits.
+
+    Cada hoja (y cada variante de `tints`) se agrega al atlas por separado,
+    como en el juego, asi que la paleta crece con paginas ya creadas.
+    Devuelve (frames comparados, frames distintos, frames no indexados).
+    """
+    from ResourceManager import SpriteSheet, build_animation_table
+    from SpriteVariants import recolor
+    from TextureAtlas import TextureAtlas, blit_image
+    palette = SharedPalette()
+    atlas = TextureAtlas(ATLAS_PAGE_SIZE, palette=palette)
+    tables = []
+    for name, path, frame_size in sheets:
+        table = build_animation_table(SpriteSheet(pygame.image.load(str(path)).convert_alpha(), *frame_size))
+        tables.append((name, table))
+        for tint_name, tint in tints:
+            tables.append((f"{name}/{tint_name}",
+                           {direction: tuple(recolor(frame, tint=tint) for frame in row)
+                            for direction, row in table.items()}))
+
+    compared = different = kept = 0
+    for name, table in tables:
+        frames = {}
+        for direction, row in table.items():
+            for index, frame in enumerate(row):
+                indexed = palette.index_surface(frame)
+                if indexed is None:
+                    kept += 1
+                else:
+                    frames[(name, direction, index)] = (frame, indexed)
+        regions = atlas.add_many({key: indexed for key, (frame, indexed) in frames.items()})
+        for key, (frame, indexed) in frames.items():
+            expected = pygame.Surface(frame.get_size())
+            expected.fill((40, 40, 40))
+            actual = expected.copy()
+            expected.blit(frame, (0, 0))
+            blit_image(actual, regions[key], (0, 0))
+            compared += 1
+            if pygame.image.tobytes(expected, "RGB") != pygame.image.tobytes(actual, "RGB"):
+                different += 1
+                print(f"distinto: {key}")
+    return compared, different, kept
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara superficies de 32 bits con las indexadas de 8 bits")
+    parser.add_argument("images", nargs="*", help="imagenes (por defecto: hojas del manifiesto y tilesets)")
+    parser.add_argument("--repeats", type=int, default=2000, help="blits por medicion (por defecto: %(default)s)")
+    parser.add_argument("--check", action="store_true",
+                        help="comparar el atlas de 8 bits con los frames de 32 bits y salir")
+    args = parser.parse_args(argv)
+
+    pygame.display.set_mode((INT_WIDTH, INT_HEIGHT))
+    if args.check:
+        from AssetPack import load_asset_manifest
+        sheets = [(entry["key"], BASE_DIR / entry["path"], entry["frame"])
+                  for entry in load_asset_manifest()["sprite_sheets"]]
+        sheets = [sheet for sheet in sheets if sheet[1].exists()]
+        compared, different, kept = check_atlas(sheets, SPRITE_TINTS.items())
+        print(f"{compared} frames comparados, {different} distintos, {kept} en 32 bits por alpha parcial")
+        return 1 if different else 0
+    paths = args.images
+    tilesets = set()
+    if not paths:
+        from AssetPack import load_asset_manifest
+        manifest = load_asset_manifest()
+        paths = [BASE_DIR / entry["path"] for entry in manifest["sprite_sheets"]]
+        paths = [path for path in paths if path.exists()]
+        tilesets = set(sorted(Path(MAPS_DIR).glob("Tiles/*.png")))
+        paths += sorted(Path(MAPS_DIR).glob("Objects/*.png")) + sorted(tilesets)
+
+    rows, palette = benchmark(paths, args.repeats, tilesets)
+    print(f"{'imagen':<20}{'piezas':>7}{'en 32':>7}{'KB 32':>8}{'KB 8':>8}{'us 32':>8}{'us 8':>8}")
+    for row in rows:
+        print(f"{row['name']:<20}{row['parts']:>7}{row['kept']:>7}{row['bytes_32'] / 1024:>8.1f}"
+              f"{row['bytes_8'] / 1024:>8.1f}{row['us_32']:>8.1f}{row['us_8']:>8.1f}")
+    total_32 = sum(row["bytes_32"] for row in rows)
+    total_8 = sum(row["bytes_8"] for row in rows)
+    print(f"total: {total_32 // 1024} KB -> {total_8 // 1024} KB, paleta {len(palette)} colores, "
+          f"{palette.indexed} piezas indexadas, {palette.rejected} en 32 bits por alpha parcial")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
 import os
+import time
 import pygame
 import logging
 from pathlib import Path
@@ -8,14 +9,14 @@ logger = logging.getLogger(__name__)
 
 from Settings.Settings import *
 from ResourceManager import ResourceManager
-from GameSystems import GameStateManager, RenderSystem, PartyManager, WorldManager, GameState
+from GameSystems import (GameStateManager, RenderSystem, PartyManager, WorldManager, GameState, UpdateScheduler,
+                         FrameGovernor, WorkPriority)
 from Game.World.Sprites import Follower
 from UI.Menu import Menu
 from Characters.Player import Player
 from UI.Components.Dialog import DialogManager
 from UI.UI_Inventory import UI_Inventory
 from DebugMenu import DebugMenu
-from Game.World.Map import FadeTransition
 
 os.environ["SDL_VIDEO_CENTERED"] = "1"
 
@@ -30,9 +31,18 @@ class Scene:
     def update(self, dt): 
         pass
     
-    def draw(self, surface): 
+    def frame_update(self):
+        """Trabajo por frame renderizado, fuera del paso fijo (cargas con presupuesto)"""
         pass
     
+    def draw(self, surface, alpha=1.0):
+        """alpha: fraccion del paso de simulacion actual, para interpolar"""
+        pass
+    
+    def has_pending_changes(self):
+        """False si la escena no cambia sin input (el bucle puede dormir)"""
+        return True
+    
     def cleanup(self):
         pass
 
@@ -80,7 +90,11 @@ class MenuScene(Scene):
     def update(self, dt):
         self.menus[self.current_menu].update()
 
-    def draw(self, surface):
+    def has_pending_changes(self):
+        # Los menus solo cambian con input
+        return False
+
+    def draw(self, surface, alpha=1.0):
         self.menus[self.current_menu].draw()
 
 class GameScene(Scene):
@@ -89,6 +103,9 @@ class GameScene(Scene):
         super().__init__(game)
         logger.info("Initializing GameScene")
         self.player_history = [] 
+        self.prev_camera_target = None  # centro del jugador antes del ultimo paso
+        self._world_cache = None         # instantanea del mundo bajo overlays modales
+        self._world_cache_key = None
         try:
             # Inicializar sistemas
             self._init_systems()
@@ -110,9 +127,17 @@ class GameScene(Scene):
             self.state_manager = GameStateManager()
             self.render_system = RenderSystem(self.game.INT_W, self.game.INT_H)
             self.party_manager = PartyManager()
+            self.update_scheduler = UpdateScheduler()
+            
+            # Trabajo opcional que el gobernador puede degradar bajo carga
+            self.governor = self.game.governor
+            self.governor.register("debug_visuals", WorkPriority.LOW)
+            self.governor.register("circle_trails", WorkPriority.LOW)
+            self.governor.register("ui_redraw", WorkPriority.MEDIUM)
+            self.governor.register("camera_smoothing", WorkPriority.HIGH)
             
             # Sistema de mundo
-            start_map_path = join(MAPS_DIR, "Aula", "Aula-1.tmx")
+            start_map_path = START_MAP
             self.world_manager = WorldManager(TILE_SIZE, start_map_path)
             
             logger.debug("Game systems initialized")
@@ -128,22 +153,29 @@ class GameScene(Scene):
         
         # Sistema de diálogos
         default_sound = self.resource_manager.get_sound("default")
-        portrait = self.resource_manager.get_image("koral_portrait")
+        portrait = None
+        portrait_request = None
+        portrait_path = SPRITES_DIR / "Koral" / "No-eyes-Koral1.png"
+        if portrait_path.exists():
+            # Carga en segundo plano: el dialogo usa un placeholder hasta que llegue
+            portrait_request = self.resource_manager.request_image("koral_portrait", portrait_path,
+                                                                   placeholder_size=(50, 56))
+            portrait = portrait_request.value
+        else:
+            logger.warning("Portrait not found, using placeholder")
 
-        # Cargar portrait si no existe
-        if not portrait:
-            portrait_path = SPRITES_DIR / "Koral" / "No-eyes-Koral1.png"
-            if portrait_path.exists():
-                portrait = self.resource_manager.load_image("koral_portrait", portrait_path)
-            else:
-                logger.warning("Portrait not found, using placeholder")
-                portrait = None
+        # El DialogManager retiene el sonido y el portrait: que no se desalojen
+        self._asset_handles = [
+            handle for handle in (self.resource_manager.acquire("sounds", "default"),) if handle
+        ]
 
         self.dialog_manager = DialogManager(
             self.game.font, 300, WINDOW_HEIGHT,
             sound=default_sound,
             portrait=portrait
         )
+        if portrait_request is not None:
+            portrait_request.add_callback(self._on_portrait_ready)
         sprite_sheet_key = "Ely"
         sprite_sheet = self.resource_manager.get_spritesheet(sprite_sheet_key)
 
@@ -153,7 +185,8 @@ class GameScene(Scene):
             placeholder_surface.fill((100, 150, 255)) 
             from ResourceManager import SpriteSheet
             sprite_sheet = SpriteSheet(placeholder_surface, 25, 44)
-            self.resource_manager._sprite_sheets[sprite_sheet_key] = sprite_sheet
+            self.resource_manager.add_spritesheet(sprite_sheet_key, sprite_sheet)
+        self._hold_sprite_sheet(sprite_sheet_key)
 
         # Crear jugador con manejo de errores
         self.player = Player(
@@ -163,12 +196,27 @@ class GameScene(Scene):
             dialog_manager=self.dialog_manager,
             interactuables=self.world_manager.interactable_sprites,
             collision_sprites=self.world_manager.collision_sprites,
-            groups=self.world_manager.all_sprites
+            groups=self.world_manager.all_sprites,
+            npc_manager=self.world_manager.npc_manager
         )
         self.followers = []
         self._create_followers()
         logger.debug("World initialized")
 
+    def _on_portrait_ready(self, portrait):
+        self.dialog_manager.set_portrait(portrait)
+        handle = self.resource_manager.acquire("images", "koral_portrait")
+        if handle:
+            self._asset_handles.append(handle)
+
+    def _hold_sprite_sheet(self, key):
+        """Los personajes guardan la tabla de animacion de su hoja: que no se desaloje"""
+        if any(handle.category == "sprite_sheets" and handle.key == key for handle in self._asset_handles):
+            return
+        handle = self.resource_manager.acquire("sprite_sheets", key)
+        if handle:
+            self._asset_handles.append(handle)
+
     def _create_followers(self):
             # Limpiar followers existentes
             for follower in self.followers:
@@ -177,6 +225,7 @@ class GameScene(Scene):
             
             # Crear nuevos followers
             for character in self.party_manager.characters[1:]:
+                self._hold_sprite_sheet(character.sprite_key)
                 follower = Follower(character, self, self.world_manager.all_sprites)
                 
                 # Posicionar follower en la posicion del jugador inicialmente
@@ -236,10 +285,17 @@ class GameScene(Scene):
         self.state_manager.set_state(GameState.TRANSITIONING)
         self.world_manager.start_transition(path, self._finish_level_change)
     
-    def _finish_level_change(self):
+    def _finish_level_change(self, changed=True):
             """Completa el cambio de nivel"""
+            if not changed:
+                # El mapa destino fallo: el jugador sigue donde estaba
+                self.state_manager.set_state(GameState.PLAYING)
+                logger.warning("Level transition failed, staying on current map")
+                return
+            
             # Reposicionar jugador
             self._reposition_player()
+            self.prev_camera_target = None
             
             # Actualizar referencias del jugador
             self.player.interactables = self.world_manager.interactable_sprites
@@ -249,8 +305,7 @@ class GameScene(Scene):
             self.world_manager.all_sprites.add(self.player)
             
             # NUEVO: Limpiar el path del jugador y reposicionar followers
-            self.player_path.clear()
-            self.player_path.append(self.player.rect.center)
+            self.player_history.clear()
             
             # Reposicionar todos los followers en la nueva posicion del jugador
             for follower in self.followers:
@@ -326,7 +381,14 @@ class GameScene(Scene):
             self.player.input(events)
     
 
+    def frame_update(self):
+        # Carga de mapas y campos de distancia: una vez por frame, no por paso
+        self.world_manager.frame_update(self.player.hitbox_rect.center)
+
     def update(self, dt):
+        # Estado anterior para interpolar el render entre pasos
+        self.world_manager.all_sprites.save_previous()
+        self.prev_camera_target = self.player.rect.center
         
         # Debug y transiciones
         self.debug_menu.update(dt)
@@ -369,25 +431,58 @@ class GameScene(Scene):
 
 
         # 5) Resto del codigo igual...
-        self.dialog_manager.update()
+        self.dialog_manager.update(dt)
         
         if not self.dialog_manager.active \
         and not self.world_manager.is_transitioning() \
         and not self.inventory_ui.visible:
-            for sprite in self.world_manager.all_sprites:
-                if not isinstance(sprite, Follower):
-                    if hasattr(sprite, 'update'):
-                        sprite.update(dt)
+            view_rect = self.world_manager.all_sprites.get_view_rect((self.game.INT_W, self.game.INT_H))
+            self.update_scheduler.update(dt, view_rect)
+            self.world_manager.npc_manager.update(dt, view_rect, (self.player.hitbox_rect,))
                         
-    def draw(self, surface):
+    def draw(self, surface, alpha=1.0):
         """Renderiza la escena"""
+        fade = self.world_manager.fade
+        if fade.active and not fade.needs_snapshot:
+            # Transicion: solo el frame congelado
+            fade.draw(surface)
+            return
 
+        # Capa del mundo: con un overlay modal abierto se reutiliza la
+        # instantanea mientras el mundo no cambie
+        signature = self._world_signature(alpha) if self._modal_open() else None
+        if signature is not None and signature == self._world_cache_key:
+            surface.blit(self._world_cache, (0, 0))
+        else:
+            self._draw_world(surface, alpha)
+            self._world_cache_key = signature
+            if signature is not None:
+                if self._world_cache is None or self._world_cache.get_size() != surface.get_size():
+                    self._world_cache = pygame.Surface(surface.get_size())
+                self._world_cache.blit(surface, (0, 0))
+        
+        # UI
+        self.inventory_ui.draw(surface)
+        if hasattr(self, 'dialog_manager'):
+            self.dialog_manager.draw(surface)
+        self.debug_menu.draw(surface)
+        
+        # Transiciones: capturar el frame recien dibujado una sola vez
+        if fade.active:
+            fade.capture(surface)
+            fade.draw(surface)
+        
+    
+    def _draw_world(self, surface, alpha):
+        """Mundo, etiqueta del mapa y visuales de debug (todo lo que va bajo la UI)"""
         # Renderizar mundo
+        self.world_manager.all_sprites.allow_smoothing = self.governor.is_enabled("camera_smoothing")
         if hasattr(self, 'player'):
             self.render_system.render_world(
                 surface, 
                 self.world_manager.all_sprites, 
-                self.player.rect.center
+                self._camera_target(alpha),
+                alpha
             )
         else:
             # Si no hay jugador, renderizar desde el centro
@@ -397,10 +492,9 @@ class GameScene(Scene):
                 (self.game.INT_W // 2, self.game.INT_H // 2)
             )
         mapa_actual = getattr(self.world_manager.current_map, 'map_path', '???')
-        nombre_mapa = self.game.font.render(f"MAPA: {mapa_actual}", True, (255, 255, 0))
-        surface.blit(nombre_mapa, (10, 10))
+        surface.blit(self._map_label(mapa_actual), (10, 10))
         # Elementos de debug visual
-        if hasattr(self, 'player'):
+        if hasattr(self, 'player') and self.governor.should_run("debug_visuals"):
             self.render_system.render_debug_visuals(
                 surface,
                 self.debug_menu,
@@ -409,23 +503,70 @@ class GameScene(Scene):
                 self.player.rect
             )
         
-        # UI
-        self.inventory_ui.draw(surface)
-        if hasattr(self, 'dialog_manager'):
-            self.dialog_manager.draw(surface)
-        self.debug_menu.draw(surface)
-        
-        # Transiciones
+        # Trails de los circulos de debug
+        if self.circle_manager.circles and self.governor.should_run("circle_trails"):
+            self.circle_manager.draw_debug_info(surface, self.world_manager.all_sprites.get_camera_offset())
+    
+    def _modal_open(self):
+        """Overlays que congelan el mundo (la transicion sigue redibujando)"""
         if self.world_manager.is_transitioning():
-            self.world_manager.fade.draw(surface)
-        
+            return False
+        return self.inventory_ui.visible or self.debug_menu.visible or self.dialog_manager.active
+    
+    def _world_signature(self, alpha):
+        """Todo lo que cambia el aspecto de la capa del mundo, o None si no es cacheable"""
+        sprites = self.world_manager.all_sprites
+        moving = []
+        for sprite in sprites.moving:
+            prev = getattr(sprite, "prev_topleft", None)
+            if alpha < 1.0 and prev is not None and prev != sprite.rect.topleft:
+                # Se esta moviendo: su posicion dibujada depende de alpha
+                return None
+            moving.append((id(sprite), sprite.rect.topleft, id(sprite.image)))
+        camera = self._camera_target(alpha)
+        return (
+            id(sprites), len(sprites), frozenset(moving),
+            (round(camera[0]), round(camera[1])), tuple(sprites.offset),
+            getattr(self.world_manager.current_map, 'map_path', None),
+            self.player.state,
+            self.debug_menu.visible, self.debug_menu.show_hitboxes, self.debug_menu.show_interaction_zones,
+            len(self.circle_manager.circles), self.circle_manager.show_trails,
+        )
+    
+    def has_pending_changes(self):
+        """Con el inventario abierto el mundo esta congelado: solo cambia con input"""
+        if not self.inventory_ui.visible or self.resource_manager.pending_requests():
+            return True
+        dialog_typing = self.dialog_manager.active and self.dialog_manager.dialog_box \
+            and not self.dialog_manager.dialog_box.is_finished()
+        return bool(dialog_typing or self.world_manager.is_transitioning() or self.world_manager.map_loader)
+    
+    def _map_label(self, map_path):
+        """Etiqueta con el nombre del mapa, renderizada solo cuando cambia"""
+        cached = getattr(self, "_map_label_cache", None)
+        if cached is None or cached[0] != map_path:
+            cached = (map_path, self.game.font.render(f"MAPA: {map_path}", True, (255, 255, 0)))
+            self._map_label_cache = cached
+        return cached[1]
+    
+    def _camera_target(self, alpha):
+        """Centro del jugador interpolado entre los dos ultimos pasos"""
+        current = self.player.rect.center
+        prev = self.prev_camera_target
+        if prev is None or alpha >= 1.0:
+            return current
+        return (prev[0] + (current[0] - prev[0]) * alpha,
+                prev[1] + (current[1] - prev[1]) * alpha)
     
     def cleanup(self):
         """Limpia recursos de la escena"""
         logger.info("Cleaning up GameScene")
+        for handle in getattr(self, '_asset_handles', ()):
+            handle.release()
    
         # Limpiar sistemas si es necesario
         if hasattr(self, 'world_manager'):
+            self.world_manager.release_resources()
             del self.world_manager
         if hasattr(self, 'party_manager'):
             del self.party_manager
@@ -450,12 +591,21 @@ class Game:
         # Inicializar recursos
         self._init_resources()
         
-        # Inicializar escenas
-        self.scene = MenuScene(self, self.font)
-        
         # Variables de juego
         self.clock = pygame.time.Clock()
         self.running = True
+        self.render_fps = self._detect_render_fps()
+        self.accumulator = 0.0  # tiempo real pendiente de simular
+        self.governor = FrameGovernor(FRAME_BUDGET_MS or 1000.0 / self.render_fps)
+        self.resource_manager = ResourceManager.get_instance()
+        
+        # Politica de reposo
+        self.focused = True
+        self.minimized = False
+        self.last_activity = time.monotonic()
+        
+        # Inicializar escenas
+        self.scene = MenuScene(self, self.font)
         
         logger.info("Game initialized successfully")
     
@@ -506,6 +656,45 @@ class Game:
         # Recalcular escala y offset
         self._recalc_scale(*self.windowed_size)
     
+    def _is_idle(self):
+        """Indica si el bucle puede bajar el ritmo y no redibujar"""
+        if self.minimized or not self.focused:
+            return True
+        if self.scene is None or self.scene.has_pending_changes():
+            return False
+        return time.monotonic() - self.last_activity > IDLE_DELAY
+    
+    def _wait_idle_events(self):
+        """Duerme hasta el siguiente evento o hasta el proximo tick de reposo"""
+        event = pygame.event.wait(int(1000 / IDLE_FPS))
+        events = [] if event.type == pygame.NOEVENT else [event]
+        return events + pygame.event.get()
+    
+    def _track_window_events(self, events):
+        """Actualiza foco/minimizado; cualquier otro evento cuenta como actividad"""
+        for event in events:
+            if event.type == pygame.WINDOWFOCUSLOST:
+                self.focused = False
+            elif event.type == pygame.WINDOWFOCUSGAINED:
+                self.focused = True
+            elif event.type == pygame.WINDOWMINIMIZED:
+                self.minimized = True
+            elif event.type in (pygame.WINDOWRESTORED, pygame.WINDOWSHOWN, pygame.WINDOWEXPOSED):
+                self.minimized = False
+            else:
+                self.last_activity = time.monotonic()
+                continue
+            logger.debug(f"Window focused={self.focused} minimized={self.minimized}")
+    
+    def _detect_render_fps(self):
+        """Limite de FPS de render: RENDER_FPS_CAP o la frecuencia del monitor"""
+        if RENDER_FPS_CAP:
+            return RENDER_FPS_CAP
+        # Solo algunas versiones de pygame exponen la frecuencia del monitor
+        get_refresh_rate = getattr(pygame.display, "get_current_refresh_rate", None)
+        refresh = get_refresh_rate() if get_refresh_rate else 0
+        return refresh if refresh and refresh > 0 else 60
+    
     def _recalc_scale(self, sw, sh):
         """Recalcula la escala y offset para el renderizado"""
         self.scale = min(sw // self.INT_W, sh // self.INT_H) or 1
@@ -597,11 +786,27 @@ class Game:
         
         try:
             while self.running:
-                # Calcular delta time
-                dt = self.clock.tick(60) / 1000.0
-                
-                # Obtener eventos
-                events = pygame.event.get()
+                if self._is_idle():
+                    # Reposo: sin simulacion ni redibujado hasta que llegue un evento
+                    events = self._wait_idle_events()
+                    # Los pedidos en segundo plano terminan aunque no haya input;
+                    # si alguno termino se dibuja un frame con el resultado
+                    finished = self.resource_manager.poll()
+                    if not events and not finished:
+                        continue
+                    # El tiempo dormido no se simula
+                    self.clock.tick()
+                    self.accumulator = 0.0
+                    frame_time = 0.0
+                    self.governor.begin_frame()
+                else:
+                    # Tiempo real del frame, recortado para no simular de golpe una pausa larga
+                    frame_time = min(self.clock.tick(self.render_fps) / 1000.0, MAX_FRAME_TIME)
+                    self.governor.begin_frame()
+                    
+                    # Obtener eventos
+                    events = pygame.event.get()
+                self._track_window_events(events)
                 
                 # Manejar eventos del sistema
                 for event in events:
@@ -613,16 +818,35 @@ class Game:
                         if event.key == pygame.K_F11:
                             self.toggle_fullscreen()
                             continue
+                if not self.running:
+                    break
                 
-                # Actualizar escena actual
                 if self.scene:
                     self.scene.handle_events(events)
-                    self.scene.update(dt)
+                # Pedidos de recursos que terminaron de cargar en segundo plano
+                self.resource_manager.poll()
+                
+                if self.scene:
+                    self.scene.frame_update()
+                
+                # Simulacion a paso fijo: el juego avanza igual a cualquier FPS de render
+                self.accumulator += frame_time
+                steps = 0
+                while self.accumulator >= SIM_DT and steps < MAX_SIM_STEPS:
+                    if self.scene:
+                        self.scene.update(SIM_DT)
+                    self.accumulator -= SIM_DT
+                    steps += 1
+                if steps == MAX_SIM_STEPS:
+                    # Demasiado atrasados: descartar el resto en lugar de acumularlo
+                    self.accumulator = min(self.accumulator, SIM_DT)
+                # Al despertar del reposo no hay paso nuevo: dibujar el estado actual
+                alpha = self.accumulator / SIM_DT if frame_time else 1.0
                 
                 # Renderizar
                 self.internal_surf.fill((0, 0, 0))
                 if self.scene:
-                    self.scene.draw(self.internal_surf)
+                    self.scene.draw(self.internal_surf, alpha)
                 
                 # Escalar y mostrar
                 scaled = pygame.transform.scale(self.internal_surf, self.scaled_size)
@@ -631,6 +855,7 @@ class Game:
                 
                 # Actualizar pantalla
                 pygame.display.flip()
+                self.governor.end_frame()
                 
         except Exception as e:
             logger.error(f"Error in game loop: {e}")
@@ -1,8 +1,19 @@
 import pygame
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional
 import logging
 
+from Settings.Settings import (USE_TEXTURE_ATLAS, ATLAS_PAGE_SIZE, RESOURCE_MEMORY_BUDGET, PRELOAD_WORKERS,
+                               ASYNC_LOAD_WORKERS, USE_ASSET_PACK, USE_INDEXED_COLOR)
+from AssetPack import AssetPack, load_asset_manifest, pack_name
+from TextureAtlas import AtlasRegion, TextureAtlas
+from IndexedColor import SharedPalette
+from SpriteVariants import recolor, variant_key
+
 logger = logging.getLogger(__name__)
 
 class SpriteSheet:
@@ -21,8 +32,130 @@ class SpriteSheet:
     def get_row(self, row):
         return [self.get_frame(col, row) for col in range(self.columns)]
 
+# Orden de las filas en las hojas de caminar
+ANIMATION_ROWS = ("down", "right", "left", "up")
+
+def build_animation_table(sheet: SpriteSheet, mirror_left: bool = False) -> Dict[str, tuple]:
+    """Direccion -> frames como superficies independientes.
+
+    Las filas que la hoja no tiene (placeholders de una sola fila) usan la
+    fila 0. Con `mirror_left` la fila izquierda se obtiene espejando la derecha.
+    """
+    table = {}
+    for row, direction in enumerate(ANIMATION_ROWS):
+        if mirror_left and direction == "left":
+            continue
+        source_row = row if row < sheet.rows else 0
+        table[direction] = tuple(frame.copy() for frame in sheet.get_row(source_row))
+    if mirror_left:
+        table["left"] = tuple(pygame.transform.flip(frame, True, False) for frame in table["right"])
+    return table
+
+def surface_bytes(surface: pygame.Surface) -> int:
+    """Memoria de los pixeles de una superficie"""
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+def sound_bytes(sound) -> int:
+    """Memoria de las muestras de un sonido segun el formato del mixer"""
+    init = pygame.mixer.get_init()
+    if not init:
+        return 0
+    frequency, sample_format, channels = init
+    return int(sound.get_length() * frequency) * channels * (abs(sample_format) // 8)
+
+def _timed_load(load, path):
+    """Carga en un hilo del pool: devuelve (recurso o excepcion, ms)"""
+    start = time.perf_counter()
+    try:
+        result = load(path)
+    except (pygame.error, OSError) as e:
+        result = e
+    return result, (time.perf_counter() - start) * 1000
+
+class ResourceHandle:
+    """Referencia a un recurso cargado.
+
+    Mientras el handle no se libere el recurso no se desaloja. `get()`
+    devuelve el recurso y lo recarga si hizo falta.
+    """
+    __slots__ = ("manager", "category", "key", "released")
+
+    def __init__(self, manager, category, key):
+        self.manager = manager
+        self.category = category
+        self.key = key
+        self.released = False
+
+    def get(self):
+        return self.manager._get(self.category, self.key)
+
+    def release(self):
+        if not self.released:
+            self.released = True
+            self.manager._release(self.category, self.key)
+
+PLACEHOLDER_COLOR = (255, 0, 255)  # magenta, igual que los fallbacks de carga
+
+class AssetRequest:
+    """Pedido de carga en segundo plano.
+
+    `value` tiene un placeholder hasta que el recurso esta listo (None para
+    sonidos). Los callbacks corren en el hilo principal, desde
+    `ResourceManager.poll()`, y reciben el recurso cargado. Si la carga
+    falla queda el placeholder y `error`; no se guarda en cache, asi que
+    otro pedido de la misma key vuelve a intentar.
+    """
+    __slots__ = ("category", "key", "value", "ready", "error", "_callbacks", "_future", "_finish")
+
+    def __init__(self, category, key, placeholder):
+        self.category = category
+        self.key = key
+        self.value = placeholder
+        self.ready = False
+        self.error = None
+        self._callbacks = []
+        self._future = None
+        self._finish = None  # conversion en el hilo principal
+
+    def add_callback(self, callback):
+        """Registra un callback; si ya esta listo se llama enseguida"""
+        if self.ready:
+            callback(self.value)
+        else:
+            self._callbacks.append(callback)
+
+    def get(self):
+        return self.value
+
+    def _resolve(self, value):
+        self.value = value
+        self.ready = True
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback(value)
+            except Exception as e:
+                logger.error(f"Error in asset callback for {self.category}/{self.key}: {e}")
+
+class _AssetInfo:
+    __slots__ = ("loader", "bytes", "derived", "refs")
+
+    def __init__(self, loader, size):
+        self.loader = loader  # None = no se puede recargar, nunca se desaloja
+        self.bytes = size
+        self.derived = 0      # tablas de animacion y variantes sacadas de esta hoja (fuera del atlas)
+        self.refs = 0
+
 class ResourceManager:
-    """Singleton para gestion centralizada de recursos del juego"""
+    """Singleton para gestion centralizada de recursos del juego.
+
+    Cada recurso cargado desde disco guarda como recargarlo y cuanta memoria
+    ocupa. Las tablas de animacion, las variantes y sus regiones del atlas
+    cuentan como parte de su hoja. Si la memoria residente supera el
+    presupuesto se desalojan los recursos sin referencias (ver `acquire`)
+    empezando por el usado hace mas tiempo, y una hoja se lleva sus tablas;
+    el siguiente `get_*` los vuelve a cargar.
+    """
     
     _instance = None
     _initialized = False
@@ -38,6 +171,24 @@ class ResourceManager:
             self._images: Dict[str, pygame.Surface] = {}
             self._sounds: Dict[str, pygame.mixer.Sound] = {}
             self._fonts: Dict[str, pygame.font.Font] = {}
+            self._stores = {
+                "sprite_sheets": self._sprite_sheets,
+                "images": self._images,
+                "sounds": self._sounds,
+                "fonts": self._fonts,
+            }
+            # (categoria, key) -> info, del usado hace mas tiempo al mas reciente
+            self._assets: "OrderedDict[tuple, _AssetInfo]" = OrderedDict()
+            self.memory_budget = RESOURCE_MEMORY_BUDGET
+            self.evictions = 0
+            self._animation_tables: Dict[tuple, Dict[str, tuple]] = {}  # (key, mirror_left) -> tabla
+            self._variant_tables: Dict[tuple, Dict[str, tuple]] = {}    # (key, mirror_left, variante) -> tabla
+            self._atlas: Optional[TextureAtlas] = None
+            self.palette: Optional[SharedPalette] = SharedPalette() if USE_INDEXED_COLOR else None
+            self._pack: Optional[AssetPack] = None
+            self.base_dir = Path(__file__).resolve().parent.parent
+            self._request_pool: Optional[ThreadPoolExecutor] = None
+            self._requests: Dict[tuple, AssetRequest] = {}  # pedidos en curso
             self._initialized = True
             logger.info("ResourceManager initialized")
     
@@ -47,124 +198,562 @@ class ResourceManager:
         return cls()
     
     def preload_all_resources(self, base_dir: Path):
-        """Carga todos los recursos necesarios al inicio del juego"""
+        """Carga los recursos del manifiesto (Assets/Data/assets.json).
+
+        Si existe el pack (`python -m AssetPack`) todo sale de ese archivo
+        ya decodificado. Si no, la lectura y decodificacion de imagenes y
+        sonidos sueltos corre en un pool de hilos y la conversion al formato
+        de pantalla se hace en el hilo principal.
+        """
+        start = time.perf_counter()
+        self.load_report: Dict[str, Dict[str, float]] = {}
+        self.base_dir = base_dir
         try:
-            self._preload_fonts(base_dir)
-            self._preload_character_sprites(base_dir)
-            self._preload_sounds(base_dir)
+            manifest = load_asset_manifest()
+            self._pack = AssetPack.open(base_dir=base_dir) if USE_ASSET_PACK else None
+            if self._pack is not None:
+                self._preload_from_pack(manifest)
+            else:
+                with ThreadPoolExecutor(max_workers=PRELOAD_WORKERS, thread_name_prefix="preload") as pool:
+                    sheets = self._preload_character_sprites(manifest["sprite_sheets"], pool)
+                    sounds = self._preload_sounds(manifest["sounds"], pool)
+                    # Las fuentes se crean en el hilo principal mientras el pool decodifica
+                    self._preload_fonts(manifest["fonts"])
+                    self._finish_spritesheets(sheets)
+                    self._finish_sounds(sounds)
+            if USE_TEXTURE_ATLAS:
+                atlas_start = time.perf_counter()
+                self.build_atlas()
+                self.load_report["atlas"] = {"main_ms": (time.perf_counter() - atlas_start) * 1000}
+            self._log_load_report((time.perf_counter() - start) * 1000)
             logger.info("All resources preloaded successfully")
         except Exception as e:
             logger.error(f"Error preloading resources: {e}")
             raise
+
+    def _log_load_report(self, total_ms):
+        source = self._pack.path if self._pack is not None else f"{PRELOAD_WORKERS} workers"
+        lines = [f"Preload finished in {total_ms:.1f} ms ({source})"]
+        for name, times in self.load_report.items():
+            parts = ", ".join(f"{stage[:-3]} {ms:.1f} ms" for stage, ms in times.items())
+            lines.append(f"  {name}: {parts}")
+        logger.info("\n".join(lines))
+
+    def _preload_from_pack(self, manifest):
+        """Carga desde el pack; lo que no este empaquetado se lee suelto"""
+        pack = self._pack
+        for entry in manifest["sprite_sheets"]:
+            start = time.perf_counter()
+            width, height = entry["frame"]
+            if entry["path"] in pack:
+                loader = lambda name=entry["path"], w=width, h=height: SpriteSheet(
+                    pack.surface(name).convert_alpha(), w, h)
+                self._store("sprite_sheets", entry["key"], loader(), loader=loader)
+            elif (self.base_dir / entry["path"]).exists():
+                self.load_spritesheet(entry["key"], self.base_dir / entry["path"], width, height)
+            else:
+                self._add_missing_spritesheet(entry["key"], width, height)
+            self.load_report[entry["key"]] = {"main_ms": (time.perf_counter() - start) * 1000}
+        for entry in manifest["sounds"]:
+            sound_path = self.base_dir / entry["path"]
+            if entry["path"] in pack:
+                loader = lambda name=entry["path"]: pygame.mixer.Sound(file=pack.file(name))
+            elif sound_path.exists():
+                loader = lambda path=str(sound_path): pygame.mixer.Sound(path)
+            else:
+                continue
+            try:
+                self._store("sounds", entry["key"], loader(), loader=loader)
+            except pygame.error as e:
+                logger.error(f"Error loading sound {entry['key']}: {e}")
+        self._preload_fonts(manifest["fonts"])
     
-    def _preload_fonts(self, base_dir: Path):
+    def _preload_fonts(self, entries):
         """Pre-carga las fuentes del juego"""
-        font_path = base_dir / "Code" / "Assets" / "C&C Red Alert [INET].ttf"
-        if font_path.exists():
-            self._fonts["main_16"] = pygame.font.Font(str(font_path), 16)
-            self._fonts["main_12"] = pygame.font.Font(str(font_path), 12)
-            logger.debug(f"Loaded fonts from {font_path}")
-        else:
-            # Fallback a fuente por defecto
-            self._fonts["main_16"] = pygame.font.Font(None, 16)
-            self._fonts["main_12"] = pygame.font.Font(None, 12)
-            logger.warning(f"Font file not found, using default font")
-    
-    def _preload_character_sprites(self, base_dir: Path):
-        """Pre-carga los sprites de personajes"""
-        sprites_dir = base_dir / "Sprites"
-        character_configs = [
-            ("Ely", "Ely/Ely-Walk.png", 25, 44),
-            ("Koral", "Koral/Koral-Walk.png", 25, 44),
-            ("Vel", "Vel/Vel-Walk.png", 25, 44),
-        ]
-        
-        for char_name, sprite_path, width, height in character_configs:
-            full_path = sprites_dir / sprite_path
+        start = time.perf_counter()
+        for entry in entries:
+            font_path = self.base_dir / entry["path"]
+            # Las fuentes las retiene el juego entero: se registran sin loader
+            if self._pack is not None and entry["path"] in self._pack:
+                font = pygame.font.Font(self._pack.file(entry["path"]), entry["size"])
+                self._store("fonts", entry["key"], font, size=self._pack.index[entry["path"]]["size"])
+            elif font_path.exists():
+                font = pygame.font.Font(str(font_path), entry["size"])
+                self._store("fonts", entry["key"], font, size=os.path.getsize(font_path))
+            else:
+                # Fallback a fuente por defecto
+                self._store("fonts", entry["key"], pygame.font.Font(None, entry["size"]))
+                logger.warning(f"Font file not found, using default font")
+        self.load_report["fonts"] = {"main_ms": (time.perf_counter() - start) * 1000}
+    
+    def _preload_character_sprites(self, entries, pool: ThreadPoolExecutor):
+        """Encola la decodificacion de las hojas de personajes. Devuelve los pendientes"""
+        pending = []
+        for entry in entries:
+            char_name = entry["key"]
+            width, height = entry["frame"]
+            full_path = self.base_dir / entry["path"]
             if full_path.exists():
-                self.load_spritesheet(char_name, full_path, width, height)
-                logger.debug(f"Loaded sprite for {char_name}")
+                future = pool.submit(_timed_load, pygame.image.load, str(full_path))
+                pending.append((char_name, full_path, width, height, future))
             else:
-                # Crear sprite placeholder
+                self._add_missing_spritesheet(char_name, width, height)
+        return pending
+
+    def _add_missing_spritesheet(self, char_name, width, height):
+        # Crear sprite placeholder
+        placeholder = pygame.Surface((width, height))
+        placeholder.fill((100, 100, 100))
+        self.add_spritesheet(char_name, SpriteSheet(placeholder, width, height))
+        logger.warning(f"Sprite not found for {char_name}, using placeholder")
+
+    def _finish_spritesheets(self, pending):
+        """Convierte en el hilo principal las hojas ya decodificadas"""
+        for char_name, path, width, height, future in pending:
+            image, decode_ms = future.result()
+            start = time.perf_counter()
+            if isinstance(image, Exception):
+                logger.error(f"Error loading spritesheet {char_name}: {image}")
                 placeholder = pygame.Surface((width, height))
-                placeholder.fill((100, 100, 100))
-                self._sprite_sheets[char_name] = SpriteSheet(placeholder, width, height)
-                logger.warning(f"Sprite not found for {char_name}, using placeholder")
-    
-    def _preload_sounds(self, base_dir: Path):
-        """Pre-carga los sonidos del juego"""
-        sound_files = [
-            ("default", "untitled1.wav"),
-        ]
-        
-        for sound_name, sound_file in sound_files:
-            sound_path = base_dir / sound_file
+                placeholder.fill((255, 0, 255))  # Magenta para debug
+                self.add_spritesheet(char_name, SpriteSheet(placeholder, width, height))
+            else:
+                loader = lambda path=path, w=width, h=height: SpriteSheet(
+                    pygame.image.load(str(path)).convert_alpha(), w, h)
+                sheet = SpriteSheet(image.convert_alpha(), width, height)
+                self._store("sprite_sheets", char_name, sheet, loader=loader)
+                logger.debug(f"Loaded sprite for {char_name}")
+            self.load_report[char_name] = {"decode_ms": decode_ms,
+                                           "main_ms": (time.perf_counter() - start) * 1000}
+    
+    def _preload_sounds(self, entries, pool: ThreadPoolExecutor):
+        """Encola la decodificacion de los sonidos. Devuelve los pendientes"""
+        pending = []
+        for entry in entries:
+            sound_path = self.base_dir / entry["path"]
             if sound_path.exists():
-                try:
-                    self._sounds[sound_name] = pygame.mixer.Sound(str(sound_path))
-                    logger.debug(f"Loaded sound: {sound_name}")
-                except pygame.error as e:
-                    logger.error(f"Error loading sound {sound_name}: {e}")
+                pending.append((entry["key"], sound_path, pool.submit(_timed_load, pygame.mixer.Sound, str(sound_path))))
+        return pending
+
+    def _finish_sounds(self, pending):
+        for sound_name, sound_path, future in pending:
+            sound, decode_ms = future.result()
+            if isinstance(sound, Exception):
+                logger.error(f"Error loading sound {sound_name}: {sound}")
+                continue
+            self._store("sounds", sound_name, sound,
+                        loader=lambda path=str(sound_path): pygame.mixer.Sound(path))
+            self.load_report[f"sound:{sound_name}"] = {"decode_ms": decode_ms}
+            logger.debug(f"Loaded sound: {sound_name}")
     
+    # === CONTABILIDAD Y DESALOJO ===
+    def _store(self, category: str, key: str, value, loader: Optional[Callable] = None, size: Optional[int] = None):
+        """Guarda un recurso y su coste en memoria; `loader` permite recargarlo"""
+        self._stores[category][key] = value
+        asset_key = (category, key)
+        info = self._assets.get(asset_key)
+        if info is None:
+            info = self._assets[asset_key] = _AssetInfo(loader, 0)
+        elif loader is not None:
+            info.loader = loader
+        info.bytes = self._measure(value) if size is None else size
+        self._assets.move_to_end(asset_key)
+        self._enforce_budget(keep=asset_key)
+
+    @staticmethod
+    def _measure(value) -> int:
+        if isinstance(value, SpriteSheet):
+            return surface_bytes(value.sheet)
+        if isinstance(value, pygame.Surface):
+            return surface_bytes(value)
+        if isinstance(value, pygame.mixer.Sound):
+            return sound_bytes(value)
+        return 0
+
+    def _get(self, category: str, key: str):
+        """Devuelve un recurso, lo marca como usado y lo recarga si fue desalojado"""
+        store = self._stores[category]
+        value = store.get(key)
+        asset_key = (category, key)
+        info = self._assets.get(asset_key)
+        if info is None:
+            return value
+        self._assets.move_to_end(asset_key)
+        if value is None and info.loader is not None:
+            try:
+                value = info.loader()
+            except (pygame.error, OSError) as e:
+                logger.error(f"Error reloading {category}/{key}: {e}")
+                return None
+            store[key] = value
+            info.bytes = self._measure(value)
+            logger.debug(f"Reloaded {category}/{key}")
+            self._enforce_budget(keep=asset_key)
+        return value
+
+    def _enforce_budget(self, keep=None):
+        """Desaloja recursos sin referencias (LRU) hasta entrar en el presupuesto"""
+        if self.memory_budget is None:
+            return
+        total = self.resident_bytes()
+        if total <= self.memory_budget:
+            return
+        for asset_key, info in self._assets.items():
+            if total <= self.memory_budget:
+                break
+            category, key = asset_key
+            if info.refs or info.loader is None or asset_key == keep or key not in self._stores[category]:
+                continue
+            del self._stores[category][key]
+            freed = info.bytes + info.derived
+            if category == "sprite_sheets":
+                self._drop_tables(key)
+            # Recalculado: quitar regiones puede liberar paginas del atlas
+            total = self.resident_bytes()
+            self.evictions += 1
+            logger.debug(f"Evicted {category}/{key} ({freed} bytes)")
+
+    def resident_bytes(self) -> int:
+        """Memoria de los recursos cargados ahora mismo, con sus tablas y el atlas"""
+        total = sum(info.bytes + info.derived for (category, key), info in self._assets.items()
+                    if key in self._stores[category])
+        return total + (self._atlas.memory_bytes() if self._atlas else 0)
+
+    @staticmethod
+    def _table_bytes(table) -> int:
+        """Memoria propia de una tabla (las regiones del atlas cuentan en sus paginas)"""
+        return sum(surface_bytes(frame) for row in table.values()
+                   for frame in row if frame.__class__ is not AtlasRegion)
+
+    def _cache_table(self, tables: Dict[tuple, Dict[str, tuple]], cache_key: tuple, table: Dict[str, tuple]):
+        """Guarda una tabla derivada de la hoja `cache_key[0]` y suma su memoria a la hoja"""
+        old = tables.get(cache_key)
+        tables[cache_key] = table
+        asset_key = ("sprite_sheets", cache_key[0])
+        info = self._assets.get(asset_key)
+        if info is not None:
+            info.derived += self._table_bytes(table) - (self._table_bytes(old) if old else 0)
+            self._enforce_budget(keep=asset_key)
+
+    def _drop_tables(self, key: str):
+        """Olvida las tablas y variantes de una hoja y quita sus regiones del atlas"""
+        for tables in (self._animation_tables, self._variant_tables):
+            for cache_key in [cache_key for cache_key in tables if cache_key[0] == key]:
+                table = tables.pop(cache_key)
+                if self._atlas is None:
+                    continue
+                for row in table.values():
+                    for frame in row:
+                        if frame.__class__ is AtlasRegion:
+                            self._atlas.remove(frame.key)
+        info = self._assets.get(("sprite_sheets", key))
+        if info is not None:
+            info.derived = 0
+
+    def acquire(self, category: str, key: str) -> Optional[ResourceHandle]:
+        """Toma una referencia a un recurso para que no se desaloje"""
+        if self._get(category, key) is None:
+            return None
+        asset_key = (category, key)
+        info = self._assets.get(asset_key)
+        if info is None:
+            info = self._assets[asset_key] = _AssetInfo(None, self._measure(self._stores[category][key]))
+        info.refs += 1
+        return ResourceHandle(self, category, key)
+
+    def _release(self, category: str, key: str):
+        info = self._assets.get((category, key))
+        if info is not None and info.refs > 0:
+            info.refs -= 1
+            if not info.refs:
+                self._enforce_budget()
+
+    def set_memory_budget(self, budget: Optional[int]):
+        """Cambia el presupuesto en bytes (None = sin limite)"""
+        self.memory_budget = budget
+        self._enforce_budget()
+
+    # === CARGA Y ACCESO ===
     def load_spritesheet(self, key: str, path: Path, frame_width: int, frame_height: int):
         """Carga una hoja de sprites"""
         if key not in self._sprite_sheets:
+            loader = lambda: SpriteSheet(pygame.image.load(str(path)).convert_alpha(), frame_width, frame_height)
             try:
-                image = pygame.image.load(str(path)).convert_alpha()
-                self._sprite_sheets[key] = SpriteSheet(image, frame_width, frame_height)
+                self._store("sprite_sheets", key, loader(), loader=loader)
                 logger.debug(f"Loaded spritesheet: {key}")
             except pygame.error as e:
                 logger.error(f"Error loading spritesheet {key}: {e}")
                 # Crear placeholder
                 placeholder = pygame.Surface((frame_width, frame_height))
                 placeholder.fill((255, 0, 255))  # Magenta para debug
-                self._sprite_sheets[key] = SpriteSheet(placeholder, frame_width, frame_height)
+                self.add_spritesheet(key, SpriteSheet(placeholder, frame_width, frame_height))
+
+    def add_spritesheet(self, key: str, sheet: SpriteSheet):
+        """Registra una hoja creada en memoria (no se puede recargar, no se desaloja)"""
+        self._store("sprite_sheets", key, sheet)
     
     def get_spritesheet(self, key: str) -> Optional[SpriteSheet]:
         """Obtiene una hoja de sprites"""
-        return self._sprite_sheets.get(key)
+        return self._get("sprite_sheets", key)
     
+    def get_animation_table(self, key: str, mirror_left: bool = False) -> Optional[Dict[str, tuple]]:
+        """Tabla de animacion de una hoja, calculada una vez y compartida.
+
+        Todas las instancias reciben el mismo dict: no modificarlo. La tabla
+        se desaloja con su hoja: quien la guarde debe retener la hoja con
+        `acquire("sprite_sheets", key)`.
+        """
+        cache_key = (key, mirror_left)
+        table = self._animation_tables.get(cache_key)
+        if table is None:
+            sheet = self.get_spritesheet(key)
+            if sheet is None:
+                return None
+            table = self._index_table(build_animation_table(sheet, mirror_left))
+            if self._atlas is not None:
+                table = self._pack_table(cache_key, table)
+            self._cache_table(self._animation_tables, cache_key, table)
+            logger.debug(f"Built animation table: {key}")
+        return table
+
+    def get_variant_table(self, key: str, palette: Optional[Dict] = None, tint: Optional[tuple] = None,
+                          mirror_left: bool = False) -> Optional[Dict[str, tuple]]:
+        """Tabla de animacion recoloreada, generada una vez por hoja y variante.
+
+        `palette` es {color original: color nuevo} y `tint` un color (r, g, b)
+        o (r, g, b, cantidad) (ver SpriteVariants.tint_color). Los frames se
+        recolorean al crear la variante; despues se reusa la misma tabla.
+        """
+        if not palette and not tint:
+            return self.get_animation_table(key, mirror_left)
+        cache_key = (key, mirror_left, variant_key(palette, tint))
+        table = self._variant_tables.get(cache_key)
+        if table is None:
+            sheet = self.get_spritesheet(key)
+            if sheet is None:
+                return None
+            table = {direction: tuple(recolor(frame, palette, tint) for frame in row)
+                     for direction, row in build_animation_table(sheet, mirror_left).items()}
+            table = self._index_table(table)
+            if self._atlas is not None:
+                table = self._pack_table(cache_key, table)
+            self._cache_table(self._variant_tables, cache_key, table)
+            logger.debug(f"Built variant table: {key} {cache_key[2]}")
+        return table
+
+    # === CARGA ASINCRONA ===
+    def request_image(self, key: str, filepath: Path, on_ready=None, placeholder_size=(32, 32)) -> AssetRequest:
+        """Pide una imagen sin bloquear; hasta que llegue se ve un placeholder"""
+        def placeholder():
+            surface = pygame.Surface(placeholder_size)
+            surface.fill(PLACEHOLDER_COLOR)
+            return surface
+
+        return self._request("images", key, pygame.image.load, filepath,
+                             lambda image: image.convert_alpha(),
+                             lambda: pygame.image.load(str(filepath)).convert_alpha(),
+                             placeholder, on_ready, packed=self._pack_loader(filepath))
+
+    def request_spritesheet(self, key: str, path: Path, frame_width: int, frame_height: int, on_ready=None) -> AssetRequest:
+        """Pide una hoja de sprites sin bloquear"""
+        def placeholder():
+            surface = pygame.Surface((frame_width, frame_height))
+            surface.fill(PLACEHOLDER_COLOR)
+            return SpriteSheet(surface, frame_width, frame_height)
+
+        packed = self._pack_loader(path)
+        if packed is not None:
+            packed = lambda load=packed: SpriteSheet(load(), frame_width, frame_height)
+        return self._request("sprite_sheets", key, pygame.image.load, path,
+                             lambda image: SpriteSheet(image.convert_alpha(), frame_width, frame_height),
+                             lambda: SpriteSheet(pygame.image.load(str(path)).convert_alpha(), frame_width, frame_height),
+                             placeholder, on_ready, packed)
+
+    def request_sound(self, key: str, path: Path, on_ready=None) -> AssetRequest:
+        """Pide un sonido sin bloquear; `value` es None hasta que este listo"""
+        return self._request("sounds", key, pygame.mixer.Sound, path,
+                             lambda sound: sound,
+                             lambda: pygame.mixer.Sound(str(path)),
+                             lambda: None, on_ready)
+
+    def _pack_loader(self, path):
+        """Loader que lee la imagen ya decodificada del pack, o None si no esta empaquetada"""
+        if self._pack is None:
+            return None
+        name = pack_name(path)
+        if name is None or name not in self._pack:
+            return None
+        return lambda: self._pack.surface(name).convert_alpha()
+
+    def _request(self, category, key, decode, path, finish, loader, placeholder, on_ready, packed=None):
+        request = self._requests.get((category, key))
+        if request is None:
+            cached = self._get(category, key)
+            if cached is None and packed is not None:
+                # En el pack no hay nada que decodificar: se carga en el momento
+                cached = packed()
+                self._store(category, key, cached, loader=packed)
+            if cached is not None:
+                # Ya cargado: el pedido nace resuelto
+                request = AssetRequest(category, key, cached)
+                request.ready = True
+            else:
+                request = AssetRequest(category, key, placeholder())
+                request._finish = (finish, loader)
+                if self._request_pool is None:
+                    self._request_pool = ThreadPoolExecutor(max_workers=ASYNC_LOAD_WORKERS,
+                                                            thread_name_prefix="assets")
+                request._future = self._request_pool.submit(_timed_load, decode, str(path))
+                self._requests[(category, key)] = request
+        if on_ready is not None:
+            request.add_callback(on_ready)
+        return request
+
+    def poll(self) -> int:
+        """Termina en el hilo principal los pedidos cuya decodificacion acabo.
+
+        Devuelve cuantos pedidos termino (con exito o con error).
+        """
+        if not self._requests:
+            return 0
+        finished = 0
+        for asset_key, request in list(self._requests.items()):
+            if not request._future.done():
+                continue
+            del self._requests[asset_key]
+            finished += 1
+            result, decode_ms = request._future.result()
+            finish, loader = request._finish
+            if isinstance(result, Exception):
+                # El pedido se queda con el placeholder, pero no se guarda en
+                # cache: el proximo pedido de la misma key vuelve a intentar
+                request.error = result
+                logger.error(f"Error loading {request.category}/{request.key}: {result}")
+                value = request.value
+            else:
+                value = finish(result)
+                self._store(request.category, request.key, value, loader=loader)
+                logger.debug(f"Async load {request.category}/{request.key}: decode {decode_ms:.1f} ms")
+            request._resolve(value)
+        return finished
+
+    def pending_requests(self) -> int:
+        return len(self._requests)
+
+    def build_atlas(self):
+        """Empaqueta los frames de todas las hojas cargadas en un atlas.
+
+        Desde aqui las tablas de animacion devuelven AtlasRegion (recortadas,
+        con su offset) en vez de superficies sueltas.
+        """
+        frames = {}
+        tables = {}
+        for key, sheet in self._sprite_sheets.items():
+            tables[key] = self._index_table(build_animation_table(sheet))
+            for direction, row in tables[key].items():
+                for index, frame in enumerate(row):
+                    frames[(key, False, direction, index)] = frame
+        # Paginas de 8 bits solo si todos los frames quedaron indexados
+        indexed = self.palette is not None and all(frame.get_bitsize() == 8 for frame in frames.values())
+        self._atlas = TextureAtlas(ATLAS_PAGE_SIZE, palette=self.palette if indexed else None)
+        regions = self._atlas.add_many(frames)
+        for key, table in tables.items():
+            self._cache_table(self._animation_tables, (key, False), {
+                direction: tuple(regions[(key, False, direction, index)] for index in range(len(row)))
+                for direction, row in table.items()
+            })
+        stats = self._atlas.get_stats()
+        logger.info(f"Texture atlas: {stats['regions']} regions in {stats['pages']} pages, "
+                    f"{stats['bytes'] // 1024} KB, trimmed {stats['source_pixels']} -> {stats['packed_pixels']} px")
+
+    def _index_table(self, table):
+        """En modo indexado, pasa a 8 bits los frames que no tienen alpha parcial"""
+        if self.palette is None:
+            return table
+        return {direction: tuple(self.palette.index_surface(frame) or frame for frame in row)
+                for direction, row in table.items()}
+
+    def _pack_table(self, cache_key, table):
+        if self._atlas.palette is not None and any(frame.get_bitsize() != 8 for row in table.values() for frame in row):
+            return table  # no entra en un atlas de 8 bits: frames sueltos
+        frames = {cache_key + (direction, index): frame
+                  for direction, row in table.items() for index, frame in enumerate(row)}
+        regions = self._atlas.add_many(frames)
+        return {direction: tuple(regions[cache_key + (direction, index)] for index in range(len(row)))
+                for direction, row in table.items()}
+
+    def get_atlas(self) -> Optional[TextureAtlas]:
+        """Atlas de texturas, o None si no se construyo"""
+        return self._atlas
+
     def load_image(self, key: str, filepath: Path) -> pygame.Surface:
         """Carga una imagen individual"""
-        if key not in self._images:
+        image = self._get("images", key)
+        if image is None:
+            loader = self._pack_loader(filepath) or (lambda: pygame.image.load(str(filepath)).convert_alpha())
             try:
-                self._images[key] = pygame.image.load(str(filepath)).convert_alpha()
+                image = loader()
+                self._store("images", key, image, loader=loader)
                 logger.debug(f"Loaded image: {key}")
             except pygame.error as e:
                 logger.error(f"Error loading image {key}: {e}")
                 # Crear placeholder
-                self._images[key] = pygame.Surface((32, 32))
-                self._images[key].fill((255, 0, 255))
-        return self._images[key]
+                image = pygame.Surface((32, 32))
+                image.fill((255, 0, 255))
+                self._store("images", key, image)
+        return image
     
     def get_image(self, key: str) -> Optional[pygame.Surface]:
         """Obtiene una imagen"""
-        return self._images.get(key)
+        return self._get("images", key)
     
     def get_sound(self, key: str) -> Optional[pygame.mixer.Sound]:
         """Obtiene un sonido"""
-        return self._sounds.get(key)
+        return self._get("sounds", key)
     
     def get_font(self, key: str) -> Optional[pygame.font.Font]:
         """Obtiene una fuente"""
-        return self._fonts.get(key)
+        return self._get("fonts", key)
     
     def cleanup(self):
         """Limpia todos los recursos cargados"""
+        if self._request_pool is not None:
+            self._request_pool.shutdown(wait=False, cancel_futures=True)
+            self._request_pool = None
+        self._requests.clear()
         self._sprite_sheets.clear()
+        self._assets.clear()
+        self._animation_tables.clear()
+        self._variant_tables.clear()
+        self._atlas = None
         self._images.clear()
         self._sounds.clear()
         self._fonts.clear()
         logger.info("Resources cleaned up")
     
     def get_memory_usage(self) -> Dict[str, int]:
-        """Obtiene informacion sobre el uso de memoria"""
-        return {
-            "sprite_sheets": len(self._sprite_sheets),
-            "images": len(self._images),
-            "sounds": len(self._sounds),
-            "fonts": len(self._fonts),
-        }
+        """Bytes residentes por categoria, mas el total y el presupuesto"""
+        usage = {category: 0 for category in self._stores}
+        for (category, key), info in self._assets.items():
+            if key in self._stores[category]:
+                usage[category] += info.bytes
+        usage["animation_tables"] = sum(
+            surface_bytes(frame)
+            for table in self._animation_tables.values()
+            for row in table.values()
+            for frame in row if frame.__class__ is not AtlasRegion
+        )
+        usage["variant_tables"] = sum(
+            surface_bytes(frame)
+            for table in self._variant_tables.values()
+            for row in table.values()
+            for frame in row if frame.__class__ is not AtlasRegion
+        )
+        usage["atlas"] = self._atlas.memory_bytes() if self._atlas else 0
+        usage["total"] = sum(usage.values())
+        usage["budget"] = self.memory_budget or 0
+        usage["evictions"] = self.evictions
+        return usage
 
 # Instancia global para compatibilidad con codigo existente
 resource_manager = ResourceManager()
\ No newline at end of file
@@ -9,8 +9,74 @@ WINDOW_WIDTH, WINDOW_HEIGHT =  320, 240
 INT_WIDTH  =  320
 INT_HEIGHT =  240 
 TILE_SIZE = 16
+WORLD_BG_COLOR = (50, 50, 50)
 
 MAPS_DIR = join('Maps')
+START_MAP = join(MAPS_DIR, 'Aula', 'Aula-1.tmx')  # mapa donde empieza el juego
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 SPRITES_DIR = BASE_DIR / 'Sprites'
+DATA_DIR = BASE_DIR / 'Code' / 'Assets' / 'Data'
+ITEMS_DATA_FILE = DATA_DIR / 'items.json'
+ASSETS_MANIFEST_FILE = DATA_DIR / 'assets.json'
 
+# Bucle principal: simulacion a paso fijo, render interpolado
+SIM_HZ = 60                # pasos de simulacion por segundo
+SIM_DT = 1.0 / SIM_HZ
+MAX_FRAME_TIME = 0.25      # s; un frame mas largo se recorta (evita la espiral de la muerte)
+MAX_SIM_STEPS = 5          # pasos de simulacion como maximo por frame renderizado
+RENDER_FPS_CAP = None      # None = frecuencia del monitor si se conoce, si no 60
+IDLE_FPS = 10              # ritmo del bucle en reposo (ventana sin foco/minimizada o escena quieta)
+IDLE_DELAY = 0.5           # s sin input antes de pasar a reposo si la escena no tiene cambios
+
+# Gobernador de frame (ver GameSystems.FrameGovernor)
+FRAME_BUDGET_MS = None          # None = 1000 / FPS de render
+GOVERNOR_WINDOW = 30            # frames de la media movil de tiempo de trabajo
+GOVERNOR_RAISE_RATIO = 0.9      # degradar si la media supera este % del presupuesto
+GOVERNOR_LOWER_RATIO = 0.6      # recuperar si la media baja de este % del presupuesto
+GOVERNOR_COOLDOWN_FRAMES = 60   # frames minimos entre cambios de nivel
+GOVERNOR_THROTTLE_INTERVAL = 4  # el trabajo en el limite del nivel corre 1 de cada N frames
+
+# Memoria de recursos (ver ResourceManager)
+RESOURCE_MEMORY_BUDGET = 64 * 1024 * 1024  # bytes residentes: hojas, imagenes, sonidos, tablas de animacion y atlas; None = sin limite
+PRELOAD_WORKERS = 4                        # hilos que decodifican archivos durante la precarga
+ASYNC_LOAD_WORKERS = 2                     # hilos para los pedidos request_* durante el juego
+ASSET_PACK_FILE = join('Build', 'assets.pak')  # archivo generado con `python -m AssetPack`
+USE_ASSET_PACK = True                      # leer recursos del .pak si existe (si no, archivos sueltos)
+
+# Atlas de texturas (ver TextureAtlas)
+USE_TEXTURE_ATLAS = True  # empaquetar los frames de personajes en paginas compartidas
+ATLAS_PAGE_SIZE = 256     # lado en pixeles de cada pagina del atlas
+
+# Color indexado (ver IndexedColor)
+USE_INDEXED_COLOR = False  # tiles y frames sin alpha parcial en 8 bits con paleta compartida (1/4 de memoria, blit mas lento)
+
+# Variantes de color de sprites (ver SpriteVariants y ResourceManager.get_variant_table)
+SPRITE_TINTS = {
+    "poison": (140, 255, 140),          # (r, g, b): multiplica
+    "hit_flash": (255, 255, 255, 255),  # (r, g, b, cantidad): mezcla hacia el color
+}
+
+# Transiciones de mapa (ver Game.World.Transitions)
+TRANSITION_EFFECT = "fade"  # fade, wipe o iris
+TRANSITION_STEPS = 32       # niveles precalculados entre el frame y el negro
+
+# Carga cooperativa de mapas (ver Game.World.Map.MapLoader)
+MAP_LOAD_BUDGET_MS = 8.0      # ms por frame dedicados a construir el mapa siguiente
+MAP_LOAD_TILES_PER_STEP = 64  # tiles procesados entre cada punto de corte
+MAP_LOAD_OBJECTS_PER_STEP = 8 # objetos procesados entre cada punto de corte
+MAP_PREFETCH_DISTANCE = 96    # px desde una salida para empezar a precargar el mapa destino
+MAP_PREFETCH_BUDGET_MS = 3.0  # ms por frame para precargas (fuera de transiciones)
+
+# Mapas compilados (ver Game.World.MapCompiler)
+COMPILED_MAPS_DIR = join('Build', 'Maps')
+USE_COMPILED_MAPS = True
+MAP_CHUNK_SIZE = 256  # lado en pixeles de cada bloque de capas horneadas
+
+# Planificador de updates (ver GameSystems.UpdateScheduler)
+UPDATE_WAKE_MARGIN = 32  # px alrededor de la camara en los que una entidad dormida despierta
+NPC_CELL_SIZE = 64       # px por celda de la particion espacial de NPCs
+NPC_WAKE_MARGIN = 64     # px alrededor de la camara en los que un NPC ejecuta su comportamiento
+
+# Busqueda de caminos (ver Game.World.Pathfinding)
+PATHFIND_NODES_PER_FRAME = 512  # celdas expandidas por frame al recalcular campos de distancia
+PATHFIND_MAX_NODES = 4096       # limite de celdas de una consulta A*
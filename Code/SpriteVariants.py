@@ -0,0 +1,141 @@
+"""Recoloreo de frames: cambio de paleta y tinte.
+
+Se usa para generar una vez las variantes de una tabla de animacion
+(ver ResourceManager.get_variant_table); nada de esto corre por frame.
+Con numpy se remapea todo el frame con surfarray; sin numpy se remapea
+cada color distinto de la imagen una sola vez y se rearma desde bytes.
+numpy es opcional. Para comprobar que los dos caminos dan lo mismo con las
+hojas del manifiesto (necesita numpy):
+
+    python -m SpriteVariants --check    # desde la carpeta Code/
+"""
+import argparse
+import array
+import sys
+from typing import Callable, Dict, Optional, Tuple
+
+import pygame
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def variant_key(palette: Optional[Dict] = None, tint: Optional[tuple] = None) -> tuple:
+    """Clave hasheable de una variante (el orden del dict no importa)"""
+    swap = tuple(sorted((tuple(src)[:3], tuple(dst)[:3]) for src, dst in palette.items())) if palette else ()
+    return swap, tuple(tint) if tint else ()
+
+def tint_color(rgb, tint) -> Tuple[int, int, int]:
+    """Color con el tinte aplicado.
+
+    `tint` es (r, g, b) para multiplicar (veneno, sombra) o (r, g, b, cantidad)
+    para mezclar hacia ese color; con cantidad 255 el color se reemplaza
+    (destello al recibir un golpe).
+    """
+    if len(tint) > 3:
+        amount = tint[3]
+        return tuple(c + (t - c) * amount // 255 for c, t in zip(rgb, tint[:3]))
+    return tuple(c * t // 255 for c, t in zip(rgb, tint))
+
+def recolor(surface: pygame.Surface, palette: Optional[Dict] = None, tint: Optional[tuple] = None) -> pygame.Surface:
+    """Copia de la superficie con la paleta cambiada y luego el tinte aplicado.
+
+    El alpha de cada pixel no cambia. Los colores de `palette` se comparan
+    por RGB exacto y todos se buscan en la imagen original (un cambio no
+    encadena con otro).
+    """
+    if not surface.get_flags() & pygame.SRCALPHA:
+        surface = surface.convert_alpha()
+    swap = {tuple(src)[:3]: tuple(dst)[:3] for src, dst in palette.items()} if palette else {}
+    if numpy is not None:
+        return _recolor_surfarray(surface, swap, tint)
+    return _recolor_bytes(surface, lambda rgb: _apply(rgb, swap, tint))
+
+def _apply(rgb, swap, tint):
+    rgb = swap.get(rgb, rgb)
+    return tint_color(rgb, tint) if tint else rgb
+
+def _recolor_surfarray(surface, swap, tint):
+    result = surface.copy()
+    rgb = pygame.surfarray.pixels3d(result)
+    if swap:
+        source = rgb.astype(numpy.int32)
+        packed = (source[..., 0] << 16) | (source[..., 1] << 8) | source[..., 2]
+        # Mascaras sobre la imagen original: los cambios no se encadenan
+        masks = [(packed == ((r << 16) | (g << 8) | b), dst) for (r, g, b), dst in swap.items()]
+        for mask, dst in masks:
+            rgb[mask] = dst
+    if tint:
+        values = rgb.astype(numpy.int32)
+        color = numpy.array(tint[:3], dtype=numpy.int32)
+        if len(tint) > 3:
+            values += (color - values) * tint[3] // 255
+        else:
+            values = values * color // 255
+        rgb[...] = values
+    del rgb  # libera el lock de la superficie
+    return result
+
+def _recolor_bytes(surface, remap: Callable):
+    """Remapeo sin numpy: cada color RGBA distinto se calcula una vez"""
+    pixels = array.array("I")
+    pixels.frombytes(pygame.image.tobytes(surface, "RGBA"))
+    lookup = {}
+    for value in set(pixels):
+        r, g, b, a = value.to_bytes(4, sys.byteorder)
+        lookup[value] = int.from_bytes(bytes((*remap((r, g, b)), a)), sys.byteorder)
+    pixels = array.array("I", map(lookup.__getitem__, pixels))
+    result = pygame.image.frombytes(pixels.tobytes(), surface.get_size(), "RGBA")
+    return result.convert_alpha() if pygame.display.get_surface() is not None else result
+
+def check_paths(surfaces, variants):
+    """Compara _recolor_surfarray con _recolor_bytes; devuelve (casos, distintos)"""
+    compared = different = 0
+    for name, surface in surfaces:
+        for palette, tint in variants(surface):
+            swap = {tuple(src)[:3]: tuple(dst)[:3] for src, dst in palette.items()} if palette else {}
+            fast = _recolor_surfarray(surface, swap, tint)
+            slow = _recolor_bytes(surface, lambda rgb: _apply(rgb, swap, tint))
+            compared += 1
+            if pygame.image.tobytes(fast, "RGBA") != pygame.image.tobytes(slow, "RGBA"):
+                different += 1
+                print(f"distinto: {name} paleta={bool(palette)} tinte={tint}")
+    return compared, different
+
+def _test_variants(surface):
+    """Tintes del juego mas un cambio de paleta con colores de la imagen (incluye un ciclo)"""
+    from Settings.Settings import SPRITE_TINTS
+    colors = sorted({tuple(surface.get_at((x, y)))[:3]
+                     for x in range(0, surface.get_width(), 3)
+                     for y in range(0, surface.get_height(), 3)})
+    swap = {colors[0]: colors[-1], colors[-1]: colors[0], colors[len(colors) // 2]: (9, 99, 199)}
+    variants = [(None, tint) for tint in SPRITE_TINTS.values()]
+    return variants + [(swap, None), (swap, next(iter(SPRITE_TINTS.values())))]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Variantes de color de sprites")
+    parser.add_argument("--check", action="store_true",
+                        help="comparar el camino con numpy contra el de bytes")
+    args = parser.parse_args(argv)
+    if not args.check:
+        parser.print_help()
+        return 0
+    if numpy is None:
+        print("numpy no esta instalado: solo se usa el camino de bytes")
+        return 1
+
+    from AssetPack import load_asset_manifest
+    from Settings.Settings import BASE_DIR, INT_WIDTH, INT_HEIGHT
+    pygame.display.set_mode((INT_WIDTH, INT_HEIGHT))
+    surfaces = []
+    for entry in load_asset_manifest()["sprite_sheets"]:
+        path = BASE_DIR / entry["path"]
+        if path.exists():
+            surfaces.append((entry["key"], pygame.image.load(str(path)).convert_alpha()))
+    compared, different = check_paths(surfaces, _test_variants)
+    print(f"{compared} variantes comparadas, {different} distintas")
+    return 1 if different else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+import pygame
+from typing import Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+class AtlasRegion:
+    """Imagen empaquetada en una pagina del atlas.
+
+    Se recorta el borde transparente: `surface` es solo la parte visible y
+    `offset` es donde cae dentro del frame original de tamaño `size`.
+    `get_rect` usa el tamaño original, asi que un sprite puede usar la
+    region como `image` sin cambiar como calcula su rect.
+    """
+    __slots__ = ("key", "page", "rect", "offset", "size", "surface")
+
+    def __init__(self, key, page, rect, offset, size):
+        self.key = key
+        self.page = page        # indice de pagina
+        self.rect = rect        # area ocupada en la pagina
+        self.offset = offset    # (x, y) del recorte dentro del frame original
+        self.size = size
+        self.surface = None     # subsuperficie de la pagina, la asigna el atlas
+
+    def get_size(self):
+        return self.size
+
+    def get_width(self):
+        return self.size[0]
+
+    def get_height(self):
+        return self.size[1]
+
+    def get_rect(self, **kwargs):
+        rect = pygame.Rect((0, 0), self.size)
+        for name, value in kwargs.items():
+            setattr(rect, name, value)
+        return rect
+
+    def draw(self, dest, pos):
+        """Dibuja la region como si fuera el frame completo en `pos`"""
+        if self.surface is not None:
+            dest.blit(self.surface, (pos[0] + self.offset[0], pos[1] + self.offset[1]))
+
+def blit_image(dest, image, pos):
+    """Blit de una Surface o de una AtlasRegion"""
+    if image.__class__ is AtlasRegion:
+        image.draw(dest, pos)
+    else:
+        dest.blit(image, pos)
+
+class _Shelf:
+    __slots__ = ("y", "height", "x")
+
+    def __init__(self, y, height):
+        self.y = y
+        self.height = height
+        self.x = 0
+
+class TextureAtlas:
+    """Empaquetador por estantes (shelf packing) en paginas de tamaño fijo.
+
+    Las imagenes se ordenan por alto y se colocan de izquierda a derecha en
+    filas; cuando una fila no alcanza se abre otra debajo y cuando la pagina
+    se llena se crea una nueva. Una pagina se libera cuando se quitan todas
+    sus regiones (ver `remove`).
+    """
+
+    def __init__(self, page_size=512, padding=1, palette=None):
+        self.page_size = page_size
+        self.padding = padding
+        self.palette = palette   # SharedPalette: paginas de 8 bits (solo imagenes ya indexadas)
+        self.pages: List[Optional[pygame.Surface]] = []   # None = pagina liberada
+        self._live: List[int] = []   # regiones vivas por pagina
+        self._palette_size = 0   # colores que tenian las paginas la ultima vez
+        self._shelves: List[List[_Shelf]] = []
+        self.regions: Dict[object, AtlasRegion] = {}
+        self.source_pixels = 0   # area de las imagenes antes de recortar
+        self.packed_pixels = 0   # area despues de recortar
+
+    def add_many(self, images: Dict[object, pygame.Surface]) -> Dict[object, AtlasRegion]:
+        """Empaqueta varias imagenes a la vez (mejor aprovechamiento que de a una)"""
+        trimmed = []
+        for key, surface in images.items():
+            trimmed.append((key, surface, surface.get_bounding_rect()))
+        trimmed.sort(key=lambda entry: entry[2].height, reverse=True)
+        return {key: self._place(key, surface, bounds) for key, surface, bounds in trimmed}
+
+    def add(self, key, surface: pygame.Surface) -> AtlasRegion:
+        return self._place(key, surface, surface.get_bounding_rect())
+
+    def get(self, key) -> Optional[AtlasRegion]:
+        return self.regions.get(key)
+
+    def remove(self, key):
+        """Quita una region. El lugar no se reusa, pero una pagina sin regiones se libera"""
+        region = self.regions.pop(key, None)
+        if region is None:
+            return
+        self.source_pixels -= region.size[0] * region.size[1]
+        if region.page < 0:
+            return
+        self.packed_pixels -= region.rect.width * region.rect.height
+        self._live[region.page] -= 1
+        if not self._live[region.page]:
+            self.pages[region.page] = None
+            self._shelves[region.page] = None
+            logger.debug(f"Atlas page {region.page + 1} released")
+
+    def _place(self, key, surface, bounds):
+        size = surface.get_size()
+        self.source_pixels += size[0] * size[1]
+        if bounds.width == 0 or bounds.height == 0:
+            # Imagen totalmente transparente: no ocupa lugar
+            region = AtlasRegion(key, -1, pygame.Rect(0, 0, 0, 0), (0, 0), size)
+            self.regions[key] = region
+            return region
+        if bounds.width > self.page_size or bounds.height > self.page_size:
+            raise ValueError(f"Image {key} ({bounds.size}) does not fit in a {self.page_size}px atlas page")
+
+        if self.palette is not None and surface.get_bitsize() != 8:
+            raise ValueError(f"Image {key} is not indexed and cannot go in an 8-bit atlas")
+
+        page_index, x, y = self._allocate(bounds.width, bounds.height)
+        page = self.pages[page_index]
+        self._live[page_index] += 1
+        if self.palette is not None:
+            self._sync_palette()
+            # Misma paleta: se copian los indices; el colorkey deja el fondo transparente
+            page.blit(surface, (x, y), bounds)
+        else:
+            # Copia exacta (sin mezclar alpha) sobre la pagina transparente
+            page.blit(surface, (x, y), bounds, special_flags=pygame.BLEND_RGBA_MAX)
+        rect = pygame.Rect(x, y, bounds.width, bounds.height)
+        region = AtlasRegion(key, page_index, rect, bounds.topleft, size)
+        region.surface = page.subsurface(rect)
+        self.regions[key] = region
+        self.packed_pixels += rect.width * rect.height
+        return region
+
+    def _sync_palette(self):
+        """Pasa los colores nuevos de la paleta compartida a las paginas.
+
+        Si una pagina tiene la paleta vieja, el blit traduce los indices
+        nuevos al color mas parecido en vez de copiarlos. Las subsuperficies
+        tienen su propia copia de la paleta, asi que tambien se actualizan.
+        """
+        if len(self.palette) == self._palette_size:
+            return
+        colors = self.palette.full_palette()
+        for page in self.pages:
+            if page is not None:
+                page.set_palette(colors)
+        for region in self.regions.values():
+            if region.surface is not None:
+                region.surface.set_palette(colors)
+        self._palette_size = len(self.palette)
+
+    def _allocate(self, width, height):
+        padded_w = width + self.padding
+        padded_h = height + self.padding
+        for page_index, shelves in enumerate(self._shelves):
+            if shelves is None:
+                continue
+            # Primero en un estante existente donde quepa
+            for shelf in shelves:
+                if height <= shelf.height and shelf.x + padded_w <= self.page_size:
+                    x = shelf.x
+                    shelf.x += padded_w
+                    return page_index, x, shelf.y
+            # Si no, un estante nuevo debajo del ultimo
+            top = shelves[-1].y + shelves[-1].height + self.padding if shelves else 0
+            if top + height <= self.page_size:
+                shelf = _Shelf(top, height)
+                shelf.x = padded_w
+                shelves.append(shelf)
+                return page_index, 0, top
+        self._new_page()
+        shelf = _Shelf(0, height)
+        shelf.x = padded_w
+        self._shelves[-1].append(shelf)
+        return len(self.pages) - 1, 0, 0
+
+    def _new_page(self):
+        if self.palette is not None:
+            page = self.palette.new_surface((self.page_size, self.page_size))
+        else:
+            page = pygame.Surface((self.page_size, self.page_size), pygame.SRCALPHA)
+            if pygame.display.get_surface() is not None:
+                page = page.convert_alpha()
+            page.fill((0, 0, 0, 0))
+        self.pages.append(page)
+        self._shelves.append([])
+        self._live.append(0)
+        logger.debug(f"Atlas page {len(self.pages)} created")
+
+    def memory_bytes(self) -> int:
+        """Memoria de las paginas del atlas"""
+        return sum(page.get_width() * page.get_height() * page.get_bytesize()
+                   for page in self.pages if page is not None)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "pages": len(self.pages) - self.pages.count(None),
+            "regions": len(self.regions),
+            "bytes": self.memory_bytes(),
+            "source_pixels": self.source_pixels,
+            "packed_pixels": self.packed_pixels,
+        }
@@ -20,20 +20,22 @@ class DialogBox:
         self.text_color = (255, 255, 255)
 
         self.char_index = 0
-        self.speed = speed
-        self.timer = 0
+        self.speed = speed  # frames (a 60 FPS) por caracter
+        self.char_time = speed / 60.0
+        self.timer = 0.0
         self.finished = False
         self.displayed_text = ""
 
-    def update(self):
+    def update(self, dt):
         if not self.finished:
-            self.timer += 1
-            if self.timer >= self.speed and self.char_index < len(self.text):
+            self.timer += dt
+            # Por tiempo, no por frames: la velocidad no depende de los FPS
+            while self.timer + 1e-9 >= self.char_time and self.char_index < len(self.text):
                 self.displayed_text += self.text[self.char_index]
                 if self.sound and self.text[self.char_index] not in [' ', '.', ',']:
                     self.sound.play()
                 self.char_index += 1
-                self.timer = 0
+                self.timer -= self.char_time
             if self.char_index >= len(self.text):
                 self.finished = True
 
@@ -131,9 +133,16 @@ class DialogManager:
         self.sound = sound
         self.portrait = portrait
 
+    def set_portrait(self, portrait):
+        """Cambia el portrait, tambien el del cuadro abierto"""
+        self.portrait = portrait
+        if self.dialog_box:
+            self.dialog_box.portrait = portrait
+
     def get_text(self, texts):
         # Asumimos que texts es un diccionario y el texto está en el primer valor como string lista
-        text_list = ast.literal_eval(texts)
+        # (los mapas compilados ya traen la lista parseada)
+        text_list = texts if isinstance(texts, list) else ast.literal_eval(texts)
         self.texts = text_list
         self.current_index = 0
         self.active = True
@@ -148,9 +157,9 @@ class DialogManager:
         else:
             self.close()
 
-    def update(self):
+    def update(self, dt):
         if self.active and self.dialog_box:
-            self.dialog_box.update()
+            self.dialog_box.update(dt)
             if self.dialog_box.is_finished():
                 # Podes decidir si automáticamente pasa al siguiente texto o esperar input
                 pass
@@ -4,6 +4,7 @@ from typing import List, Optional, Dict
 import logging
 
 from Characters.Inventory import InventoryModel, Character
+from TextureAtlas import blit_image
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +15,11 @@ class MenuState(Enum):
     INVENTORY_SELECT = "inventory_select"
 
 class UI_Inventory:
+    SELECTION_ROWS = 7       # filas visibles en la lista de seleccion
+    SELECTION_ROW_HEIGHT = 12
+    PREVIEW_ROWS = 5         # filas de la vista previa en modo equipamiento
+    ROW_CACHE_LIMIT = 256    # superficies de fila guardadas como maximo
+
     def __init__(self, rect: pygame.Rect, font: pygame.font.Font, characters_list: List[Character], character_sprites=None):
         self.rect = rect
         self.font = font
@@ -32,6 +38,8 @@ class UI_Inventory:
         self.selected_equipment = 0
         self.selected_skill = 0
         self.selected_inventory_item = 0
+        self.selection_scroll = 0  # primera fila visible de la lista de seleccion
+        self._row_cache: Dict[tuple, pygame.Surface] = {}  # (item_id, cantidad, color) -> superficie
         
         # Sprites de personajes (opcional)
         self.character_sprites = character_sprites or {}
@@ -103,11 +111,11 @@ class UI_Inventory:
         # Validar item de inventario
         current_char = self.get_current_character()
         if current_char:
-            available_items = self.inventory_model.get_available_items_for_slot(
+            available_count = self.inventory_model.count_available_for_slot(
                 current_char, self.selected_equipment
             )
-            if available_items:
-                self.selected_inventory_item = max(0, min(self.selected_inventory_item, len(available_items) - 1))
+            if available_count:
+                self.selected_inventory_item = max(0, min(self.selected_inventory_item, available_count - 1))
             else:
                 self.selected_inventory_item = 0
 
@@ -193,10 +201,7 @@ class UI_Inventory:
             # Verificar que hay items disponibles antes de cambiar estado
             current_char = self.get_current_character()
             if current_char:
-                available_items = self.inventory_model.get_available_items_for_slot(
-                    current_char, self.selected_equipment
-                )
-                if available_items:
+                if self.inventory_model.count_available_for_slot(current_char, self.selected_equipment):
                     self.current_state = MenuState.INVENTORY_SELECT
                     self.selected_inventory_item = 0
                     self._validate_selections()
@@ -228,11 +233,11 @@ class UI_Inventory:
             self.current_state = MenuState.EQUIPMENT
             return
             
-        available_items = self.inventory_model.get_available_items_for_slot(
+        available_count = self.inventory_model.count_available_for_slot(
             current_char, self.selected_equipment
         )
         
-        if not available_items:
+        if not available_count:
             logger.debug("No available items, returning to equipment menu")
             self.current_state = MenuState.EQUIPMENT
             return
@@ -253,9 +258,9 @@ class UI_Inventory:
 
         # Navegacion por la lista
         if event.key == pygame.K_UP:
-            self.selected_inventory_item = (self.selected_inventory_item - 1) % len(available_items)
+            self.selected_inventory_item = (self.selected_inventory_item - 1) % available_count
         elif event.key == pygame.K_DOWN:
-            self.selected_inventory_item = (self.selected_inventory_item + 1) % len(available_items)
+            self.selected_inventory_item = (self.selected_inventory_item + 1) % available_count
 
     def draw(self, surface):
         """Dibuja la UI del inventario con manejo de errores"""
@@ -329,7 +334,7 @@ class UI_Inventory:
 
             # Dibujar sprite o placeholder
             if sprite:
-                surface.blit(sprite, sprite_rect)
+                blit_image(surface, sprite, sprite_rect.topleft)
             else:
                 pygame.draw.rect(surface, (100, 150, 255), sprite_rect)
 
@@ -458,37 +463,40 @@ class UI_Inventory:
 
         try:
             if self.current_state == MenuState.INVENTORY_SELECT:
-                available_items = self.inventory_model.get_available_items_for_slot(
+                total = self.inventory_model.count_available_for_slot(
                     character, self.selected_equipment
                 )
                 
-                if not available_items:
+                if not total:
                     self.current_state = MenuState.EQUIPMENT
                     return
                 
-                # Mostrar lista de items disponibles
+                # Mostrar solo la ventana visible de la lista
+                self._scroll_to_selection(total)
                 y_offset = 2
-                items_to_show = available_items[:7]  # Máximo 7 items
+                items_to_show = self.inventory_model.get_available_items_window(
+                    character, self.selected_equipment, self.selection_scroll, self.SELECTION_ROWS
+                )
                 
-                for i, item in enumerate(items_to_show):
-                    y = self.selection_area.y + y_offset + i * 12
+                for row, item in enumerate(items_to_show):
+                    y = self.selection_area.y + y_offset + row * self.SELECTION_ROW_HEIGHT
                     
                     # Highlight del item seleccionado
-                    if i == self.selected_inventory_item:
+                    if self.selection_scroll + row == self.selected_inventory_item:
                         pygame.draw.rect(surface, (11, 142, 182),
                                        (self.selection_area.x, y,
                                         self.selection_area.width, 11))
                     
                     # Mostrar nombre y cantidad
-                    qty = character.inventory.quantity(item)
-                    txt = f"{item.name[:6]} x{qty}"
-                    surf = self.font.render(txt, True, (255, 255, 255))
+                    surf = self._get_row_surface(character, item, (255, 255, 255))
                     surface.blit(surf, (self.selection_area.x + 2, y))
 
+                self._draw_scroll_marks(surface, total)
+
             elif self.current_state == MenuState.EQUIPMENT:
                 # Mostrar preview de items disponibles
-                available_items = self.inventory_model.get_available_items_for_slot(
-                    character, self.selected_equipment
+                available_items = self.inventory_model.get_available_items_window(
+                    character, self.selected_equipment, 0, self.PREVIEW_ROWS
                 )
                 
                 y = self.selection_area.y + 5
@@ -497,11 +505,8 @@ class UI_Inventory:
                     surface.blit(no_surf, (self.selection_area.x + 2, y))
                 else:
                     # Mostrar hasta 5 ítems con su cantidad
-                    items_to_show = available_items[:5]
-                    for item in items_to_show:
-                        qty = character.inventory.quantity(item)
-                        txt = f"{item.name[:6]} x{qty}"
-                        surf = self.font.render(txt, True, (200, 200, 200))
+                    for item in available_items:
+                        surf = self._get_row_surface(character, item, (200, 200, 200))
                         surface.blit(surf, (self.selection_area.x + 2, y))
                         y += self.font.get_height() + 2
 
@@ -521,6 +526,37 @@ class UI_Inventory:
             error_surf = self.font.render("Select Error", True, (255, 0, 0))
             surface.blit(error_surf, (self.selection_area.x + 2, self.selection_area.y + 35))
 
+    def _scroll_to_selection(self, total):
+        """Mueve la ventana visible para que contenga el item seleccionado"""
+        max_scroll = max(0, total - self.SELECTION_ROWS)
+        if self.selected_inventory_item < self.selection_scroll:
+            self.selection_scroll = self.selected_inventory_item
+        elif self.selected_inventory_item >= self.selection_scroll + self.SELECTION_ROWS:
+            self.selection_scroll = self.selected_inventory_item - self.SELECTION_ROWS + 1
+        self.selection_scroll = max(0, min(self.selection_scroll, max_scroll))
+
+    def _get_row_surface(self, character, item, color):
+        """Texto "nombre xN" de una fila, renderizado una vez por item y cantidad"""
+        qty = character.inventory.quantity(item)
+        key = (item.id, qty, color)
+        surf = self._row_cache.get(key)
+        if surf is None:
+            if len(self._row_cache) >= self.ROW_CACHE_LIMIT:
+                self._row_cache.clear()
+            surf = self.font.render(f"{item.name[:6]} x{qty}", True, color)
+            self._row_cache[key] = surf
+        return surf
+
+    def _draw_scroll_marks(self, surface, total):
+        """Flechas en el borde derecho si hay filas fuera de la ventana"""
+        x = self.selection_area.right - 6
+        if self.selection_scroll > 0:
+            top = self.selection_area.y + 3
+            pygame.draw.polygon(surface, (200, 200, 200), [(x, top + 3), (x + 4, top + 3), (x + 2, top)])
+        if self.selection_scroll + self.SELECTION_ROWS < total:
+            bottom = self.selection_area.y + 2 + self.SELECTION_ROWS * self.SELECTION_ROW_HEIGHT
+            pygame.draw.polygon(surface, (200, 200, 200), [(x, bottom - 3), (x + 4, bottom - 3), (x + 2, bottom)])
+
     def update_party_reference(self, new_party_list: List[Character]):
         """Actualiza la referencia a la lista del party"""
         self.party = new_party_list if new_party_list else []